@@ -17,19 +17,17 @@
 #  limitations under the License.
 # ******************************************************************************
 
+import logging
+
 from flask import Flask
-from app.config import Config
-from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from flask_sqlalchemy import SQLAlchemy
 from redis import Redis
+from sqlalchemy import MetaData
 import rq
-from app.config import Config
-import logging
 
-app = Flask(__name__)
-app.config.from_object(Config)
-
-from sqlalchemy import MetaData
+from app.config import Config
+from app.json_provider import RapidJSONProvider
 
 naming_convention = {
     "ix": 'ix_%(column_0_label)s',
@@ -38,26 +36,47 @@ naming_convention = {
     "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
     "pk": "pk_%(table_name)s"
 }
-db = SQLAlchemy(app, metadata=MetaData(naming_convention=naming_convention))
+db = SQLAlchemy(metadata=MetaData(naming_convention=naming_convention))
+
+migrate = Migrate()
+
+
+def create_app(config_class=Config):
+    """Create the application. pyquil, qcs_sdk, and numpy are imported lazily by the routes and tasks needing them
+    and the database schema is created by the migrations (flask db upgrade)."""
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+    app.json = RapidJSONProvider(app)
+
+    db.init_app(app)
+    migrate.init_app(app, db)
 
-migrate = Migrate(app, db)
+    # note if workers have problems starting a task try to set the PATH and the PYTHONPATH env variables
+    app.redis = Redis.from_url(app.config['REDIS_URL'], port=5040)
+    execute_timeout = app.config['EXECUTE_TIMEOUT']
+    app.execute_queue = rq.Queue('forest-service_execute', connection=app.redis, default_timeout=execute_timeout)
+    # execute jobs are enqueued into lanes by their estimated cost, i.e., cheap jobs are not starved by expensive ones
+    app.execute_queues = {
+        'high': rq.Queue('forest-service_execute_high', connection=app.redis, default_timeout=execute_timeout),
+        'default': app.execute_queue,
+        'low': rq.Queue('forest-service_execute_low', connection=app.redis, default_timeout=execute_timeout),
+    }
+    app.implementation_queue = rq.Queue('forest-service_implementation_exe', connection=app.redis,
+                                        default_timeout=app.config['GENERATE_TIMEOUT'])
+    app.logger.setLevel(logging.INFO)
 
-from app import routes, result_model, errors, generated_circuit_model
-from app.controller import register_blueprints
-from flask_smorest import Api
+    from app import routes, errors, cli, tracing
+    tracing.init_app(app)
+    app.register_blueprint(routes.bp)
+    app.register_blueprint(errors.bp)
+    cli.register(app)
 
-app.app_context().push()
-db.create_all()
+    from flask_smorest import Api
+    from app.controller import register_blueprints
+    api = Api(app)
+    register_blueprints(api)
 
-# note if workers have problems starting a task try to set the PATH and the PYTHONPATH env variables
-app.redis = Redis.from_url(app.config['REDIS_URL'], port=5040)
-app.execute_queue = rq.Queue('forest-service_execute', connection=app.redis, default_timeout=3600)
-app.implementation_queue = rq.Queue('forest-service_implementation_exe', connection=app.redis, default_timeout=10000)
-app.logger.setLevel(logging.INFO)
+    return app
 
-api = Api(app)
-register_blueprints(api)
 
-@app.route("/")
-def heartbeat():
-    return '<h1>forest-service is running</h1> <h3>View the API Docs <a href="/api/swagger-ui">here</a></h3>'
\ No newline at end of file
+from app import result_model, generated_circuit_model
@@ -0,0 +1,80 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+from statistics import NormalDist
+from typing import Dict, Iterator
+
+import numpy as np
+
+_metrics = ('confidence-interval', 'total-variation')
+
+
+def parse_target_precision(target_precision: Dict) -> Dict:
+    """Validate the target precision of a request and complete it by the defaults."""
+    metric = target_precision.get('metric', 'total-variation')
+    if metric not in _metrics:
+        raise ValueError(f"metric has to be one of {', '.join(_metrics)}")
+    try:
+        tolerance = float(target_precision['tolerance'])
+        confidence = float(target_precision.get('confidence', 0.95))
+        top_k = int(target_precision.get('top-k', 1))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('target precision requires a numeric tolerance, confidence, and top-k')
+    if not 0 < tolerance < 1 or not 0 < confidence < 1 or top_k < 1:
+        raise ValueError('tolerance and confidence have to be in (0, 1) and top-k has to be positive')
+    return {'metric': metric, 'tolerance': tolerance, 'confidence': confidence, 'top-k': top_k}
+
+
+def has_converged(counts: Dict[str, int], target_precision: Dict) -> bool:
+    """Check if the sampled distribution meets the target precision.
+
+    For confidence-interval, the Wilson score intervals of the top-k probabilities have to be narrower than
+    2 * tolerance. For total-variation, the expected total variation distance between the sampled and the exact
+    distribution, 1/2 * sum(sqrt(p * (1 - p) / shots)), has to be below the tolerance.
+    """
+    shots = sum(counts.values())
+    if not shots:
+        return False
+    probabilities = np.fromiter(counts.values(), dtype=float, count=len(counts)) / shots
+
+    if target_precision['metric'] == 'confidence-interval':
+        z = NormalDist().inv_cdf((1 + target_precision['confidence']) / 2)
+        top = np.sort(probabilities)[::-1][:target_precision['top-k']]
+        half_widths = z / (1 + z ** 2 / shots) * np.sqrt(top * (1 - top) / shots + z ** 2 / (4 * shots ** 2))
+        return bool(np.all(half_widths <= target_precision['tolerance']))
+
+    expected_distance = 0.5 * np.sum(np.sqrt(probabilities * (1 - probabilities) / shots))
+    return bool(expected_distance <= target_precision['tolerance'])
+
+
+def get_batch_sizes(initial_shots: int, max_shots: int) -> Iterator[int]:
+    """Yield batch sizes doubling the shots used so far, e.g., 256, 256, 512, 1024, ..., up to max_shots in total."""
+    used_shots = 0
+    batch_size = initial_shots
+    while used_shots < max_shots:
+        batch_size = min(batch_size, max_shots - used_shots)
+        yield batch_size
+        used_shots += batch_size
+        batch_size = used_shots
+
+
+def merge_counts(counts: Dict[str, int], other_counts: Dict[str, int]) -> Dict[str, int]:
+    merged = dict(counts)
+    for bitstring, count in other_counts.items():
+        merged[bitstring] = merged.get(bitstring, 0) + count
+    return merged
@@ -24,7 +24,9 @@ from pyquil.api import QuantumComputer
 from pyquil.external.rpcq import Qubit
 from pyquil.quilbase import Measurement, Gate
 
-from app import app
+from flask import current_app
+
+from app import forest_handler
 import re
 
 multi_qubit_gates_regex = '(CZ|XY|CNOT|CCNOT|CPHASE00|CPHASE01|CPHASE10|CPHASE|SWAP|CSWAP|ISWAP|PSWAP)'
@@ -130,8 +132,8 @@ def get_non_transpiled_circuit_metrics(non_transpiled_circuit: Program) -> Dict:
 
 def get_circuit_metrics(circuit: Program, backend: QuantumComputer, short_impl_name: str, qpu_name: str) -> Dict:
     non_transpiled_circuit = circuit
-    nq_program = backend.compiler.quil_to_native_quil(circuit, protoquil=True)
-    transpiled_circuit = backend.compiler.native_quil_to_executable(nq_program)
+    nq_program = forest_handler.quil_to_native_quil(circuit, backend)
+    transpiled_circuit = forest_handler.native_quil_to_executable(nq_program, backend)
 
     # count number of multi qubit gates
     program_string = str(transpiled_circuit)
@@ -158,7 +160,7 @@ def get_circuit_metrics(circuit: Program, backend: QuantumComputer, short_impl_n
 
     print(nq_program.native_quil_metadata)
 
-    app.logger.info(
+    current_app.logger.info(
         f"Transpile {short_impl_name} for {qpu_name}: "
         f"w={width}, "
         f"d={depth}, "
@@ -0,0 +1,128 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import hashlib
+import pickle
+import uuid
+from collections import namedtuple
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from flask import current_app
+
+# chunk size in bytes uploads are read, hashed, and written to Redis with
+CHUNK_SIZE = 64 * 1024
+
+
+# job arguments which may be large and are passed by reference, the others are always pickled into the job
+PAYLOAD_ARGUMENTS = ('impl_data', 'transpiled_quil', 'input_params', 'input_params_list')
+
+# reference to a job argument stored in the blob store, pickled into the job instead of the argument
+BlobRef = namedtuple('BlobRef', ['key'])
+
+
+class BlobTooLarge(ValueError):
+    pass
+
+
+def _key(key: str) -> str:
+    return f"forest-service:blobs:{key}"
+
+
+def put_stream(stream: BinaryIO, max_size: int) -> Tuple[str, int]:
+    """Store the content read from the stream chunk by chunk under its SHA-256 hash, which is computed while the
+    content arrives, and return the hash and the size. Identical content is only stored once."""
+    digest = hashlib.sha256()
+    size = 0
+    temp_key = _key(f"upload:{uuid.uuid4()}")
+    ttl = current_app.config['BLOB_STORE_TTL']
+    try:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise BlobTooLarge(f"content exceeds {max_size} bytes")
+            digest.update(chunk)
+            pipeline = current_app.redis.pipeline()
+            pipeline.append(temp_key, chunk)
+            # the partial upload expires if the upload is aborted
+            pipeline.expire(temp_key, ttl)
+            pipeline.execute()
+        key = digest.hexdigest()
+        if size and not current_app.redis.renamenx(temp_key, _key(key)):
+            # the content has already been stored
+            current_app.redis.delete(temp_key)
+        current_app.redis.expire(_key(key), ttl)
+        return key, size
+    except Exception:
+        current_app.redis.delete(temp_key)
+        raise
+
+
+def contains(key: str) -> bool:
+    return bool(current_app.redis.exists(_key(key)))
+
+
+def get(key: str) -> Optional[bytes]:
+    return current_app.redis.get(_key(key))
+
+
+def get_text(key: str) -> str:
+    """Return the stored content decoded as UTF-8, raise ValueError if it has expired."""
+    content = get(key)
+    if content is None:
+        raise ValueError(f"uploaded content {key} has expired")
+    return content.decode('utf-8')
+
+
+def put(content: bytes) -> str:
+    """Store the content under its SHA-256 hash and return the hash. Identical content is only stored once, storing
+    it again extends its TTL."""
+    key = hashlib.sha256(content).hexdigest()
+    ttl = current_app.config['BLOB_STORE_TTL']
+    pipeline = current_app.redis.pipeline()
+    pipeline.set(_key(key), content, ex=ttl, nx=True)
+    pipeline.expire(_key(key), ttl)
+    pipeline.execute()
+    return key
+
+
+def by_reference(kwargs: Dict) -> Dict:
+    """Replace the payload arguments of a job pickled larger than BLOB_STORE_INLINE_MAX bytes by references to the
+    blob store, thus, the job hash in Redis only contains their hashes."""
+    inline_max = current_app.config['BLOB_STORE_INLINE_MAX']
+    kwargs = dict(kwargs)
+    for name in PAYLOAD_ARGUMENTS:
+        if kwargs.get(name):
+            content = pickle.dumps(kwargs[name], protocol=pickle.HIGHEST_PROTOCOL)
+            if len(content) > inline_max:
+                kwargs[name] = BlobRef(put(content))
+    return kwargs
+
+
+def resolve(kwargs: Dict) -> Dict:
+    """Replace the references of the job arguments by the stored arguments, raise ValueError if one has expired."""
+    resolved = dict(kwargs)
+    for name, value in kwargs.items():
+        if isinstance(value, BlobRef):
+            content = get(value.key)
+            if content is None:
+                raise ValueError(f"argument {name} of the job has expired in the blob store")
+            resolved[name] = pickle.loads(content)
+    return resolved
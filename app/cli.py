@@ -0,0 +1,125 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import json
+import random
+import re
+import subprocess
+import sys
+import time
+import timeit
+
+import click
+
+from app import db, hot_store, json_provider
+
+
+def register(app):
+    @app.cli.command('import-time')
+    @click.argument('module', default='app.tasks')
+    @click.option('--top', default=15, help='Number of slowest imports to show.')
+    def import_time(module, top):
+        """Measure the time to import a module in a fresh interpreter, e.g., app for the service and app.tasks for
+        the workers."""
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                 capture_output=True, text=True)
+        if process.returncode != 0:
+            click.echo(process.stderr)
+            sys.exit(process.returncode)
+
+        # lines are of the form "import time: <self [us]> | <cumulative [us]> | <module>"
+        imports = []
+        for line in process.stderr.splitlines():
+            match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)', line)
+            if match:
+                imports.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+
+        total = sum(cumulative for cumulative, indentation, _ in imports if indentation == 1)
+        click.echo(f'Importing {module} took {total / 1e6:.3f}s, slowest imports (cumulative):')
+        for cumulative, _, name in sorted(imports, reverse=True)[:top]:
+            click.echo(f'{cumulative / 1e6:10.3f}s  {name}')
+
+    @app.cli.command('benchmark-json')
+    @click.option('--keys', default=100000, help='Number of bitstrings of the counts dict.')
+    @click.option('--repeat', default=5, help='Number of repetitions, the fastest is reported.')
+    def benchmark_json(keys, repeat):
+        """Compare the JSON serialization of the service with the json module using a counts dict."""
+        width = max(keys - 1, 1).bit_length()
+        counts = {format(i, f'0{width}b'): random.randint(1, 1000) for i in range(keys)}
+        serialized = json.dumps(counts)
+
+        def best(statement):
+            return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+        benchmarks = [
+            ('dumps', lambda: json.dumps(counts), lambda: json_provider.dumps(counts)),
+            ('loads', lambda: json.loads(serialized), lambda: json_provider.loads(serialized)),
+            # returning a stored result: parse and serialize again vs. embedding the stored JSON
+            ('stored result response', lambda: json.dumps({'result': json.loads(serialized)}),
+             lambda: json_provider.dumps({'result': json_provider.raw(serialized)})),
+        ]
+        click.echo(f'Counts dict with {keys} keys:')
+        for name, stdlib, provider in benchmarks:
+            stdlib_time, provider_time = best(stdlib), best(provider)
+            click.echo(f'{name:>24}: json {stdlib_time * 1e3:8.2f}ms, rapidjson {provider_time * 1e3:8.2f}ms, '
+                       f'speedup {stdlib_time / provider_time:5.1f}x')
+
+    @app.cli.command('flush-hot-store')
+    @click.option('--once', is_flag=True, help='Flush all pending rows and exit.')
+    def flush_hot_store(once):
+        """Persist the results and generated circuits written to Redis to the database using bulk UPDATEs."""
+        from app.generated_circuit_model import Generated_Circuit
+        from app.result_model import Result
+
+        batch_size = app.config['HOT_STORE_FLUSH_BATCH']
+        while True:
+            flushed = 0
+            for model in (Result, Generated_Circuit):
+                try:
+                    flushed += hot_store.flush(model, batch_size)
+                except Exception as e:
+                    app.logger.error(f"Could not flush {model.__tablename__}: {e}")
+            if not flushed:
+                if once:
+                    break
+                time.sleep(app.config['HOT_STORE_FLUSH_INTERVAL'])
+
+    @app.cli.command('purge-results')
+    @click.option('--once', is_flag=True, help='Purge all expired rows and exit.')
+    @click.option('--compact', is_flag=True, help='Compact the SQLite database after purging.')
+    def purge_results(once, compact):
+        """Delete results and generated circuits completed more than RETENTION_DAYS ago in batches."""
+        from app import retention
+
+        while True:
+            purged = 0
+            while True:
+                try:
+                    deleted = retention.purge(app.config['RETENTION_DAYS'], app.config['RETENTION_PURGE_BATCH'])
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"Could not purge expired rows: {e}")
+                    break
+                if not deleted:
+                    break
+                purged += deleted
+            if purged and compact:
+                retention.compact()
+            if once:
+                break
+            time.sleep(app.config['RETENTION_PURGE_INTERVAL'])
@@ -28,6 +28,115 @@ class Config(object):
 
     REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:5040'
 
+    # maximum runtime in seconds of execute and generate jobs, clients may request shorter timeouts
+    EXECUTE_TIMEOUT = int(os.environ.get('EXECUTE_TIMEOUT') or 3600)
+    GENERATE_TIMEOUT = int(os.environ.get('GENERATE_TIMEOUT') or 10000)
+
+    # circuit breaking and health probes of the quilc and QVM endpoints
+    ENDPOINT_FAILURE_THRESHOLD = int(os.environ.get('ENDPOINT_FAILURE_THRESHOLD') or 3)
+    ENDPOINT_COOLDOWN = int(os.environ.get('ENDPOINT_COOLDOWN') or 30)
+    ENDPOINT_PROBE_TIMEOUT = float(os.environ.get('ENDPOINT_PROBE_TIMEOUT') or 2)
+    # requests of killed workers are not counted as outstanding anymore after this many seconds
+    ENDPOINT_REQUEST_TTL = int(os.environ.get('ENDPOINT_REQUEST_TTL') or 3600)
+
+    # compiled programs are stored on disk, e.g., on a volume shared by all workers, and the least recently used
+    # programs are evicted once the store exceeds EXECUTABLE_STORE_MAX_SIZE bytes, its size is tracked in Redis
+    EXECUTABLE_STORE_PATH = os.environ.get('EXECUTABLE_STORE_PATH') or os.path.join(basedir, 'executables')
+    EXECUTABLE_STORE_MAX_SIZE = int(os.environ.get('EXECUTABLE_STORE_MAX_SIZE') or 512 * 1024 * 1024)
+
+    # number of processes generating the circuits of a batch in parallel
+    GENERATE_PROCESSES = int(os.environ.get('GENERATE_PROCESSES') or 1)
+
+    # maximum number of waiting execute jobs whose small circuits are packed onto disjoint qubits of the circuit of
+    # a running job, 0 disables the multi-programming, and the number of waiting jobs inspected to find them
+    MULTIPROGRAMMING_MAX_JOBS = int(os.environ.get('MULTIPROGRAMMING_MAX_JOBS') or 8)
+    MULTIPROGRAMMING_LOOKAHEAD = int(os.environ.get('MULTIPROGRAMMING_LOOKAHEAD') or 100)
+    # maximum total width of the packed circuits, the QVM simulates all packed qubits at once, i.e., packing only pays
+    # off as long as 2^width of the packed circuit stays small compared to the overhead of executing the jobs one by one
+    MULTIPROGRAMMING_MAX_WIDTH = int(os.environ.get('MULTIPROGRAMMING_MAX_WIDTH') or 12)
+
+    # execute jobs with an estimated cost (shots * operations * 2^width) up to SCHEDULING_HIGH_PRIORITY_COST are
+    # enqueued into the high priority lane, from SCHEDULING_LOW_PRIORITY_COST on into the low priority lane
+    SCHEDULING_HIGH_PRIORITY_COST = float(os.environ.get('SCHEDULING_HIGH_PRIORITY_COST') or 1e7)
+    SCHEDULING_LOW_PRIORITY_COST = float(os.environ.get('SCHEDULING_LOW_PRIORITY_COST') or 1e10)
+    # jobs are rejected with 429 if the estimated cost of all waiting jobs exceeds the limit, 0 disables the limit
+    SCHEDULING_BACKLOG_LIMIT = float(os.environ.get('SCHEDULING_BACKLOG_LIMIT') or 1e13)
+    # estimated cost processed per second by all workers, used to compute Retry-After
+    SCHEDULING_COST_RATE = float(os.environ.get('SCHEDULING_COST_RATE') or 1e9)
+    SCHEDULING_MAX_RETRY_AFTER = int(os.environ.get('SCHEDULING_MAX_RETRY_AFTER') or 3600)
+    # the summed up cost of every lane is corrected by the waiting jobs of the lane every this many seconds
+    SCHEDULING_RECONCILE_INTERVAL = int(os.environ.get('SCHEDULING_RECONCILE_INTERVAL') or 60)
+    # width and number of operations assumed for circuits which are not known before they are generated
+    SCHEDULING_DEFAULT_WIDTH = int(os.environ.get('SCHEDULING_DEFAULT_WIDTH') or 5)
+    SCHEDULING_DEFAULT_OPERATIONS = int(os.environ.get('SCHEDULING_DEFAULT_OPERATIONS') or 100)
+
+    # shots of the first batch of executions with a target precision, each further batch doubles the shots used
+    ADAPTIVE_SHOTS_INITIAL_BATCH = int(os.environ.get('ADAPTIVE_SHOTS_INITIAL_BATCH') or 256)
+
+    # maximum number of results requested at once from the bulk endpoint
+    BULK_RESULTS_MAX_IDS = int(os.environ.get('BULK_RESULTS_MAX_IDS') or 1000)
+
+    # counts of seeded executions are cached in Redis for RESULT_CACHE_TTL seconds
+    RESULT_CACHE_TTL = int(os.environ.get('RESULT_CACHE_TTL') or 86400)
+
+    # maximum number of QPUs a circuit is transpiled for concurrently
+    TRANSPILE_WORKERS = int(os.environ.get('TRANSPILE_WORKERS') or 8)
+
+    # readout noise models per qpu-name, either a path to a JSON file or a JSON string of the form
+    # {"<qpu-name>": {"p00": 0.97, "p11": 0.95, "qubits": {"<qubit>": [p00, p11]}}}
+    READOUT_NOISE_MODELS = os.environ.get('READOUT_NOISE_MODELS')
+    READOUT_FIDELITY = float(os.environ.get('READOUT_FIDELITY') or 0.97)
+
+    # readout calibrations used for error mitigation are cached in Redis for CALIBRATION_TTL seconds
+    CALIBRATION_TTL = int(os.environ.get('CALIBRATION_TTL') or 3600)
+    CALIBRATION_SHOTS = int(os.environ.get('CALIBRATION_SHOTS') or 8192)
+
+    # results and generated circuits are written to Redis and persisted to the database by the hot-store-flusher,
+    # thus, HOT_STORE_TTL has to exceed the time it takes to flush them
+    HOT_STORE_TTL = int(os.environ.get('HOT_STORE_TTL') or 86400)
+    # seconds the flusher waits if there is nothing to flush and maximum number of rows per UPDATE
+    HOT_STORE_FLUSH_INTERVAL = float(os.environ.get('HOT_STORE_FLUSH_INTERVAL') or 1.0)
+    HOT_STORE_FLUSH_BATCH = int(os.environ.get('HOT_STORE_FLUSH_BATCH') or 500)
+
+    # completed results and generated circuits are purged RETENTION_DAYS after their completion by purge-results,
+    # which deletes at most RETENTION_PURGE_BATCH rows per transaction and runs every RETENTION_PURGE_INTERVAL seconds
+    RETENTION_DAYS = float(os.environ.get('RETENTION_DAYS') or 30)
+    RETENTION_PURGE_BATCH = int(os.environ.get('RETENTION_PURGE_BATCH') or 1000)
+    RETENTION_PURGE_INTERVAL = float(os.environ.get('RETENTION_PURGE_INTERVAL') or 3600)
+
+    # default and maximum number of results per page of the result listing
+    RESULTS_PAGE_SIZE = int(os.environ.get('RESULTS_PAGE_SIZE') or 100)
+    RESULTS_MAX_PAGE_SIZE = int(os.environ.get('RESULTS_MAX_PAGE_SIZE') or 1000)
+
+    # implementations are downloaded using keep-alive connections, at most HTTP_POOL_SIZE per host, with connect and
+    # read timeouts in seconds, and retried HTTP_RETRIES times with exponential backoff
+    HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE') or 10)
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT') or 5)
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT') or 30)
+    HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES') or 3)
+    HTTP_RETRY_BACKOFF = float(os.environ.get('HTTP_RETRY_BACKOFF') or 0.5)
+    # maximum number of implementations downloaded concurrently by a process
+    HTTP_PREFETCH_WORKERS = int(os.environ.get('HTTP_PREFETCH_WORKERS') or 8)
+
+    # uploaded implementations and large job arguments are stored in Redis for BLOB_STORE_TTL seconds, which has to
+    # exceed the time jobs wait in the queue, uploads may be at most BLOB_STORE_MAX_SIZE bytes large
+    BLOB_STORE_TTL = int(os.environ.get('BLOB_STORE_TTL') or 86400)
+    BLOB_STORE_MAX_SIZE = int(os.environ.get('BLOB_STORE_MAX_SIZE') or 16 * 1024 * 1024)
+    # job arguments like impl-data and transpiled-quil larger than BLOB_STORE_INLINE_MAX bytes are stored once in the
+    # blob store and passed to the job by their hash
+    BLOB_STORE_INLINE_MAX = int(os.environ.get('BLOB_STORE_INLINE_MAX') or 1024)
+
+    # results and generated circuits larger than COMPRESSION_MIN_SIZE bytes are compressed using brotli or gzip if
+    # accepted by the client
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE') or 1024)
+    GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL') or 6)
+    BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY') or 5)
+
+    # spans of requests, jobs, quilc and QVM calls, and database commits are appended as OTLP JSON lines to
+    # TRACING_FILE, e.g., on a volume shared by the service and the workers, tracing is disabled if it is not set
+    TRACING_FILE = os.environ.get('TRACING_FILE')
+    TRACING_SERVICE_NAME = os.environ.get('TRACING_SERVICE_NAME') or 'forest-service'
+
     API_TITLE = "forest-service"
     API_VERSION = "0.1"
     OPENAPI_VERSION = "3.0.2"
@@ -1,7 +1,8 @@
-from app.controller import transpile, execute, analysis_original_circuit, result, generated_circuit, generate_circuit
+from app.controller import transpile, execute, analysis_original_circuit, result, generated_circuit, generate_circuit, \
+    generate_circuits, endpoints, expectation_values, implementation
 
 MODULES = (transpile, execute, analysis_original_circuit, result,
-           generated_circuit, generate_circuit)
+           generated_circuit, generate_circuit, generate_circuits, endpoints, expectation_values, implementation)
 
 
 def register_blueprints(api):
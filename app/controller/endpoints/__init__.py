@@ -0,0 +1 @@
+from app.controller.endpoints.endpoints_controller import blp
@@ -0,0 +1,13 @@
+from flask_smorest import Blueprint
+
+from app.model.circuit_response import (EndpointsResponseSchema)
+
+blp = Blueprint("Endpoints", __name__,
+                description="Get availability, outstanding requests, and latency of the quilc and QVM endpoints.", )
+
+
+@blp.route("/forest-service/api/v1.0/endpoints", methods=["GET"])
+@blp.response(200, EndpointsResponseSchema)
+def encoding(json):
+    if json:
+        return
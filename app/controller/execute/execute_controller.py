@@ -30,6 +30,16 @@ blp = Blueprint(
                     \"impl-data\": \"BASE64-ENCODED-IMPLEMENTATION\"
                 Execution via transpiled Quil String:
                     \"transpiled-quil\":\"TRANSPILED-QUIL-STRING\" 
+                Simulation of readout errors with the noise model configured for a QPU:
+                    \"noise-model\": \"QPU-NAME\"
+                Mitigation of readout errors using cached calibrations of the QPU:
+                    \"mitigate-readout-errors\": true
+                Reproducible execution whose counts are cached:
+                    \"seed\": 42
+                Execution in batches of increasing shots until the counts converge, \"shots\" is the maximum:
+                    \"target-precision\": {\"metric\": \"total-variation\", \"tolerance\": 0.02}
+                    \"target-precision\": {\"metric\": \"confidence-interval\", \"tolerance\": 0.01,
+                                           \"confidence\": 0.95, \"top-k\": 2}
                 for Batch Execution of multiple circuits use:
                     \"impl-url\": [\"URL-OF-IMPLEMENTATION-1\", \"URL-OF-IMPLEMENTATION-2\"]
                 the \"input-params\"are of the form:
@@ -0,0 +1 @@
+from app.controller.expectation_values.expectation_values_controller import blp
@@ -0,0 +1,41 @@
+from flask_smorest import Blueprint
+
+from app import routes
+from app.model.circuit_response import (
+    ExecuteResponseSchema
+)
+from app.model.algorithm_request import (
+    ExpectationValuesRequestSchema,
+    ExpectationValuesRequest
+)
+
+blp = Blueprint("Expectation Values", __name__,
+                description="Simulate the wavefunction of a circuit and compute exact probabilities or expectation "
+                            "values of Pauli sums without sampling shots.", )
+
+
+@blp.route("/forest-service/api/v1.0/expectation-values", methods=["POST"])
+@blp.arguments(
+    ExpectationValuesRequestSchema,
+    description='''\
+                Simulation via URL:
+                    \"impl-url\": \"URL-OF-IMPLEMENTATION\"
+                Simulation via data:
+                    \"impl-data\": \"BASE64-ENCODED-IMPLEMENTATION\"
+                Simulation via transpiled Quil String:
+                    \"transpiled-quil\":\"TRANSPILED-QUIL-STRING\"
+                Expectation values of Pauli sums, all evaluated against the same wavefunction:
+                    \"observables\": [\"Z0\", \"0.5*Z0*Z1 - X2 + 1.5\"]
+                Exact probabilities, returned by default if no observables are given:
+                    \"probabilities\": true''',
+    example={
+        "impl-url": "https://raw.githubusercontent.com/UST-QuAntiL/nisq-analyzer-content/master/example-implementations/Grover-SAT/grover-fix-sat-pyquil.py",
+        "impl-language": "pyquil",
+        "observables": ["Z0", "Z0*Z1"],
+        "input-params": {}
+    }
+)
+@blp.response(200, ExecuteResponseSchema, description="Returns a content location for the result. Access it via GET")
+def encoding(json: ExpectationValuesRequest):
+    if json:
+        return routes.simulate_circuit()
@@ -0,0 +1 @@
+from app.controller.generate_circuits.generate_circuits_controller import blp
@@ -0,0 +1,45 @@
+from flask_smorest import Blueprint
+
+from app import routes
+from app.model.algorithm_request import (GenerateCircuitsRequest, GenerateCircuitsRequestSchema)
+from app.model.circuit_response import (GenerateCircuitResponseSchema, GeneratedCircuitBatchResponseSchema)
+
+blp = Blueprint("Generate Circuits", __name__, description="Send implementation and multiple sets of input parameters "
+                                                           "to the API to generate a circuit for each of them.", )
+
+
+@blp.route("/forest-service/api/v1.0/generate-circuits", methods=["POST"])
+@blp.arguments(GenerateCircuitsRequestSchema, description='''\
+                Generation via URL:
+                    \"impl-url\": \"URL-OF-IMPLEMENTATION\" 
+                Generation via data:
+                    \"impl-data\": \"BASE64-ENCODED-IMPLEMENTATION\"
+                the \"input-params\" are a list of sets of input parameters:
+                    \"input-params\": [{
+                        \"PARAM-NAME-1\": {
+                            \"rawValue\": \"YOUR-VALUE-1\",
+                            \"type\": \"Integer\"
+                        },
+                        ...
+                    }, ...]
+                alternatively, a circuit is generated for every combination of the values of an \"input-params-grid\":
+                    \"input-params-grid\": {
+                        \"PARAM-NAME-1\": {
+                            \"rawValues\": [\"YOUR-VALUE-1\", \"YOUR-VALUE-2\"],
+                            \"type\": \"Integer\"
+                        },
+                        ...
+                    }''', example={
+    "impl-url": "https://raw.githubusercontent.com/UST-QuAntiL/nisq-analyzer-content/master/example-implementations/Grover-SAT/grover-fix-sat-pyquil.py", "impl-language": "pyquil", "input-params": [{}]})
+@blp.response(200, GenerateCircuitResponseSchema,
+              description="Returns a content location for the batch of generated circuits. Access it via GET")
+def encoding(json: GenerateCircuitsRequest):
+    if json:
+        return routes.generate_circuits()
+
+
+@blp.route("/forest-service/api/v1.0/generated-circuit-batches/<id>", methods=["GET"])
+@blp.response(200, GeneratedCircuitBatchResponseSchema)
+def batch(json):
+    if json:
+        return
@@ -1,8 +1,9 @@
 from flask_smorest import Blueprint
 
-from app.model.circuit_response import (GeneratedCircuitsResponseSchema)
+from app.model.circuit_response import (GeneratedCircuitsResponseSchema, CancelResponseSchema)
 
-blp = Blueprint("Generated Circuits", __name__, description="Request a generated circuit and its properties.", )
+blp = Blueprint("Generated Circuits", __name__,
+                description="Request a generated circuit and its properties or cancel its generation.", )
 
 
 @blp.route("/forest-service/api/v1.0/generated-circuits/<id>", methods=["GET"])
@@ -10,3 +11,12 @@ blp = Blueprint("Generated Circuits", __name__, description="Request a generated
 def encoding(json):
     if json:
         return
+
+
+@blp.route("/forest-service/api/v1.0/generated-circuits/<id>", methods=["DELETE"])
+@blp.doc(description="Removes a waiting generation from the queue or stops a running generation. Returns 409 if the "
+                     "generation is already completed.")
+@blp.response(200, CancelResponseSchema)
+def cancel(json):
+    if json:
+        return
@@ -0,0 +1 @@
+from app.controller.implementation.implementation_controller import blp
@@ -0,0 +1,17 @@
+from flask_smorest import Blueprint
+
+from app.model.circuit_response import (ImplementationUploadResponseSchema)
+
+blp = Blueprint("Implementations", __name__,
+                description="Upload an implementation or Quil program once and refer to it by its hash.", )
+
+
+@blp.route("/forest-service/api/v1.0/implementations", methods=["POST"])
+@blp.doc(description="Stores the raw request body or the file of a multipart form, e.g., "
+                     "curl --data-binary @shor.quil -H \"Content-Type: application/octet-stream\". Returns the SHA-256 "
+                     "hash of the content, which is passed as \"impl-ref\" instead of \"impl-data\" to generate, "
+                     "execute, and simulate it.")
+@blp.response(201, ImplementationUploadResponseSchema)
+def upload(json):
+    if json:
+        return
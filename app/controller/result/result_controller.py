@@ -1,8 +1,13 @@
 from flask_smorest import Blueprint
 
-from app.model.circuit_response import (ResultsResponseSchema)
+from app import routes
+from app.model.algorithm_request import (ExtendResultRequest, ExtendResultRequestSchema, BulkResultsRequest,
+                                         BulkResultsRequestSchema, ListResultsRequest, ListResultsRequestSchema)
+from app.model.circuit_response import (ResultsResponseSchema, CancelResponseSchema, ExecuteResponseSchema,
+                                        BulkResultsResponseSchema, ListResultsResponseSchema)
 
-blp = Blueprint("Results", __name__, description="Get execution results of an executed circuit.", )
+blp = Blueprint("Results", __name__,
+                description="Get execution results of an executed circuit or cancel the execution.", )
 
 
 @blp.route("/forest-service/api/v1.0/results/<id>", methods=["GET"])
@@ -10,3 +15,58 @@ blp = Blueprint("Results", __name__, description="Get execution results of an ex
 def encoding(json):
     if json:
         return
+
+
+@blp.route("/forest-service/api/v1.0/results/<id>", methods=["DELETE"])
+@blp.doc(description="Removes a waiting execution from the queue or stops a running execution. Returns 409 if the "
+                     "execution is already completed.")
+@blp.response(200, CancelResponseSchema)
+def cancel(json):
+    if json:
+        return
+
+
+@blp.route("/forest-service/api/v1.0/results/<id>/extend", methods=["POST"])
+@blp.doc(description="Executes additional shots of the stored compiled program of a completed execution and merges "
+                     "their counts into the result. The result is incomplete until the counts are merged. If the "
+                     "additional shots fail, the result keeps its counts and reports the \"extension-error\".")
+@blp.arguments(
+    ExtendResultRequestSchema,
+    example={
+        "shots": 4096,
+        "token": "YOUR-TOKEN"
+    }
+)
+@blp.response(200, ExecuteResponseSchema, description="Returns the content location of the result. Access it via GET")
+def extend(json: ExtendResultRequest, id):
+    if json:
+        return routes.extend_result(id)
+
+
+@blp.route("/forest-service/api/v1.0/results/bulk", methods=["POST"])
+@blp.doc(description="Returns the completion state and, if \"include-results\" is true, the results of all given "
+                     "ids using a single query. Given the \"cursor\" of the previous response, only the results "
+                     "completed since then are returned.")
+@blp.arguments(
+    BulkResultsRequestSchema,
+    example={
+        "ids": ["RESULT-ID-1", "RESULT-ID-2"],
+        "include-results": True,
+        "cursor": "2024-07-25T09:47:12.330581"
+    }
+)
+@blp.response(200, BulkResultsResponseSchema)
+def bulk(json: BulkResultsRequest):
+    if json:
+        return routes.get_results()
+
+
+@blp.route("/forest-service/api/v1.0/results", methods=["GET"])
+@blp.doc(description="Lists past executions, newest first, filtered by \"backend\", \"correlation-id\", and the "
+                     "creation time in UTC (\"created-after\", \"created-before\"). The next page is requested by "
+                     "passing the \"cursor\" of the previous response, which is empty on the last page.")
+@blp.arguments(ListResultsRequestSchema, location="query")
+@blp.response(200, ListResultsResponseSchema)
+def list_results(json: ListResultsRequest):
+    if json:
+        return routes.list_results()
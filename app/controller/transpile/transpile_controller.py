@@ -27,6 +27,10 @@ blp = Blueprint(
                     \"impl-url\": \"URL-OF-IMPLEMENTATION\" 
                 Transpile via data:
                     \"impl-data\": \"BASE64-ENCODED-IMPLEMENTATION\"
+                Transpile for multiple QPUs at once, returning the properties per QPU:
+                    \"qpu-names\": [\"QPU-NAME-1\", \"QPU-NAME-2\"]
+                Estimate the properties based on the qubit topology of the QPU in milliseconds without quilc:
+                    \"estimate\": true
                 the \"input-params\"are of the form:
                     \"input-params\": {
                         \"PARAM-NAME-1\": {
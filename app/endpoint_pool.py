@@ -0,0 +1,154 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import random
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from flask import current_app
+from pyquil.api._abstract_compiler import QuilcNotRunning
+from pyquil.api._qvm import QVMNotRunning
+from rq.timeouts import JobTimeoutException
+
+# errors raised by the transport to quilc and the QVM, errors of the clients themselves, e.g., a program which cannot be
+# compiled, are of the generic QuilcError and QVMError types of qcs_sdk
+_ENDPOINT_ERRORS = (ConnectionError, TimeoutError, socket.timeout, QuilcNotRunning, QVMNotRunning)
+
+
+def is_endpoint_error(error: BaseException) -> bool:
+    """Check if the error is caused by the endpoint not being reachable or not answering in time, in contrast to,
+    e.g., a program which cannot be compiled or a job exceeding its RQ timeout."""
+    while error is not None:
+        if isinstance(error, JobTimeoutException):
+            return False
+        if isinstance(error, _ENDPOINT_ERRORS):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class EndpointPool:
+    """Routes requests to the endpoint with the least outstanding requests.
+
+    The state of the endpoints is kept in Redis, thus, it is shared by all gunicorn and RQ worker processes.
+    Endpoints failing ENDPOINT_FAILURE_THRESHOLD times in a row are not used for ENDPOINT_COOLDOWN seconds and
+    have to pass a health probe before they are used again. The outstanding requests are kept as a sorted set scored by
+    their expiry, thus, the requests of killed work horses are not counted after ENDPOINT_REQUEST_TTL seconds.
+    """
+
+    def __init__(self, name: str, urls: List[str]):
+        self.name = name
+        self.urls = [url.strip() for url in urls if url.strip()]
+
+    def _key(self, url: str, suffix: str) -> str:
+        return f"forest-service:endpoints:{self.name}:{url}:{suffix}"
+
+    def probe(self, url: str) -> bool:
+        """Check if the endpoint accepts connections."""
+        parsed_url = urlparse(url)
+        try:
+            with socket.create_connection((parsed_url.hostname, parsed_url.port),
+                                          timeout=current_app.config['ENDPOINT_PROBE_TIMEOUT']):
+                return True
+        except OSError:
+            return False
+
+    def _is_available(self, url: str) -> bool:
+        if current_app.redis.exists(self._key(url, 'open')):
+            return False
+        if current_app.redis.exists(self._key(url, 'probe')):
+            # the cooldown has expired, the endpoint is used again once it passes a health probe
+            if not self.probe(url):
+                self._open_circuit(url)
+                return False
+            current_app.redis.delete(self._key(url, 'probe'), self._key(url, 'failures'))
+        return True
+
+    def select(self) -> str:
+        """Return the available endpoint with the least outstanding requests."""
+        if len(self.urls) == 1:
+            return self.urls[0]
+        candidates = [url for url in self.urls if self._is_available(url)] or self.urls
+        pipeline = current_app.redis.pipeline()
+        for url in candidates:
+            pipeline.zcount(self._key(url, 'outstanding-requests'), time.time(), '+inf')
+        outstanding = pipeline.execute()
+        least_outstanding = min(outstanding)
+        return random.choice([url for url, count in zip(candidates, outstanding) if count == least_outstanding])
+
+    def _open_circuit(self, url: str):
+        pipeline = current_app.redis.pipeline()
+        pipeline.set(self._key(url, 'open'), 1, ex=current_app.config['ENDPOINT_COOLDOWN'])
+        pipeline.set(self._key(url, 'probe'), 1)
+        pipeline.execute()
+
+    def _record_failure(self, url: str):
+        failures = current_app.redis.incr(self._key(url, 'failures'))
+        current_app.redis.hincrby(self._key(url, 'stats'), 'failures', 1)
+        if failures >= current_app.config['ENDPOINT_FAILURE_THRESHOLD']:
+            current_app.logger.warning(f"{self.name} endpoint {url} failed {failures} times, not using it for "
+                                       f"{current_app.config['ENDPOINT_COOLDOWN']}s.")
+            self._open_circuit(url)
+
+    @contextmanager
+    def track(self, url: str):
+        """Track a request to the given endpoint, i.e., its outstanding requests, latency, and failures. Only errors
+        connecting to the endpoint count as failures of the endpoint."""
+        request_id = uuid.uuid4().hex
+        ttl = current_app.config['ENDPOINT_REQUEST_TTL']
+        pipeline = current_app.redis.pipeline()
+        pipeline.zremrangebyscore(self._key(url, 'outstanding-requests'), '-inf', time.time())
+        pipeline.zadd(self._key(url, 'outstanding-requests'), {request_id: time.time() + ttl})
+        pipeline.expire(self._key(url, 'outstanding-requests'), ttl)
+        pipeline.execute()
+        start = perf_counter()
+        try:
+            yield
+        except Exception as e:
+            if is_endpoint_error(e):
+                self._record_failure(url)
+            raise
+        else:
+            current_app.redis.delete(self._key(url, 'failures'))
+        finally:
+            pipeline = current_app.redis.pipeline()
+            pipeline.zrem(self._key(url, 'outstanding-requests'), request_id)
+            pipeline.hincrby(self._key(url, 'stats'), 'requests', 1)
+            pipeline.hincrbyfloat(self._key(url, 'stats'), 'latency', perf_counter() - start)
+            pipeline.execute()
+
+    def metrics(self) -> List[Dict]:
+        metrics = []
+        for url in self.urls:
+            outstanding = current_app.redis.zcount(self._key(url, 'outstanding-requests'), time.time(), '+inf')
+            stats = current_app.redis.hgetall(self._key(url, 'stats'))
+            requests = int(stats.get(b'requests', 0))
+            metrics.append({
+                'url': url,
+                'available': not current_app.redis.exists(self._key(url, 'open')),
+                'outstanding-requests': outstanding,
+                'requests': requests,
+                'failures': int(stats.get(b'failures', 0)),
+                'mean-latency': float(stats.get(b'latency', 0)) / requests if requests else None,
+            })
+        return metrics
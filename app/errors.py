@@ -17,25 +17,26 @@
 #  limitations under the License.
 # ******************************************************************************
 
-from flask import make_response, jsonify
-from app import app
+from flask import Blueprint, make_response, jsonify
 
+bp = Blueprint('errors', __name__)
 
-@app.errorhandler(500)
+
+@bp.app_errorhandler(500)
 def internal_server(error):
     return make_response(jsonify({'error': 'Internal Server Error', 'statusCode': '500'}), 500)
 
 
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found(error):
     return make_response(jsonify({'error': 'Not found', 'statusCode': '404'}), 404)
 
 
-@app.errorhandler(400)
+@bp.app_errorhandler(400)
 def bad_request(error):
     return make_response(jsonify({'error': 'Bad Request', 'statusCode': '400'}), 400)
 
 
-@app.errorhandler(401)
+@bp.app_errorhandler(401)
 def unauthorized(error):
     return make_response(jsonify({"error": "Unauthorized", "statusCode": "401"}), 401)
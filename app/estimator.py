@@ -0,0 +1,161 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+from typing import Dict, List, Tuple
+
+import networkx as nx
+from pyquil import Program
+from pyquil.quilbase import Gate, Measurement
+
+from app import forest_handler
+
+# topologies and their shortest paths are cached per qpu-name, thus, get_qc is only called once per QPU
+_topologies: Dict[str, Tuple[nx.Graph, Dict]] = {}
+
+# estimated number of native single qubit gates (RX(k*pi/2), RZ) of a single qubit gate after compilation
+_single_qubit_native_gates = {'I': 0, 'RZ': 1, 'Z': 1, 'S': 1, 'T': 1, 'PHASE': 1, 'RX': 1, 'X': 1, 'Y': 2, 'H': 3,
+                              'RY': 3}
+_default_single_qubit_native_gates = 5
+
+# estimated number of native two qubit gates (CZ) and native single qubit gates of a multi qubit gate
+_multi_qubit_native_gates = {'CZ': (1, 0), 'XY': (1, 0), 'CNOT': (1, 4), 'CPHASE': (2, 5), 'CPHASE00': (2, 5),
+                             'CPHASE01': (2, 5), 'CPHASE10': (2, 5), 'ISWAP': (2, 6), 'PSWAP': (3, 8),
+                             'SWAP': (3, 8), 'CCNOT': (6, 9), 'CSWAP': (8, 11)}
+_default_multi_qubit_native_gates = (3, 8)
+_swap_native_gates = _multi_qubit_native_gates['SWAP']
+
+
+def get_topology(token, qpu_name: str) -> Tuple[nx.Graph, Dict]:
+    """Return the qubit topology of the QPU and the shortest paths between all its qubits."""
+    if qpu_name not in _topologies:
+        backend = forest_handler.get_qpu(token, qpu_name)
+        topology = backend.quantum_processor.qubit_topology()
+        _topologies[qpu_name] = (topology, dict(nx.all_pairs_shortest_path(topology)))
+    return _topologies[qpu_name]
+
+
+def _initial_placement(logical_qubits: List[int], interactions: List[Tuple[int, int]], topology: nx.Graph,
+                       shortest_paths: Dict) -> Dict[int, int]:
+    """Place logical qubits interacting with each other on close physical qubits, starting at the best connected."""
+    if len(logical_qubits) > topology.number_of_nodes():
+        raise ValueError('too many qubits required')
+
+    partners = {qubit: [] for qubit in logical_qubits}
+    for a, b in interactions:
+        partners[a].append(b)
+        partners[b].append(a)
+    # interacting qubits in order of their first interaction, followed by all others
+    order = list(dict.fromkeys([qubit for interaction in interactions for qubit in interaction] + logical_qubits))
+
+    placement = {}
+    free = set(topology.nodes)
+    for qubit in order:
+        placed_partners = [placement[partner] for partner in partners[qubit] if partner in placement]
+        if not placed_partners:
+            placed_partners = list(placement.values())
+        if placed_partners:
+            # unconnected qubits are treated as the most distant ones
+            physical = min(free, key=lambda node: (sum(len(shortest_paths[node].get(partner, topology.nodes))
+                                                       for partner in placed_partners),
+                                                   -topology.degree[node], node))
+        else:
+            physical = max(free, key=lambda node: (topology.degree[node], -node))
+        placement[qubit] = physical
+        free.remove(physical)
+    return placement
+
+
+def estimate_circuit_metrics(circuit: Program, topology: nx.Graph, shortest_paths: Dict) -> Dict:
+    """Estimate the metrics of the circuit transpiled for the given topology without quilc.
+
+    Gates are decomposed by a table of typical native gate counts, qubits are placed greedily, and multi qubit gates
+    between distant qubits are routed by SWAPs along the shortest paths, moving the other qubits next to the first.
+    """
+    gates = []
+    number_of_measurement_operations = 0
+    measured_qubits = set()
+    for instruction in circuit.instructions:
+        if isinstance(instruction, Measurement):
+            number_of_measurement_operations += 1
+            measured_qubits.add(instruction.qubit.index)
+        elif isinstance(instruction, Gate):
+            gates.append((instruction.name, [qubit.index for qubit in instruction.qubits]))
+
+    interactions = [(qubits[0], qubit) for _, qubits in gates for qubit in qubits[1:]]
+    logical_qubits = sorted({qubit for _, qubits in gates for qubit in qubits} | measured_qubits)
+    placement = _initial_placement(logical_qubits, interactions, topology, shortest_paths)
+    # physical qubit -> logical qubit
+    occupation = {physical: logical for logical, physical in placement.items()}
+
+    depths: Dict[int, int] = {}
+    multi_qubit_gate_depths: Dict[int, int] = {}
+    number_of_single_qubit_gates = 0
+    number_of_multi_qubit_gates = 0
+    number_of_swaps = 0
+
+    def add_multi_qubit_gate(physical_qubits, multi_qubit_natives, single_qubit_natives):
+        depth = max(depths.get(qubit, 0) for qubit in physical_qubits)
+        multi_qubit_gate_depth = max(multi_qubit_gate_depths.get(qubit, 0) for qubit in physical_qubits)
+        for qubit in physical_qubits:
+            depths[qubit] = depth + multi_qubit_natives + (single_qubit_natives + 1) // 2
+            multi_qubit_gate_depths[qubit] = multi_qubit_gate_depth + multi_qubit_natives
+
+    for name, qubits in gates:
+        if len(qubits) == 1:
+            natives = _single_qubit_native_gates.get(name, _default_single_qubit_native_gates)
+            number_of_single_qubit_gates += natives
+            physical = placement[qubits[0]]
+            depths[physical] = depths.get(physical, 0) + natives
+            continue
+
+        # route all qubits of the gate next to its first qubit
+        target = placement[qubits[0]]
+        for qubit in qubits[1:]:
+            path = shortest_paths[placement[qubit]].get(target)
+            if path is None:
+                raise ValueError('qubits are not connected')
+            for current, following in zip(path[:-2], path[1:-1]):
+                add_multi_qubit_gate((current, following), *_swap_native_gates)
+                number_of_swaps += 1
+                moved, displaced = occupation.get(current), occupation.get(following)
+                occupation[following], occupation[current] = moved, displaced
+                placement[moved] = following
+                if displaced is not None:
+                    placement[displaced] = current
+
+        multi_qubit_natives, single_qubit_natives = _multi_qubit_native_gates.get(name,
+                                                                                _default_multi_qubit_native_gates)
+        number_of_multi_qubit_gates += multi_qubit_natives
+        number_of_single_qubit_gates += single_qubit_natives
+        add_multi_qubit_gate([placement[qubit] for qubit in qubits], multi_qubit_natives, single_qubit_natives)
+
+    number_of_multi_qubit_gates += number_of_swaps * _swap_native_gates[0]
+    number_of_single_qubit_gates += number_of_swaps * _swap_native_gates[1]
+
+    return {
+        'depth': max(depths.values(), default=0),
+        'multi-qubit-gate-depth': max(multi_qubit_gate_depths.values(), default=0),
+        'width': len(set(placement.values()) | set(depths.keys())),
+        'total-number-of-operations': number_of_single_qubit_gates + number_of_multi_qubit_gates
+                                      + number_of_measurement_operations,
+        'number-of-single-qubit-gates': number_of_single_qubit_gates,
+        'number-of-multi-qubit-gates': number_of_multi_qubit_gates,
+        'number-of-measurement-operations': number_of_measurement_operations,
+        'number-of-swaps': number_of_swaps,
+        'estimated': True,
+    }
@@ -0,0 +1,140 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+from flask import current_app
+from pyquil import Program
+from qcs_sdk.compiler.quilc import NativeQuilMetadata
+
+_metadata_fields = ('final_rewiring', 'gate_depth', 'gate_volume', 'multiqubit_gate_depth', 'program_duration',
+                    'program_fidelity', 'topological_swaps', 'qpu_runtime_estimation')
+
+# programs are written to temporary files first, which are only removed by the eviction once they are abandoned
+_temp_suffix = '.tmp'
+_temp_max_age = 3600
+# the eviction removes programs until the store is below this fraction of its maximum size, thus, it is run rarely
+_eviction_target = 0.9
+
+# total size of the stored programs shared by all workers, corrected by every eviction
+_size_key = 'forest-service:executables:size'
+_evicting_key = 'forest-service:executables:evicting'
+
+
+def program_key(program: Program, qpu_name: str) -> str:
+    """Return the content address of the native Quil compiled from the given program for the given QPU."""
+    return hashlib.sha256(f"{qpu_name}\n{program.out()}".encode()).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(current_app.config['EXECUTABLE_STORE_PATH'], key[:2], key)
+
+
+def contains(key: str) -> bool:
+    return os.path.exists(_path(key))
+
+
+def load(key: str) -> Optional[Program]:
+    """Return the stored native Quil program including its metadata or None if it is not stored."""
+    path = _path(key)
+    try:
+        with open(path, 'rb') as f:
+            stored = json.load(f)
+        # the modification time is used as last access time for the eviction
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+
+    nq_program = Program(stored['native-quil'])
+    if stored['metadata'] is not None:
+        nq_program.native_quil_metadata = NativeQuilMetadata(**stored['metadata'])
+    return nq_program
+
+
+def save(key: str, nq_program: Program):
+    """Store the native Quil program and its metadata and evict the least recently used programs if the store
+    exceeds EXECUTABLE_STORE_MAX_SIZE."""
+    metadata = nq_program.native_quil_metadata
+    stored = {'native-quil': nq_program.out(),
+              'metadata': {field: getattr(metadata, field, None) for field in _metadata_fields} if metadata else None}
+
+    path = _path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced_size = os.path.getsize(path)
+        except OSError:
+            replaced_size = 0
+        # write to a temporary file first, so concurrent workers never read a partially written program
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=_temp_suffix)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(stored, f)
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, path)
+    except OSError as e:
+        current_app.logger.warning(f"Could not store compiled program {key}: {e}")
+        return
+
+    # the size of the store is only measured if it is not known, e.g., after Redis has been flushed
+    if current_app.redis.set(_size_key, 0, nx=True):
+        _evict()
+    elif current_app.redis.incrby(_size_key, size - replaced_size) > current_app.config['EXECUTABLE_STORE_MAX_SIZE']:
+        _evict()
+
+
+def _evict():
+    """Remove the least recently used programs until the store is below its target size and save the measured size.
+    Only one worker evicts at a time."""
+    if not current_app.redis.set(_evicting_key, 1, nx=True, ex=60):
+        return
+    try:
+        entries = []
+        for directory, _, files in os.walk(current_app.config['EXECUTABLE_STORE_PATH']):
+            for file in files:
+                path = os.path.join(directory, file)
+                try:
+                    stat = os.stat(path)
+                    if file.endswith(_temp_suffix):
+                        # temporary files are written by other workers unless they have been abandoned
+                        if stat.st_mtime < time.time() - _temp_max_age:
+                            os.remove(path)
+                        continue
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry[1] for entry in entries)
+        if size > current_app.config['EXECUTABLE_STORE_MAX_SIZE']:
+            target_size = current_app.config['EXECUTABLE_STORE_MAX_SIZE'] * _eviction_target
+            for _, file_size, path in sorted(entries):
+                if size <= target_size:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= file_size
+        # programs saved during the eviction are counted by the next one
+        current_app.redis.set(_size_key, size)
+    finally:
+        current_app.redis.delete(_evicting_key)
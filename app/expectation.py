@@ -0,0 +1,99 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# a Pauli term is a real coefficient and a mapping from qubits to the Pauli operators X, Y, or Z acting on them
+PauliTerm = Tuple[float, Dict[int, str]]
+
+_pauli_operator = re.compile(r'([IXYZ])(\d+)')
+_number = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+
+
+def parse_observable(observable: str) -> List[PauliTerm]:
+    """Parse a Pauli sum of the form "0.5*Z0*Z1 - X2 + 1.5" into its terms."""
+    terms = []
+    # split at signs which are not part of an exponent
+    for term in re.split(r'(?<![eE*])(?=[+-])', observable.replace(' ', '')):
+        if not term:
+            continue
+        coefficient = 1.0
+        operators = {}
+        if term[0] in '+-':
+            coefficient = -1.0 if term[0] == '-' else 1.0
+            term = term[1:]
+        for factor in term.split('*'):
+            if _number.fullmatch(factor):
+                coefficient *= float(factor)
+            elif factor and _pauli_operator.sub('', factor) == '':
+                for operator, qubit in _pauli_operator.findall(factor):
+                    if int(qubit) in operators:
+                        raise ValueError(f"qubit {qubit} occurs twice in term {term}")
+                    if operator != 'I':
+                        operators[int(qubit)] = operator
+            else:
+                raise ValueError(f"invalid factor '{factor}' in observable {observable}")
+        terms.append((coefficient, operators))
+    if not terms:
+        raise ValueError('empty observable')
+    return terms
+
+
+def get_probabilities(amplitudes: np.ndarray, threshold: float = 1e-12) -> Dict[str, float]:
+    """Return the exact probabilities of all bitstrings, with qubit 0 as last character like the counts."""
+    probabilities = np.abs(amplitudes) ** 2
+    width = int(np.log2(len(amplitudes)))
+    return {np.binary_repr(i, width=width): float(probabilities[i])
+            for i in np.flatnonzero(probabilities > threshold)}
+
+
+def expectation_values(amplitudes: np.ndarray, observables: Sequence[List[PauliTerm]]) -> List[float]:
+    """Evaluate the expectation values of all observables against the same wavefunction.
+
+    A Pauli string P maps |i> to phase(i)|i ^ flip>, where flip contains the qubits acted on by X or Y, thus,
+    <psi|P|psi> is a single vectorized sum over all basis states instead of a matrix-vector product.
+    """
+    amplitudes = np.asarray(amplitudes, dtype=complex)
+    indices = np.arange(len(amplitudes))
+    width = int(np.log2(len(amplitudes)))
+    # the bits of all basis states are computed once and shared by all terms of all observables
+    bits = [(indices >> qubit) & 1 for qubit in range(width)]
+
+    values = []
+    for terms in observables:
+        value = 0.0
+        for coefficient, operators in terms:
+            if any(qubit >= width for qubit in operators):
+                raise ValueError("observable acts on qubits not used by the circuit")
+            flip = 0
+            parity = np.zeros(len(amplitudes), dtype=np.int64)
+            number_of_ys = 0
+            for qubit, operator in operators.items():
+                if operator in 'XY':
+                    flip |= 1 << qubit
+                if operator in 'YZ':
+                    parity ^= bits[qubit]
+                if operator == 'Y':
+                    number_of_ys += 1
+            phases = (1j ** number_of_ys) * (1 - 2 * parity)
+            value += coefficient * np.vdot(amplitudes[indices ^ flip], phases * amplitudes).real
+        values.append(float(value))
+    return values
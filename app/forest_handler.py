@@ -19,31 +19,77 @@
 from time import sleep
 
 from pyquil import get_qc
-from pyquil.api import QCSClient
+from pyquil.api import QCSClient, WavefunctionSimulator
+from pyquil.quilbase import Measurement
 import numpy as np
 import os
+from flask import current_app
 
 from qcs_sdk.compiler.quilc import QuilcClient
 from qcs_sdk.qvm import QVMClient
 
+from app import adaptive_shots, executable_store, tracing
+from app.endpoint_pool import EndpointPool
+from app.noise_model import get_readout_qubits
+
 # Get environment variables
 qvm_hostname = os.environ.get('QVM_HOSTNAME', default='localhost')
 qvm_port = os.environ.get('QVM_PORT', default=5016)
 quilc_hostname = os.environ.get('QUILC_HOSTNAME', default= 'localhost')
 quilc_port = os.environ.get('QUILC_PORT', default=5017)
 
+# comma-separated lists of endpoints, e.g., "tcp://quilc-1:5017,tcp://quilc-2:5017"
+quilc_pool = EndpointPool('quilc', os.environ.get('QUILC_ENDPOINTS',
+                                                  default=f"tcp://{quilc_hostname}:{quilc_port}").split(','))
+qvm_pool = EndpointPool('qvm', os.environ.get('QVM_ENDPOINTS', default=f"http://{qvm_hostname}:{qvm_port}").split(','))
+
 def get_qpu(token, qpu_name):
     """Get backend."""
+    quilc_url = quilc_pool.select()
+    qvm_url = qvm_pool.select()
 
     # Create a connection to the forest SDK
     connection = QCSClient(
-        qvm_url=f"http://{qvm_hostname}:{qvm_port}",
-        quilc_url=f"tcp://{quilc_hostname}:{quilc_port}")
+        qvm_url=qvm_url,
+        quilc_url=quilc_url)
 
 
     # Get Quantum computer as Quantum Virtual Machine
-    return get_qc(name=qpu_name,
-                  as_qvm=True, client_configuration=connection, quilc_client=QuilcClient.new_rpcq(f"tcp://{quilc_hostname}:{quilc_port}"), qvm_client=QVMClient.new_http(f"http://{qvm_hostname}:{qvm_port}"))
+    backend = get_qc(name=qpu_name,
+                     as_qvm=True, client_configuration=connection, quilc_client=QuilcClient.new_rpcq(quilc_url), qvm_client=QVMClient.new_http(qvm_url))
+    backend.quilc_url = quilc_url
+    backend.qvm_url = qvm_url
+    return backend
+
+
+def quil_to_native_quil(program, backend):
+    """Compile the program to native Quil using the quilc endpoint of the backend. Programs compiled before, also
+    by other workers, are loaded from the executable store without calling quilc."""
+    with tracing.span('quil_to_native_quil', **{'qpu.name': backend.name}) as span:
+        key = executable_store.program_key(program, backend.name)
+        nq_program = executable_store.load(key)
+        span.set_attribute('executable_store.hit', nq_program is not None)
+        if nq_program is None:
+            span.set_attribute('quilc.url', backend.quilc_url)
+            with quilc_pool.track(backend.quilc_url):
+                nq_program = backend.compiler.quil_to_native_quil(program, protoquil=True)
+            executable_store.save(key, nq_program)
+    nq_program.wrap_in_numshots_loop(program.num_shots)
+    return nq_program
+
+
+@tracing.traced('native_quil_to_executable')
+def native_quil_to_executable(nq_program, backend):
+    return backend.compiler.native_quil_to_executable(nq_program)
+
+
+def get_wavefunction(program):
+    """Simulate the program without its measurements and return the amplitudes of the final wavefunction."""
+    qvm_url = qvm_pool.select()
+    simulator = WavefunctionSimulator(client_configuration=QCSClient(qvm_url=qvm_url))
+    program = program.filter_instructions(lambda instruction: not isinstance(instruction, Measurement))
+    with qvm_pool.track(qvm_url):
+        return simulator.wavefunction(program).amplitudes
 
 
 def delete_token():
@@ -51,19 +97,71 @@ def delete_token():
     pass
 
 
-def execute_job(transpiled_circuit, shots, backend):
-    """Generate qObject from transpiled circuit and execute it. Return result."""
+def run_job(transpiled_circuit, backend, noise_model=None, seed=None):
+    """Execute the transpiled circuit and return the measured readout register as (shots x width) array. Given a
+    seed, the QVM and the readout noise are sampled reproducibly."""
 
-    stats = backend.run(transpiled_circuit)
+    if seed is not None:
+        backend.qam.random_seed = seed
+    with qvm_pool.track(backend.qvm_url), tracing.span('backend.run', **{'qvm.url': backend.qvm_url}):
+        stats = backend.run(transpiled_circuit)
     stats = stats.get_register_map().get("ro")
-    print(stats)
+    width = stats.shape[-1]
+
+    if noise_model:
+        # simulate readout errors on the sampled shots instead of running the much slower noisy QVM
+        stats = noise_model.apply(stats, get_readout_qubits(transpiled_circuit, width), np.random.default_rng(seed))
+    return stats
+
+
+@tracing.traced('execute_job')
+def execute_job(transpiled_circuit, shots, backend, noise_model=None, seed=None):
+    """Generate qObject from transpiled circuit and execute it. Return result."""
+
+    stats = run_job(transpiled_circuit, backend, noise_model, seed)
+    with tracing.span('execute_job.aggregate_counts', shots=shots):
+        stats = _get_counts(stats)
+    return stats
+
+
+def execute_adaptive_job(transpiled_circuit, max_shots, backend, target_precision, noise_model=None, seed=None):
+    """Execute the transpiled circuit in batches of increasing shots until the counts meet the target precision or
+    max_shots are used. Return the merged counts and the shots used."""
+
+    counts = {}
+    shots = 0
+    for batch, batch_shots in enumerate(
+            adaptive_shots.get_batch_sizes(current_app.config['ADAPTIVE_SHOTS_INITIAL_BATCH'], max_shots)):
+        transpiled_circuit.wrap_in_numshots_loop(batch_shots)
+        batch_counts = execute_job(transpiled_circuit, batch_shots, backend, noise_model,
+                                   None if seed is None else seed + batch)
+        counts = adaptive_shots.merge_counts(counts, batch_counts)
+        shots += batch_shots
+        if adaptive_shots.has_converged(counts, target_precision):
+            break
+    return counts, shots
+
+
+def execute_packed_job(transpiled_circuit, backend, registers, noise_model=None):
+    """Execute the circuits packed into the transpiled circuit at once. Return the counts of every readout register."""
+
+    with qvm_pool.track(backend.qvm_url), tracing.span('backend.run', **{'qvm.url': backend.qvm_url}):
+        register_map = backend.run(transpiled_circuit).get_register_map()
+    counts = []
+    with tracing.span('execute_job.aggregate_counts', registers=len(registers)):
+        for register in registers:
+            stats = register_map.get(register)
+            if noise_model:
+                stats = noise_model.apply(stats, get_readout_qubits(transpiled_circuit, stats.shape[-1], register))
+            counts.append(_get_counts(stats))
+    return counts
+
+
+def _get_counts(stats):
     width = stats.shape[-1]
 
     def binary_string(x):
         return np.binary_repr(np.packbits(x, bitorder='little')[0], width=width)
 
-
     unique, counts = np.unique(stats, return_counts=True, axis=0)
-    stats = dict(zip(map(binary_string, unique), map(int, counts)))
-    print(stats)
-    return stats
+    return dict(zip(map(binary_string, unique), map(int, counts)))
@@ -17,6 +17,8 @@
 #  limitations under the License.
 # ******************************************************************************
 
+from datetime import datetime
+
 from app import db
 
 
@@ -32,6 +34,23 @@ class Generated_Circuit(db.Model):
     original_number_of_single_qubit_gates = db.Column(db.Integer)
     original_multi_qubit_gate_depth = db.Column(db.Integer)
     complete = db.Column(db.Boolean, default=False)
+    batch_id = db.Column(db.String(36), nullable=True, index=True)
+    # time in UTC the generation has been requested
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # time in UTC the generation has been completed, used to purge generated circuits
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    # completed generated circuits are purged by completed_at
+    __table_args__ = (
+        db.Index('ix_generated__circuit_complete_completed_at', 'complete', 'completed_at'),
+    )
 
     def __repr__(self):
-        return 'Generated_Circuit {}'.format(self.generated_circuit)
\ No newline at end of file
+        return 'Generated_Circuit {}'.format(self.generated_circuit)
+
+
+@db.event.listens_for(Generated_Circuit.complete, 'set', active_history=True)
+def _set_completed_at(generated_circuit, complete, previous_complete, initiator):
+    # the previous value is a loader symbol instead of False for new generated circuits
+    if complete and previous_complete is not True:
+        generated_circuit.completed_at = datetime.utcnow()
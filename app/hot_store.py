@@ -0,0 +1,150 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from flask import current_app
+
+from app import db, json_provider, tracing
+
+# values of the columns as they have been loaded or saved, attached to the rows to save only the changed columns
+_LOADED = '_hot_store_loaded'
+
+
+def _key(model, id: str) -> str:
+    return f"forest-service:hot:{model.__tablename__}:{id}"
+
+
+def _dirty_key(model) -> str:
+    return f"forest-service:hot:{model.__tablename__}:dirty"
+
+
+def _to_dict(obj) -> Dict:
+    row = {column.name: getattr(obj, column.key) for column in obj.__table__.columns}
+    # dates are serialized as HTTP dates by the JSON provider, which drops the microseconds
+    return {name: value.isoformat() if isinstance(value, datetime) else value for name, value in row.items()}
+
+
+def _from_hash(model, fields: Dict) -> Dict:
+    row = {name.decode(): json_provider.loads(value) for name, value in fields.items()}
+    for column in model.__table__.columns:
+        if isinstance(column.type, db.DateTime) and row.get(column.name):
+            row[column.name] = datetime.fromisoformat(row[column.name])
+    return row
+
+
+def _to_object(model, row: Dict):
+    obj = model()
+    # the columns are set in their order, thus, completed_at is set after complete and not overwritten by it
+    for column in model.__table__.columns:
+        setattr(obj, column.key, row.get(column.name))
+    setattr(obj, _LOADED, _to_dict(obj))
+    return obj
+
+
+def save(obj):
+    """Write the changed columns of the row to Redis, it is persisted to the database by the flusher. Every column is
+    a field of a hash, thus, concurrent saves of different columns, e.g., the cancellation of a result by the API and
+    the counts by the worker, do not overwrite each other."""
+    model = type(obj)
+    row = _to_dict(obj)
+    loaded = getattr(obj, _LOADED, None)
+    changed = {name: value for name, value in row.items() if loaded is None or loaded.get(name) != value}
+    with tracing.span('hot_store.save', table=model.__tablename__):
+        key = _key(model, obj.id)
+        pipeline = current_app.redis.pipeline()
+        if changed:
+            pipeline.hset(key, mapping={name: json_provider.dumps(value) for name, value in changed.items()})
+        # the unchanged columns are only written if the row has not been in Redis
+        for name, value in row.items():
+            if name not in changed:
+                pipeline.hsetnx(key, name, json_provider.dumps(value))
+        pipeline.expire(key, current_app.config['HOT_STORE_TTL'])
+        pipeline.sadd(_dirty_key(model), obj.id)
+        pipeline.execute()
+    setattr(obj, _LOADED, row)
+
+
+def _detach(obj):
+    # changes are written by save, thus, they must never be flushed to the database holding its write lock
+    if obj is not None:
+        db.session.expunge(obj)
+        setattr(obj, _LOADED, _to_dict(obj))
+    return obj
+
+
+def _get_hashes(model, ids: List[str]) -> List[Dict]:
+    pipeline = current_app.redis.pipeline()
+    for id in ids:
+        pipeline.hgetall(_key(model, id))
+    return pipeline.execute()
+
+
+def get(model, id: str):
+    """Return the row from Redis if it has been written recently, otherwise from the database. The row is not
+    attached to the session, changes have to be written by save."""
+    fields = current_app.redis.hgetall(_key(model, id))
+    if fields:
+        return _to_object(model, _from_hash(model, fields))
+    return _detach(model.query.get(id))
+
+
+def get_many(model, ids: Iterable[str]) -> List:
+    """Return the rows with the given ids, preferring Redis and loading the others using a single query."""
+    ids = list(ids)
+    if not ids:
+        return []
+    rows = {id: _to_object(model, _from_hash(model, fields))
+            for id, fields in zip(ids, _get_hashes(model, ids)) if fields}
+    missing_ids = [id for id in ids if id not in rows]
+    if missing_ids:
+        rows.update({row.id: _detach(row) for row in model.query.filter(model.id.in_(missing_ids)).all()})
+    return [rows[id] for id in ids if id in rows]
+
+
+def flush(model, batch_size: int) -> int:
+    """Persist up to batch_size rows written to Redis using a single bulk UPDATE. Return the number of rows."""
+    ids = [id.decode() for id in current_app.redis.spop(_dirty_key(model), batch_size)]
+    if not ids:
+        return 0
+    rows = [_from_hash(model, fields) for fields in _get_hashes(model, ids) if fields]
+    try:
+        if rows:
+            db.session.execute(db.update(model), rows)
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        # the rows are persisted by the next flush
+        current_app.redis.sadd(_dirty_key(model), *ids)
+        raise
+    return len(rows)
+
+
+def evict(model, ids: Iterable[str]):
+    """Remove the rows from Redis, e.g., after they have been deleted from the database."""
+    ids = list(ids)
+    if ids:
+        pipeline = current_app.redis.pipeline()
+        pipeline.delete(*[_key(model, id) for id in ids])
+        pipeline.srem(_dirty_key(model), *ids)
+        pipeline.execute()
+
+
+def pending(model) -> int:
+    return current_app.redis.scard(_dirty_key(model))
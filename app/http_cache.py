@@ -0,0 +1,82 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import gzip
+import hashlib
+from typing import Callable
+
+from flask import Response, current_app, request
+
+try:
+    import brotli
+except ImportError:
+    # responses are only compressed using gzip
+    brotli = None
+
+# completed rows that can not change anymore are cached by clients for a year
+_immutable_cache_control = 'public, max-age=31536000, immutable'
+# all other rows have to be revalidated using If-None-Match on every poll
+_revalidate_cache_control = 'no-cache'
+
+
+def row_etag(obj) -> str:
+    """Return a strong ETag derived from the stored columns of the row, without serializing the response."""
+    digest = hashlib.sha256()
+    for column in obj.__table__.columns:
+        digest.update(str(getattr(obj, column.key)).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def _negotiate_encoding():
+    encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(encodings)
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=current_app.config['BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=current_app.config['GZIP_LEVEL'])
+
+
+def conditional_response(etag: str, immutable: bool, build: Callable[[], Response]) -> Response:
+    """Return 304 Not Modified if the client already has a representation with the ETag, otherwise build the
+    response and compress it using the encoding accepted by the client.
+
+    Compressed representations get the encoding appended to the ETag. Whether a response is compressed only depends
+    on its content, thus, both ETags identify the same content. The response is only built if it is sent.
+    """
+    encoding = _negotiate_encoding()
+    candidate_etags = [etag, f"{etag}-{encoding}"] if encoding else [etag]
+    matching_etag = next((candidate for candidate in candidate_etags
+                          if request.if_none_match.contains_weak(candidate)), None)
+    if matching_etag:
+        response = Response(status=304)
+        response.set_etag(matching_etag)
+    else:
+        response = build()
+        data = response.get_data()
+        if encoding and len(data) >= current_app.config['COMPRESSION_MIN_SIZE']:
+            response.set_data(_compress(data, encoding))
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f"{etag}-{encoding}")
+        else:
+            response.set_etag(etag)
+    response.headers['Cache-Control'] = _immutable_cache_control if immutable else _revalidate_cache_control
+    response.vary.add('Accept-Encoding')
+    return response
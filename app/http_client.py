@@ -0,0 +1,89 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+import urllib3
+from flask import current_app
+from urllib3.util import Retry, Timeout
+
+# the pool and the executor are created per process, forked work horses must not share the connections of the worker
+_pid: Optional[int] = None
+_pool: Optional[urllib3.PoolManager] = None
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class DownloadError(Exception):
+    def __init__(self, url: str, status: Optional[int] = None, reason: str = ''):
+        super().__init__(f"Downloading {url} failed: {status or reason}")
+        self.url = url
+        self.status = status
+
+
+def _get_pool() -> urllib3.PoolManager:
+    global _pid, _pool, _executor
+    if _pid != os.getpid():
+        _pid = os.getpid()
+        # keeps up to HTTP_POOL_SIZE connections per host alive, e.g., to raw.githubusercontent.com
+        _pool = urllib3.PoolManager(maxsize=current_app.config['HTTP_POOL_SIZE'], block=False)
+        _executor = None
+    return _pool
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    _get_pool()
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=current_app.config['HTTP_PREFETCH_WORKERS'],
+                                       thread_name_prefix='http-prefetch')
+    return _executor
+
+
+def _get_request_options() -> Dict:
+    config = current_app.config
+    return {
+        'timeout': Timeout(connect=config['HTTP_CONNECT_TIMEOUT'], read=config['HTTP_READ_TIMEOUT']),
+        # connection errors and temporary server errors are retried with exponential backoff
+        'retries': Retry(total=config['HTTP_RETRIES'], backoff_factor=config['HTTP_RETRY_BACKOFF'],
+                         status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset({'GET'}),
+                         raise_on_status=False),
+    }
+
+
+def _get(pool: urllib3.PoolManager, url: str, headers: Dict[str, str], options: Dict) -> str:
+    try:
+        response = pool.request('GET', url, headers=headers, **options)
+    except urllib3.exceptions.HTTPError as e:
+        raise DownloadError(url, reason=str(e)) from e
+    if response.status != 200:
+        raise DownloadError(url, status=response.status)
+    return response.data.decode('utf-8')
+
+
+def get(url: str, headers: Dict[str, str] = None) -> str:
+    """Download the text at the URL using a pooled keep-alive connection. Raise DownloadError if the download fails
+    after HTTP_RETRIES retries or the response is not 200 OK."""
+    return _get(_get_pool(), url, headers or {}, _get_request_options())
+
+
+def get_async(url: str, headers: Dict[str, str] = None) -> Future:
+    """Download the text at the URL in a background thread, the future raises DownloadError if the download fails."""
+    # the configuration is read in the calling thread, which has the application context
+    return _get_executor().submit(_get, _get_pool(), url, headers or {}, _get_request_options())
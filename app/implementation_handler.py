@@ -16,21 +16,30 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 # ******************************************************************************
-import urllib
-from urllib import request, error
 import tempfile
+import multiprocessing
 import os, sys, shutil
+from concurrent.futures import Future
+from contextlib import contextmanager
 from importlib import reload
+from typing import Dict, Iterable, Tuple
+from urllib.parse import urlparse
 
 from flask_restful import abort
-from pyquil import Program
-from urllib3 import HTTPResponse
 
-from app import app
+from flask import current_app
 
+from app import http_client, tracing
+from app.http_client import DownloadError
+from app.quil_analysis import parse_quil
 
-def prepare_code_from_data(data, input_params):
-    """Get implementation code from data. Set input parameters into implementation. Return circuit."""
+# downloads started by prefetch_code, consumed by the next _download_code of the same URL and bearer token
+_prefetched: Dict[Tuple[str, str], Future] = {}
+
+
+@contextmanager
+def _import_code(data):
+    """Write the implementation code to a temporary module and import it."""
     temp_dir = tempfile.mkdtemp()
     with open(os.path.join(temp_dir, "__init__.py"), "w") as f:
         f.write("")
@@ -47,25 +56,79 @@ def prepare_code_from_data(data, input_params):
                 delattr(downloaded_code, attr)
 
         reload(downloaded_code)
-        if 'get_circuit' in dir(downloaded_code):
-            circuit = downloaded_code.get_circuit(**input_params)
-        elif 'qc' in dir(downloaded_code):
-            circuit = downloaded_code.qc
-        elif 'p' in dir(downloaded_code):
-            circuit = downloaded_code.p
+        yield downloaded_code
     finally:
         sys.path.remove(temp_dir)
         shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _get_circuit(downloaded_code, input_params):
+    circuit = None
+    if 'get_circuit' in dir(downloaded_code):
+        circuit = downloaded_code.get_circuit(**input_params)
+    elif 'qc' in dir(downloaded_code):
+        circuit = downloaded_code.qc
+    elif 'p' in dir(downloaded_code):
+        circuit = downloaded_code.p
+    return circuit
+
+
+@tracing.traced('prepare_code_from_data')
+def prepare_code_from_data(data, input_params):
+    """Get implementation code from data. Set input parameters into implementation. Return circuit."""
+    with _import_code(data) as downloaded_code:
+        circuit = _get_circuit(downloaded_code, input_params)
     if not circuit:
         raise ValueError
     return circuit
 
 
+# implementation module and circuit processing function of the running batch, inherited by forked processes
+_batch = None
+
+
+def _prepare_batch_circuit(input_params):
+    downloaded_code, process_circuit = _batch
+    try:
+        circuit = _get_circuit(downloaded_code, input_params)
+        return process_circuit(circuit) if circuit else None
+    except Exception:
+        current_app.logger.exception(f"Generating circuit for input params {input_params} failed.")
+        return None
+
+
+def prepare_circuits_from_data(data, input_params_list, process_circuit, processes=1):
+    """Get implementation code from data and import it once. Generate a circuit for every set of input parameters
+    and process it using process_circuit, which has to be picklable if processes > 1. Return the processed circuits,
+    None for each set of input parameters whose circuit could not be generated."""
+    global _batch
+    with _import_code(data) as downloaded_code:
+        _batch = (downloaded_code, process_circuit)
+        try:
+            if processes > 1 and len(input_params_list) > 1:
+                # forked processes inherit the imported module, thus, it is not imported again
+                with multiprocessing.get_context('fork').Pool(min(processes, len(input_params_list))) as pool:
+                    return pool.map(_prepare_batch_circuit, input_params_list)
+            return [_prepare_batch_circuit(input_params) for input_params in input_params_list]
+        finally:
+            _batch = None
+
+
+def prepare_circuits_from_url(url, input_params_list, process_circuit, bearer_token: str = "", processes=1):
+    """Get implementation code from URL and generate and process a circuit for every set of input parameters."""
+    try:
+        impl = _download_code(url, bearer_token)
+    except DownloadError:
+        return None
+
+    return prepare_circuits_from_data(impl, input_params_list, process_circuit, processes)
+
+
 def prepare_code_from_url(url, input_params, bearer_token: str = "", post_processing=False):
     """Get implementation code from URL. Set input parameters into implementation. Return circuit."""
     try:
         impl = _download_code(url, bearer_token)
-    except (error.HTTPError, error.URLError):
+    except DownloadError:
         return None
 
     if not post_processing:
@@ -77,74 +140,85 @@ def prepare_code_from_url(url, input_params, bearer_token: str = "", post_proces
 
 
 def prepare_code_from_quil(quil):
+    from pyquil import Program
     return Program(quil)
 
 
+def prepare_quil(quil):
+    """Parse the Quil program using quil-rs, which is much cheaper than building a pyquil Program."""
+    return parse_quil(quil)
+
+
+def prepare_quil_from_url(url, bearer_token: str = ""):
+    """Get Quil program from URL and parse it using quil-rs."""
+    try:
+        impl = _download_code(url, bearer_token)
+    except DownloadError:
+        return None
+
+    return prepare_quil(impl)
+
+
 def prepare_code_from_quil_url(url, bearer_token: str = ""):
     """Get implementation code from URL. Set input parameters into implementation. Return circuit."""
     try:
         impl = _download_code(url, bearer_token)
-    except (error.HTTPError, error.URLError):
+    except DownloadError:
         return None
 
     return prepare_code_from_quil(impl)
 
 
-def _download_code(url: str, bearer_token: str = "") -> str:
-    req = request.Request(url)
+def _get_headers(url: str, bearer_token: str = "") -> Dict[str, str]:
+    if urlparse(url).netloc != "platform.planqk.de":
+        return {}
+    if bearer_token == "":
+        current_app.logger.error("No bearer token specified, download from the PlanQK platform will fail.")
 
-    if urllib.parse.urlparse(url).netloc == "platform.planqk.de":
-        if bearer_token == "":
-            app.logger.error("No bearer token specified, download from the PlanQK platform will fail.")
+        abort(401)
+    elif bearer_token.startswith("Bearer"):
+        current_app.logger.error("The bearer token MUST NOT start with \"Bearer\".")
 
-            abort(401)
-        elif bearer_token.startswith("Bearer"):
-            app.logger.error("The bearer token MUST NOT start with \"Bearer\".")
+        abort(401)
+    return {"Authorization": "Bearer " + bearer_token}
 
-            abort(401)
 
-        req.add_header("Authorization", "Bearer " + bearer_token)
+def prefetch_code(urls: Iterable[str], bearer_token: str = ""):
+    """Start downloading the implementations concurrently, e.g., of all jobs of a batch, before they are prepared
+    one by one."""
+    for url in urls:
+        if url and (url, bearer_token) not in _prefetched:
+            _prefetched[(url, bearer_token)] = http_client.get_async(url, _get_headers(url, bearer_token))
 
-    try:
-        res: HTTPResponse = request.urlopen(req)
-    except Exception as e:
-        app.logger.error("Could not open url: " + str(e))
 
-        if str(e).find("401") != -1:
-            abort(401)
+def _download_code(url: str, bearer_token: str = "") -> str:
+    with tracing.span('download_code', **{'http.url': url}) as span:
+        prefetched = _prefetched.pop((url, bearer_token), None)
+        span.set_attribute('prefetched', prefetched is not None)
+        try:
+            if prefetched is not None:
+                impl = prefetched.result()
+            else:
+                impl = http_client.get(url, _get_headers(url, bearer_token))
+        except DownloadError as e:
+            current_app.logger.error("Could not open url: " + str(e))
 
-    if res.getcode() == 200 and urllib.parse.urlparse(url).netloc == "platform.planqk.de":
-        app.logger.info("Request to platform.planqk.de was executed successfully.")
+            if e.status == 401:
+                abort(401)
+            raise
 
-    if res.getcode() == 401:
-        abort(401)
+    if urlparse(url).netloc == "platform.planqk.de":
+        current_app.logger.info("Request to platform.planqk.de was executed successfully.")
 
-    return res.read().decode("utf-8")
+    return impl
 
 
 def prepare_post_processing_code_from_data(data, input_params):
     """Get implementation code from data. Set input parameters into implementation. Return circuit."""
-    temp_dir = tempfile.mkdtemp()
-    with open(os.path.join(temp_dir, "__init__.py"), "w") as f:
-        f.write("")
-    with open(os.path.join(temp_dir, "downloaded_code.py"), "w") as f:
-        f.write(data)
-    sys.path.append(temp_dir)
-    try:
-        import downloaded_code
-
-        # deletes every attribute from downloaded_code, except __name__, because importlib.reload
-        # doesn't reset the module's global variables
-        for attr in dir(downloaded_code):
-            if attr != "__name__":
-                delattr(downloaded_code, attr)
-
-        reload(downloaded_code)
+    result = None
+    with _import_code(data) as downloaded_code:
         if 'post_processing' in dir(downloaded_code):
             result = downloaded_code.post_processing(**input_params)
-    finally:
-        sys.path.remove(temp_dir)
-        shutil.rmtree(temp_dir, ignore_errors=True)
     if not result:
         raise ValueError
     return result
\ No newline at end of file
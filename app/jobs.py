@@ -0,0 +1,85 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+from typing import Optional
+
+from flask import current_app
+from rq import Queue
+from rq.command import send_stop_job_command
+from rq.exceptions import InvalidJobOperation, NoSuchJobError
+from rq.job import Job, JobStatus
+
+from app import scheduling
+
+
+def get_timeout(timeout_hint, max_timeout: int) -> int:
+    """Return the timeout requested by the client capped by the timeout allowed by the server."""
+    try:
+        timeout = int(timeout_hint)
+    except (TypeError, ValueError):
+        return max_timeout
+    return min(timeout, max_timeout) if timeout > 0 else max_timeout
+
+
+def _fetch(job_id: str) -> Optional[Job]:
+    try:
+        return Job.fetch(job_id, connection=current_app.redis)
+    except NoSuchJobError:
+        return None
+
+
+def cancel(job_id: str) -> bool:
+    """Remove a waiting job from its queue or stop the work horse executing a running job. Return False if the job
+    does not exist."""
+    job = _fetch(job_id)
+    if job is None:
+        return False
+    status = job.get_status()
+    if status == JobStatus.STARTED:
+        _release_packed_jobs(job)
+        try:
+            send_stop_job_command(current_app.redis, job_id)
+        except InvalidJobOperation:
+            # the job has just been finished or is not executed by a worker anymore
+            pass
+    elif status in (JobStatus.QUEUED, JobStatus.SCHEDULED, JobStatus.DEFERRED):
+        job.cancel()
+        scheduling.dequeue(job)
+    return True
+
+
+def get_extension_job_id(result_id: str) -> str:
+    return f"{result_id}-extension"
+
+
+def _release_packed_jobs(job: Job):
+    """Put the jobs whose circuits are packed into the circuit of the stopped job back to the front of the queue."""
+    from app import hot_store
+    from app.result_model import Result
+
+    for packed_job_id in job.meta.get('packed-job-ids', []):
+        packed_job = _fetch(packed_job_id)
+        result = hot_store.get(Result, packed_job_id)
+        if packed_job is not None and result is not None and not result.complete:
+            Queue(packed_job.origin, connection=current_app.redis).enqueue_job(packed_job, at_front=True)
+
+
+def has_failed(job_id: str) -> bool:
+    """Check if the job has failed or has been stopped without storing its result, e.g., because of its timeout."""
+    job = _fetch(job_id)
+    return job is not None and job.get_status() in (JobStatus.FAILED, JobStatus.STOPPED, JobStatus.CANCELED)
@@ -0,0 +1,72 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import dataclasses
+import decimal
+import uuid
+from datetime import date
+
+import rapidjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+
+def _default(obj):
+    # numpy arrays and scalars are converted without importing numpy, tolist() of a numpy scalar returns the
+    # corresponding Python scalar
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, **kwargs) -> str:
+    return rapidjson.dumps(obj, default=_default, **kwargs)
+
+
+def loads(s):
+    return rapidjson.loads(s)
+
+
+def raw(s: str):
+    """Embed an already serialized JSON string, e.g., a stored result, without parsing and serializing it again."""
+    return rapidjson.RawJSON(s)
+
+
+class RapidJSONProvider(JSONProvider):
+    """JSON provider of the Flask app using python-rapidjson."""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        kwargs.pop('cls', None)
+        return dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
@@ -0,0 +1,111 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import json
+from typing import Dict, Sequence
+
+import numpy as np
+from flask import current_app
+from pyquil import Program
+from pyquil.gates import MEASURE, X
+
+from app import forest_handler
+from app.noise_model import ReadoutNoiseModel
+
+
+def _calibration_key_prefix(qpu_name: str, noise_model_name: str = None) -> str:
+    return f"forest-service:calibration:{qpu_name}:{noise_model_name or 'ideal'}"
+
+
+def _run_calibration(backend, qubits: Sequence[int], noise_model=None) -> Dict[int, list]:
+    """Prepare all qubits in |0> resp. |1> and measure the probability to read the prepared state."""
+    shots = current_app.config['CALIBRATION_SHOTS']
+    fidelities = {}
+    for prepared_state in (0, 1):
+        program = Program()
+        ro = program.declare('ro', 'BIT', len(qubits))
+        if prepared_state:
+            for qubit in qubits:
+                program += X(qubit)
+        for i, qubit in enumerate(qubits):
+            program += MEASURE(qubit, ro[i])
+        program.wrap_in_numshots_loop(shots)
+
+        # X and MEASURE are native gates, thus, quilc is not required and the qubits are not rewired
+        executable = forest_handler.native_quil_to_executable(program, backend)
+        stats = forest_handler.run_job(executable, backend, noise_model)
+        correct_readouts = np.mean(stats == prepared_state, axis=0)
+        for i, qubit in enumerate(qubits):
+            fidelities.setdefault(qubit, [0.0, 0.0])[prepared_state] = float(correct_readouts[i])
+    return fidelities
+
+
+def get_calibration(backend, qpu_name: str, qubits: Sequence[int], noise_model=None,
+                    noise_model_name: str = None) -> ReadoutNoiseModel:
+    """Return the readout calibration of the given qubits.
+
+    Calibrations are cached per qubit in Redis, thus, a calibration run is shared by all jobs on the same backend
+    until its TTL expires. Only qubits without a cached calibration are calibrated.
+    """
+    prefix = _calibration_key_prefix(qpu_name, noise_model_name)
+    qubits = sorted(set(qubits))
+
+    def cached_fidelities():
+        values = current_app.redis.mget([f"{prefix}:{qubit}" for qubit in qubits])
+        return {qubit: json.loads(value) for qubit, value in zip(qubits, values) if value is not None}
+
+    fidelities = cached_fidelities()
+    if len(fidelities) < len(qubits):
+        # only one job per backend runs the calibration, all others wait and use its results
+        with current_app.redis.lock(f"{prefix}:lock", timeout=600, blocking_timeout=600):
+            fidelities = cached_fidelities()
+            missing_qubits = [qubit for qubit in qubits if qubit not in fidelities]
+            if missing_qubits:
+                current_app.logger.info(f"Calibrating readout of qubits {missing_qubits} on {qpu_name}...")
+                calibrated = _run_calibration(backend, missing_qubits, noise_model)
+                pipeline = current_app.redis.pipeline()
+                for qubit, value in calibrated.items():
+                    pipeline.set(f"{prefix}:{qubit}", json.dumps(value), ex=current_app.config['CALIBRATION_TTL'])
+                pipeline.execute()
+                fidelities.update(calibrated)
+
+    return ReadoutNoiseModel(p00=1.0, p11=1.0, qubits=fidelities)
+
+
+def mitigate_counts(counts: Dict[str, int], calibration: ReadoutNoiseModel,
+                    readout_qubits: Sequence[int]) -> Dict[str, float]:
+    """Mitigate readout errors by applying the inverse assignment matrix of every qubit to its axis of the
+    probability tensor, which costs O(n*2^n) instead of inverting the full 2^n x 2^n assignment matrix."""
+    width = len(readout_qubits)
+    shots = sum(counts.values())
+
+    probabilities = np.zeros(2 ** width)
+    for bitstring, count in counts.items():
+        probabilities[int(bitstring, 2)] = count
+    probabilities = probabilities.reshape((2,) * width)
+
+    for column, qubit in enumerate(readout_qubits):
+        # bitstrings are little endian, i.e., the first readout column is the last character
+        axis = width - 1 - column
+        inverse = np.linalg.pinv(calibration.assignment_matrix(qubit))
+        probabilities = np.moveaxis(np.tensordot(inverse, probabilities, axes=([1], [axis])), 0, axis)
+
+    # map the quasi-probabilities to the closest valid distribution by clipping and renormalizing
+    probabilities = np.clip(probabilities.reshape(-1), 0, None)
+    probabilities *= shots / probabilities.sum()
+    return {np.binary_repr(i, width=width): float(probabilities[i]) for i in np.flatnonzero(probabilities)}
@@ -10,8 +10,27 @@ class GenerateCircuitRequest:
 
 class GenerateCircuitRequestSchema(ma.Schema):
     impl_url = ma.fields.String()
+    impl_ref = ma.fields.String(required=False)
     impl_language = ma.fields.String()
     input_params = ma.fields.List(ma.fields.String())
+    timeout = ma.fields.Integer(required=False)
+
+
+class GenerateCircuitsRequest:
+    def __init__(self, impl_url, impl_language, input_params, input_params_grid):
+        self.impl_url = impl_url
+        self.impl_language = impl_language
+        self.input_params = input_params
+        self.input_params_grid = input_params_grid
+
+
+class GenerateCircuitsRequestSchema(ma.Schema):
+    impl_url = ma.fields.String()
+    impl_ref = ma.fields.String(required=False)
+    impl_language = ma.fields.String()
+    input_params = ma.fields.List(ma.fields.Dict(), required=False)
+    input_params_grid = ma.fields.Dict(required=False)
+    timeout = ma.fields.Integer(required=False)
 
 
 class TranspileRequest:
@@ -27,6 +46,8 @@ class TranspileRequestSchema(ma.Schema):
     impl_url = ma.fields.String()
     impl_language = ma.fields.String()
     qpu_name = ma.fields.String()
+    qpu_names = ma.fields.List(ma.fields.String(), required=False, validate=ma.validate.Length(min=1))
+    estimate = ma.fields.Boolean(required=False)
     input_params = ma.fields.List(ma.fields.String())
     token = ma.fields.String()
 
@@ -46,10 +67,82 @@ class ExecuteRequest:
 
 class ExecuteRequestSchema(ma.Schema):
     impl_url = ma.fields.String()
+    impl_ref = ma.fields.String(required=False)
     impl_language = ma.fields.String()
     qpu_name = ma.fields.String()
     input_params = ma.fields.List(ma.fields.String())
     token = ma.fields.String()
     noise_model = ma.fields.Str(required=False)
     only_measurement_errors = ma.fields.Boolean(required=False)
+    mitigate_readout_errors = ma.fields.Boolean(required=False)
+    seed = ma.fields.Integer(required=False)
+    target_precision = ma.fields.Dict(required=False)
     correlation_id = ma.fields.String()
+    timeout = ma.fields.Integer(required=False)
+
+
+class ExpectationValuesRequest:
+    def __init__(self, impl_url, impl_language, transpiled_quil, input_params, observables, probabilities):
+        self.impl_url = impl_url
+        self.impl_language = impl_language
+        self.transpiled_quil = transpiled_quil
+        self.input_params = input_params
+        self.observables = observables
+        self.probabilities = probabilities
+
+
+class ExpectationValuesRequestSchema(ma.Schema):
+    impl_url = ma.fields.String()
+    impl_ref = ma.fields.String(required=False)
+    impl_language = ma.fields.String()
+    transpiled_quil = ma.fields.String(required=False)
+    input_params = ma.fields.List(ma.fields.String())
+    observables = ma.fields.List(ma.fields.String(), required=False)
+    probabilities = ma.fields.Boolean(required=False)
+    timeout = ma.fields.Integer(required=False)
+
+
+class ExtendResultRequest:
+    def __init__(self, shots, token, seed):
+        self.shots = shots
+        self.token = token
+        self.seed = seed
+
+
+class ExtendResultRequestSchema(ma.Schema):
+    shots = ma.fields.Integer(required=True)
+    token = ma.fields.String()
+    seed = ma.fields.Integer(required=False)
+    timeout = ma.fields.Integer(required=False)
+
+
+class BulkResultsRequest:
+    def __init__(self, ids, include_results, cursor):
+        self.ids = ids
+        self.include_results = include_results
+        self.cursor = cursor
+
+
+class BulkResultsRequestSchema(ma.Schema):
+    ids = ma.fields.List(ma.fields.String(), required=True)
+    include_results = ma.fields.Boolean(required=False)
+    cursor = ma.fields.String(required=False)
+
+
+class ListResultsRequest:
+    def __init__(self, backend, correlation_id, created_after, created_before, limit, cursor):
+        self.backend = backend
+        self.correlation_id = correlation_id
+        self.created_after = created_after
+        self.created_before = created_before
+        self.limit = limit
+        self.cursor = cursor
+
+
+class ListResultsRequestSchema(ma.Schema):
+    backend = ma.fields.String(required=False)
+    correlation_id = ma.fields.String(required=False)
+    created_after = ma.fields.String(required=False)
+    created_before = ma.fields.String(required=False)
+    limit = ma.fields.Int(required=False)
+    cursor = ma.fields.String(required=False)
@@ -104,9 +104,45 @@ class GenerateCircuitResponseSchema(ma.Schema):
     location = ma.fields.String()
 
 
+class GeneratedCircuitBatchResponseSchema(ma.Schema):
+    id = ma.fields.String()
+    complete = ma.fields.Boolean()
+    generated_circuits = ma.fields.List(ma.fields.Dict())
+
+
 class ResultsResponseSchema(ma.Schema):
     result = ma.fields.List(ma.fields.String())
     post_processing_result = ma.fields.List(ma.fields.String())
+    mitigated_result = ma.fields.List(ma.fields.String())
+    cancelled = ma.fields.Boolean()
+    extension_error = ma.fields.String()
+
+
+class BulkResultsResponseSchema(ma.Schema):
+    results = ma.fields.List(ma.fields.Dict())
+    cursor = ma.fields.String()
+    unknown_ids = ma.fields.List(ma.fields.String())
+
+
+class ListResultsResponseSchema(ma.Schema):
+    results = ma.fields.List(ma.fields.Dict())
+    cursor = ma.fields.String()
+
+
+class ImplementationUploadResponseSchema(ma.Schema):
+    impl_ref = ma.fields.String()
+    size = ma.fields.Int()
+
+
+class CancelResponseSchema(ma.Schema):
+    id = ma.fields.String()
+    complete = ma.fields.Boolean()
+    cancelled = ma.fields.Boolean()
+
+
+class EndpointsResponseSchema(ma.Schema):
+    quilc = ma.fields.List(ma.fields.Dict())
+    qvm = ma.fields.List(ma.fields.Dict())
 
 
 class AnalysisOriginalCircuitResponse:
@@ -0,0 +1,118 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+from typing import List, Sequence, Tuple
+
+from flask import current_app
+from pyquil import Program
+from pyquil.gates import MEASURE
+from pyquil.quilatom import Qubit
+from pyquil.quilbase import Declare, Gate, Measurement
+
+_execute_function = 'app.tasks.execute'
+
+
+def is_packable(circuit: Program) -> bool:
+    """Check if the circuit only consists of gates on fixed qubits and measurements into the readout register."""
+    if circuit.defined_gates:
+        return False
+    for instruction in circuit.instructions:
+        if isinstance(instruction, Declare):
+            if instruction.name != 'ro':
+                return False
+        elif isinstance(instruction, Gate):
+            if instruction.modifiers or not all(isinstance(qubit, Qubit) for qubit in instruction.qubits):
+                return False
+        elif isinstance(instruction, Measurement):
+            if instruction.classical_reg is None or instruction.classical_reg.name != 'ro' \
+                    or not isinstance(instruction.qubit, Qubit):
+                return False
+        else:
+            return False
+    return True
+
+
+def get_qubits(circuit: Program) -> List[int]:
+    return sorted(circuit.get_qubit_indices())
+
+
+def _readout_size(circuit: Program) -> int:
+    declaration = circuit.declarations.get('ro')
+    if declaration is not None:
+        return declaration.memory_size
+    return max((instruction.classical_reg.offset + 1 for instruction in circuit.instructions
+                if isinstance(instruction, Measurement)), default=0)
+
+
+def pack(circuits: Sequence[Program], shots: int) -> Tuple[Program, List[str]]:
+    """Place the circuits on disjoint qubits of one program, each measuring into its own readout register.
+
+    Return the packed program and the names of the readout registers in the order of the circuits.
+    """
+    packed = Program()
+    registers = []
+    offset = 0
+    for i, circuit in enumerate(circuits):
+        mapping = {qubit: offset + j for j, qubit in enumerate(get_qubits(circuit))}
+        offset += len(mapping)
+        registers.append(f"ro{i}")
+        ro = packed.declare(registers[-1], 'BIT', _readout_size(circuit))
+        for instruction in circuit.instructions:
+            if isinstance(instruction, Gate):
+                packed += Gate(instruction.name, instruction.params,
+                               [Qubit(mapping[qubit.index]) for qubit in instruction.qubits])
+            elif isinstance(instruction, Measurement):
+                packed += MEASURE(mapping[instruction.qubit.index], ro[instruction.classical_reg.offset])
+    packed.wrap_in_numshots_loop(shots)
+    return packed, registers
+
+
+def is_candidate(transpiled_quil=None, correlation_id=None, mitigate_readout_errors=False, seed=None,
+                 target_precision=None, **kwargs) -> bool:
+    """Check if the circuit of an execute job may be packed together with the circuits of other jobs."""
+    return not transpiled_quil and not correlation_id and not mitigate_readout_errors and seed is None \
+        and not target_precision
+
+
+def claim_jobs(queue, qpu_name: str, shots: int, noise_model: str = None, claiming_job=None) -> list:
+    """Remove up to MULTIPROGRAMMING_MAX_JOBS waiting execute jobs with the same qpu-name, shots, and noise model from
+    the queue. A job is only claimed by the worker which removed it from the queue. The ids of the claimed jobs are
+    saved in the meta data of the claiming job as soon as they are removed, thus, they are put back into the queue if
+    the claiming job is cancelled."""
+    claimed = []
+    max_jobs = current_app.config['MULTIPROGRAMMING_MAX_JOBS']
+    for job in queue.get_jobs(0, current_app.config['MULTIPROGRAMMING_LOOKAHEAD']):
+        if len(claimed) >= max_jobs:
+            break
+        if job.func_name != _execute_function or not is_candidate(**job.kwargs):
+            continue
+        if job.kwargs.get('qpu_name') != qpu_name or job.kwargs.get('shots') != shots \
+                or job.kwargs.get('noise_model') != noise_model:
+            continue
+        if queue.remove(job):
+            claimed.append(job)
+            if claiming_job is not None:
+                claiming_job.meta['packed-job-ids'] = [claimed_job.id for claimed_job in claimed]
+                claiming_job.save_meta()
+    return claimed
+
+
+def release_jobs(queue, jobs):
+    """Put claimed jobs which could not be packed back to the front of the queue."""
+    for job in reversed(jobs):
+        queue.enqueue_job(job, at_front=True)
@@ -0,0 +1,104 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from flask import current_app
+
+# noise models are cached per qpu-name for the lifetime of the worker process, the configured ones are preloaded by
+# the RQ worker before it forks the work horses, which otherwise load them for every job
+_noise_models: Dict[str, "ReadoutNoiseModel"] = {}
+
+
+class ReadoutNoiseModel:
+    """Per-qubit readout (assignment) errors.
+
+    For every qubit q the assignment-probability matrix is
+        [[p(0|0), p(0|1)],
+         [p(1|0), p(1|1)]]
+    where p(i|j) is the probability to read i after preparing j.
+    """
+
+    def __init__(self, p00: float, p11: float, qubits: Optional[Dict[int, Sequence[float]]] = None):
+        self.p00 = p00
+        self.p11 = p11
+        self.qubits = {int(q): (float(f[0]), float(f[1])) for q, f in (qubits or {}).items()}
+
+    def fidelities(self, qubit: int):
+        return self.qubits.get(qubit, (self.p00, self.p11))
+
+    def assignment_matrix(self, qubit: int) -> np.ndarray:
+        p00, p11 = self.fidelities(qubit)
+        return np.array([[p00, 1 - p11], [1 - p00, p11]])
+
+    def flip_probabilities(self, readout_qubits: Sequence[int]):
+        """Return the probabilities to flip a measured 0 resp. 1 for every readout column."""
+        fidelities = np.array([self.fidelities(q) for q in readout_qubits], dtype=float).reshape(-1, 2)
+        return 1 - fidelities[:, 0], 1 - fidelities[:, 1]
+
+    def apply(self, bitstrings: np.ndarray, readout_qubits: Sequence[int], rng: np.random.Generator = None):
+        """Apply the readout errors to a (shots x width) array of measured bits."""
+        if rng is None:
+            rng = np.random.default_rng()
+        bitstrings = np.asarray(bitstrings, dtype=np.uint8)
+        p_flip_0, p_flip_1 = self.flip_probabilities(readout_qubits)
+        p_flip = np.where(bitstrings == 1, p_flip_1, p_flip_0)
+        flips = rng.random(bitstrings.shape) < p_flip
+        return bitstrings ^ flips.astype(np.uint8)
+
+
+def _load_noise_model_config() -> Dict:
+    config = current_app.config.get('READOUT_NOISE_MODELS')
+    if not config:
+        return {}
+    if os.path.isfile(config):
+        with open(config) as f:
+            return json.load(f)
+    return json.loads(config)
+
+
+def get_noise_model(qpu_name: str) -> ReadoutNoiseModel:
+    """Return the readout noise model configured for the given QPU, falling back to the default fidelity."""
+    if qpu_name not in _noise_models:
+        config = _load_noise_model_config().get(qpu_name, {})
+        default_fidelity = current_app.config['READOUT_FIDELITY']
+        _noise_models[qpu_name] = ReadoutNoiseModel(p00=config.get('p00', default_fidelity),
+                                                    p11=config.get('p11', default_fidelity),
+                                                    qubits=config.get('qubits'))
+    return _noise_models[qpu_name]
+
+
+def preload_noise_models():
+    """Load the noise models of all QPUs configured in READOUT_NOISE_MODELS into the cache."""
+    for qpu_name in _load_noise_model_config():
+        get_noise_model(qpu_name)
+
+
+def get_readout_qubits(program, width: int, register: str = 'ro') -> List[int]:
+    """Map every column of the readout register to the qubit measured into it."""
+    readout_qubits = list(range(width))
+    for instruction in getattr(program, 'instructions', []):
+        classical_reg = getattr(instruction, 'classical_reg', None)
+        if classical_reg is None or classical_reg.name != register:
+            continue
+        if classical_reg.offset < width:
+            readout_qubits[classical_reg.offset] = getattr(instruction.qubit, 'index', classical_reg.offset)
+    return readout_qubits
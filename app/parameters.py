@@ -16,6 +16,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 # ******************************************************************************
+import itertools
 import json
 
 
@@ -82,4 +83,15 @@ class ParameterDictionary(dict):
         else:
             t_value = value
 
-        super(ParameterDictionary, self).__setitem__(key.lower(), t_value)
\ No newline at end of file
+        super(ParameterDictionary, self).__setitem__(key.lower(), t_value)
+
+
+def expand_parameter_grid(grid: dict) -> list:
+    """
+        Expands a parameter grid of the form {"PARAM-NAME": {"rawValues": [...], "type": "Integer"}} to the list of
+        all combinations of the parameter values
+    """
+    names = list(grid.keys())
+    values = [[{"rawValue": raw_value, "type": grid[name].get("type", "Unknown")}
+               for raw_value in grid[name].get("rawValues", [])] for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
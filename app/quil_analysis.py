@@ -0,0 +1,66 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+from typing import Dict
+
+from quil.program import Program
+
+
+def parse_quil(quil: str) -> Program:
+    """Parse and validate a Quil program using quil-rs without building a pyquil Program."""
+    return Program.parse(quil)
+
+
+def get_quil_metrics(program: Program) -> Dict:
+    """Compute the metrics of get_non_transpiled_circuit_metrics in a single pass over the parsed instructions."""
+    depths: Dict[str, int] = {}
+    multi_qubit_gate_depths: Dict[str, int] = {}
+    number_of_single_qubit_gates = 0
+    number_of_multi_qubit_gates = 0
+    number_of_measurement_operations = 0
+
+    for instruction in program.body_instructions:
+        if instruction.is_measurement():
+            number_of_measurement_operations += 1
+            depths.setdefault(instruction.to_measurement().qubit.to_quil(), 0)
+            continue
+        if not instruction.is_gate():
+            continue
+
+        qubits = [qubit.to_quil() for qubit in instruction.to_gate().qubits]
+        if len(qubits) == 1:
+            number_of_single_qubit_gates += 1
+            depths[qubits[0]] = depths.get(qubits[0], 0) + 1
+        else:
+            number_of_multi_qubit_gates += 1
+            depth = max(depths.get(qubit, 0) for qubit in qubits) + 1
+            multi_qubit_gate_depth = max(multi_qubit_gate_depths.get(qubit, 0) for qubit in qubits) + 1
+            for qubit in qubits:
+                depths[qubit] = depth
+                multi_qubit_gate_depths[qubit] = multi_qubit_gate_depth
+
+    return {
+        'original-depth': max(depths.values(), default=0),
+        'original-multi-qubit-gate-depth': max(multi_qubit_gate_depths.values(), default=0),
+        'original-width': len(depths),
+        'original-total-number-of-operations': number_of_single_qubit_gates + number_of_multi_qubit_gates
+                                               + number_of_measurement_operations,
+        'original-number-of-multi-qubit-gates': number_of_multi_qubit_gates,
+        'original-number-of-measurement-operations': number_of_measurement_operations,
+        'original-number-of-single-qubit-gates': number_of_single_qubit_gates,
+    }
@@ -0,0 +1,38 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import hashlib
+from typing import Optional
+
+from flask import current_app
+
+
+def cache_key(program: str, shots: int, seed: int, qpu_name: str, noise_model: str = None) -> str:
+    """Return the key of the counts of a seeded execution of the compiled program."""
+    program_hash = hashlib.sha256(program.encode()).hexdigest()
+    return f"forest-service:results:{program_hash}:{shots}:{seed}:{qpu_name}:{noise_model or ''}"
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached counts serialized as JSON or None if they are not cached."""
+    counts = current_app.redis.get(key)
+    return counts.decode() if counts is not None else None
+
+
+def set(key: str, counts: str):
+    current_app.redis.set(key, counts, ex=current_app.config['RESULT_CACHE_TTL'])
@@ -16,6 +16,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 # ******************************************************************************
+from datetime import datetime
 
 from app import db
 
@@ -28,6 +29,34 @@ class Result(db.Model):
     complete = db.Column(db.Boolean, default=False)
     generated_circuit_id = db.Column(db.String(36), db.ForeignKey('generated__circuit.id'), nullable=True)
     post_processing_result = db.Column(db.String(1200), default="")
+    mitigated_result = db.Column(db.String(1200), nullable=True)
+    cancelled = db.Column(db.Boolean, default=False)
+    # content address of the native Quil in the executable store and name of the simulated noise model, used to
+    # execute additional shots
+    executable_key = db.Column(db.String(64), nullable=True)
+    noise_model = db.Column(db.String(255), nullable=True)
+    # error of the last execution of additional shots, the result keeps its previous counts if it has failed
+    extension_error = db.Column(db.String(1200), nullable=True)
+    # time in UTC the result has been completed the last time, used as cursor to poll for newly completed results
+    completed_at = db.Column(db.DateTime, nullable=True)
+    # time in UTC the execution has been requested, used to list and purge results
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # the listing is paginated by (created_at, id), optionally filtered by backend or correlation id, and completed
+    # results are purged by completed_at
+    __table_args__ = (
+        db.Index('ix_result_created_at_id', 'created_at', 'id'),
+        db.Index('ix_result_backend_created_at_id', 'backend', 'created_at', 'id'),
+        db.Index('ix_result_generated_circuit_id_created_at_id', 'generated_circuit_id', 'created_at', 'id'),
+        db.Index('ix_result_complete_completed_at', 'complete', 'completed_at'),
+    )
 
     def __repr__(self):
         return 'Result {}'.format(self.result)
+
+
+@db.event.listens_for(Result.complete, 'set', active_history=True)
+def _set_completed_at(result, complete, previous_complete, initiator):
+    # the previous value is a loader symbol instead of False for new results
+    if complete and previous_complete is not True:
+        result.completed_at = datetime.utcnow()
@@ -0,0 +1,78 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app import db, hot_store
+from app.generated_circuit_model import Generated_Circuit
+from app.result_model import Result
+
+
+def get_cutoff(retention_days: float) -> datetime:
+    return datetime.utcnow() - timedelta(days=retention_days)
+
+
+def _delete(model, ids):
+    db.session.execute(db.delete(model).where(model.id.in_(ids)))
+    db.session.commit()
+    hot_store.evict(model, ids)
+
+
+def purge_results(cutoff: datetime, batch_size: int) -> int:
+    """Delete up to batch_size results completed before the cutoff. Return the number of deleted results."""
+    # uses the (complete, completed_at) index, thus, only the purged rows are read
+    ids = db.session.scalars(db.select(Result.id)
+                             .where(Result.complete.is_(True), Result.completed_at < cutoff)
+                             .limit(batch_size)).all()
+    if ids:
+        _delete(Result, ids)
+    return len(ids)
+
+
+def purge_generated_circuits(cutoff: datetime, batch_size: int) -> int:
+    """Delete up to batch_size generated circuits completed before the cutoff that are not referenced by a result.
+    Return the number of deleted generated circuits."""
+    referenced = db.select(Result.id).where(Result.generated_circuit_id == Generated_Circuit.id)
+    # uses the (complete, completed_at) index
+    ids = db.session.scalars(db.select(Generated_Circuit.id)
+                             .where(Generated_Circuit.complete.is_(True), Generated_Circuit.completed_at < cutoff,
+                                    ~referenced.exists())
+                             .limit(batch_size)).all()
+    if ids:
+        _delete(Generated_Circuit, ids)
+    return len(ids)
+
+
+def purge(retention_days: float, batch_size: int) -> int:
+    """Delete one batch of expired results and generated circuits, each batch in its own short transaction, such
+    that the workers are not blocked by a long running delete."""
+    cutoff = get_cutoff(retention_days)
+    deleted = purge_results(cutoff, batch_size) + purge_generated_circuits(cutoff, batch_size)
+    if deleted:
+        current_app.logger.info(f"Purged {deleted} rows completed before {cutoff.isoformat()}.")
+    return deleted
+
+
+def compact():
+    """Return the space of the deleted rows to the file system, only required for SQLite."""
+    if db.engine.dialect.name == 'sqlite':
+        # VACUUM can not run within a transaction
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.exec_driver_sql('VACUUM')
@@ -17,17 +17,51 @@
 #  limitations under the License.
 # ******************************************************************************
 
-from app import app, forest_handler, implementation_handler, db, parameters
+from app import blob_store, db, hot_store, http_cache, jobs, json_provider, parameters, result_cache, scheduling, \
+    tracing
 from app.generated_circuit_model import Generated_Circuit
 from app.result_model import Result
-from app.analysis import get_circuit_metrics, get_non_transpiled_circuit_metrics
-from flask import jsonify, abort, request
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, current_app, jsonify, abort, request
 import logging
-import json
 import base64
+import uuid
+from datetime import datetime, timezone
 
+bp = Blueprint('routes', __name__)
 
-@app.route('/forest-service/api/v1.0/generate-circuit', methods=['POST'])
+
+@bp.route("/")
+def heartbeat():
+    return '<h1>forest-service is running</h1> <h3>View the API Docs <a href="/api/swagger-ui">here</a></h3>'
+
+
+@bp.route('/forest-service/api/v1.0/implementations', methods=['POST'])
+def upload_implementation():
+    """Store an implementation or Quil program sent as raw request body or as file of a multipart form. The content
+    is streamed to Redis and hashed while it arrives, its hash is passed as impl-ref instead of base64 encoded
+    impl-data."""
+    if request.mimetype == 'multipart/form-data':
+        if not request.files:
+            abort(400)
+        stream = next(iter(request.files.values())).stream
+    else:
+        stream = request.stream
+    try:
+        impl_ref, size = blob_store.put_stream(stream, current_app.config['BLOB_STORE_MAX_SIZE'])
+    except blob_store.BlobTooLarge as e:
+        return jsonify({'error': str(e), 'statusCode': '413'}), 413
+    if not size:
+        abort(400)
+    return jsonify({'impl-ref': impl_ref, 'size': size}), 201
+
+
+def _unknown_impl_ref(impl_ref):
+    return jsonify({'error': f"uploaded implementation {impl_ref} does not exist or has expired",
+                    'statusCode': '400'}), 400
+
+
+@bp.route('/forest-service/api/v1.0/generate-circuit', methods=['POST'])
 def generate_circuit():
     if not request.json:
         abort(400)
@@ -36,26 +70,33 @@ def generate_circuit():
     impl_url = request.json.get('impl-url', "")
     input_params = request.json.get('input-params', "")
     bearer_token = request.json.get("bearer-token", "")
+    impl_ref = request.json.get('impl-ref')
     impl_data = ''
     if input_params:
         input_params = parameters.ParameterDictionary(input_params)
 
     if impl_url is not None and impl_url != "":
         impl_url = request.json['impl-url']
+    elif impl_ref:
+        if not blob_store.contains(impl_ref):
+            return _unknown_impl_ref(impl_ref)
     elif 'impl-data' in request.json:
         impl_data = base64.b64decode(request.json.get('impl-data').encode()).decode()
     else:
         abort(400)
 
-    job = app.implementation_queue.enqueue('app.tasks.generate', impl_url=impl_url, impl_data=impl_data,
-                                           impl_language=impl_language, input_params=input_params,
-                                           bearer_token=bearer_token)
+    job_timeout = jobs.get_timeout(request.json.get('timeout'), current_app.config['GENERATE_TIMEOUT'])
+    # large implementations are passed to the job by reference
+    job_kwargs = blob_store.by_reference(dict(impl_url=impl_url, impl_data=impl_data, impl_language=impl_language,
+                                              input_params=input_params, bearer_token=bearer_token, impl_ref=impl_ref))
+    job = current_app.implementation_queue.enqueue('app.tasks.generate', job_timeout=job_timeout,
+                                                   meta=tracing.inject(), **job_kwargs)
 
     result = Generated_Circuit(id=job.get_id())
     db.session.add(result)
     db.session.commit()
 
-    app.logger.info('Returning HTTP response to client...')
+    current_app.logger.info('Returning HTTP response to client...')
     content_location = '/forest-service/api/v1.0/generated-circuits/' + result.id
     response = jsonify({'Location': content_location})
     response.status_code = 202
@@ -64,12 +105,108 @@ def generate_circuit():
     return response
 
 
-@app.route('/forest-service/api/v1.0/generated-circuits/<generated_circuit_id>', methods=['GET'])
+@bp.route('/forest-service/api/v1.0/generate-circuits', methods=['POST'])
+def generate_circuits():
+    """Put a job generating a circuit for every set of input parameters in queue. The sets of input parameters are
+    either listed or defined by a grid whose cartesian product is generated."""
+    if not request.json:
+        abort(400)
+
+    impl_language = request.json.get('impl-language', '')
+    impl_url = request.json.get('impl-url', "")
+    bearer_token = request.json.get("bearer-token", "")
+    impl_ref = request.json.get('impl-ref')
+    impl_data = ''
+    if 'input-params-grid' in request.json:
+        input_params_list = parameters.expand_parameter_grid(request.json['input-params-grid'])
+    else:
+        input_params_list = request.json.get('input-params', [])
+    if impl_language.lower() == 'quil' or not input_params_list:
+        abort(400)
+    input_params_list = [parameters.ParameterDictionary(input_params) for input_params in input_params_list]
+
+    if impl_url is not None and impl_url != "":
+        impl_url = request.json['impl-url']
+    elif impl_ref:
+        if not blob_store.contains(impl_ref):
+            return _unknown_impl_ref(impl_ref)
+    elif 'impl-data' in request.json:
+        impl_data = base64.b64decode(request.json.get('impl-data').encode()).decode()
+    else:
+        abort(400)
+
+    batch_id = str(uuid.uuid4())
+    generated_circuit_ids = [str(uuid.uuid4()) for _ in input_params_list]
+    job_timeout = jobs.get_timeout(request.json.get('timeout'), current_app.config['GENERATE_TIMEOUT'])
+    job_kwargs = blob_store.by_reference(dict(generated_circuit_ids=generated_circuit_ids, impl_url=impl_url,
+                                              impl_data=impl_data, input_params_list=input_params_list,
+                                              bearer_token=bearer_token, impl_ref=impl_ref))
+    # the job is identified by the batch id, thus, it can be cancelled once all circuits of the batch are cancelled
+    current_app.implementation_queue.enqueue('app.tasks.generate_batch', job_id=batch_id, job_timeout=job_timeout,
+                                             meta=tracing.inject(), **job_kwargs)
+
+    db.session.add_all([Generated_Circuit(id=generated_circuit_id, batch_id=batch_id)
+                        for generated_circuit_id in generated_circuit_ids])
+    db.session.commit()
+
+    current_app.logger.info('Returning HTTP response to client...')
+    content_location = '/forest-service/api/v1.0/generated-circuit-batches/' + batch_id
+    response = jsonify({'Location': content_location})
+    response.status_code = 202
+    response.headers['Location'] = content_location
+    response.autocorrect_location_header = True
+    return response
+
+
+@bp.route('/forest-service/api/v1.0/generated-circuit-batches/<batch_id>', methods=['GET'])
+def get_generated_circuit_batch(batch_id):
+    """Return the locations and completion state of all generated circuits of a batch."""
+    generated_circuits = _get_batch(batch_id)
+    if not generated_circuits:
+        abort(404)
+    _complete_failed_generation(generated_circuits, batch_id)
+    return jsonify({'id': batch_id, 'complete': all(generated_circuit.complete for generated_circuit in generated_circuits),
+                    'generated-circuits': [
+                        {'id': generated_circuit.id, 'complete': generated_circuit.complete,
+                         'Location': '/forest-service/api/v1.0/generated-circuits/' + generated_circuit.id}
+                        for generated_circuit in generated_circuits]}), 200
+
+
+def _get_batch(batch_id):
+    # the ids are queried from the database, the state of the generated circuits may be newer in the hot store
+    batch_circuit_ids = [row.id for row in db.session.query(Generated_Circuit.id).filter_by(batch_id=batch_id)]
+    return hot_store.get_many(Generated_Circuit, batch_circuit_ids)
+
+
+def _complete_failed_generation(generated_circuits, job_id):
+    """Complete the generated circuits with an error if their job has been stopped, e.g., because it exceeded its
+    timeout, without storing them."""
+    incomplete_circuits = [generated_circuit for generated_circuit in generated_circuits
+                           if not generated_circuit.complete]
+    if incomplete_circuits and jobs.has_failed(job_id):
+        for generated_circuit in incomplete_circuits:
+            generated_circuit.generated_circuit = json_provider.dumps({'error': 'generation failed or timed out'})
+            generated_circuit.input_params = generated_circuit.input_params or json_provider.dumps({})
+            generated_circuit.complete = True
+            hot_store.save(generated_circuit)
+
+
+@bp.route('/forest-service/api/v1.0/generated-circuits/<generated_circuit_id>', methods=['GET'])
 def get_generated_circuit(generated_circuit_id):
-    """Return result when it is available."""
-    generated_circuit = Generated_Circuit.query.get(generated_circuit_id)
+    """Return result when it is available. Unchanged generated circuits are answered with 304 Not Modified, completed
+    ones are cached by clients."""
+    generated_circuit = hot_store.get(Generated_Circuit, generated_circuit_id)
+    if generated_circuit is None:
+        abort(404)
+    # the circuits of a batch are generated by the job of the batch
+    _complete_failed_generation([generated_circuit], generated_circuit.batch_id or generated_circuit.id)
+    return http_cache.conditional_response(http_cache.row_etag(generated_circuit), generated_circuit.complete,
+                                           lambda: _generated_circuit_response(generated_circuit))
+
+
+def _generated_circuit_response(generated_circuit):
     if generated_circuit.complete:
-        input_params_dict = json.loads(generated_circuit.input_params)
+        input_params_dict = json_provider.raw(generated_circuit.input_params)
         return jsonify(
             {'id': generated_circuit.id, 'complete': generated_circuit.complete, 'input_params': input_params_dict,
              'generated-circuit': generated_circuit.generated_circuit,
@@ -78,13 +215,39 @@ def get_generated_circuit(generated_circuit_id):
              'original-number-of-multi-qubit-gates': generated_circuit.original_number_of_multi_qubit_gates,
              'original-number-of-measurement-operations': generated_circuit.original_number_of_measurement_operations,
              'original-number-of-single-qubit-gates': generated_circuit.original_number_of_single_qubit_gates,
-             'original-multi-qubit-gate-depth': generated_circuit.original_multi_qubit_gate_depth}), 200
+             'original-multi-qubit-gate-depth': generated_circuit.original_multi_qubit_gate_depth})
     else:
-        return jsonify({'id': generated_circuit.id, 'complete': generated_circuit.complete}), 200
+        return jsonify({'id': generated_circuit.id, 'complete': generated_circuit.complete})
+
+
+@bp.route('/forest-service/api/v1.0/generated-circuits/<generated_circuit_id>', methods=['DELETE'])
+def cancel_generated_circuit(generated_circuit_id):
+    """Cancel the generation of the circuit, i.e., remove its job from the queue or stop it."""
+    generated_circuit = hot_store.get(Generated_Circuit, generated_circuit_id)
+    if generated_circuit is None:
+        abort(404)
+    if generated_circuit.complete:
+        return jsonify({'error': 'generation already completed', 'statusCode': '409'}), 409
+
+    generated_circuit.generated_circuit = json_provider.dumps({'error': 'generation cancelled'})
+    generated_circuit.input_params = generated_circuit.input_params or json_provider.dumps({})
+    generated_circuit.complete = True
+    hot_store.save(generated_circuit)
+
+    if generated_circuit.batch_id is None:
+        jobs.cancel(generated_circuit.id)
+    elif all(batch_circuit.complete for batch_circuit in _get_batch(generated_circuit.batch_id)):
+        # the other circuits of the batch are generated by the same job unless they are all cancelled
+        jobs.cancel(generated_circuit.batch_id)
+    return jsonify({'id': generated_circuit.id, 'complete': generated_circuit.complete, 'cancelled': True}), 200
 
 
-@app.route('/forest-service/api/v1.0/analyze-original-circuit', methods=['POST'])
+@bp.route('/forest-service/api/v1.0/analyze-original-circuit', methods=['POST'])
 def analyze_original_circuit():
+    # pyquil is imported lazily to keep the startup of the service and the workers cheap
+    from app import implementation_handler
+    from app.quil_analysis import get_quil_metrics
+
     impl_language = request.json.get('impl-language', '')
     input_params = request.json.get('input-params', {'token': ''})
     impl_url = request.json.get('impl-url', "")
@@ -93,7 +256,8 @@ def analyze_original_circuit():
     if impl_url is not None and impl_url != "":
         impl_url = request.json['impl-url']
         if impl_language.lower() == 'quil':
-            circuit = implementation_handler.prepare_code_from_quil_url(impl_url, bearer_token)
+            # Quil programs are parsed and analyzed using quil-rs without building a pyquil Program
+            circuit = implementation_handler.prepare_quil_from_url(impl_url, bearer_token)
         else:
             try:
                 circuit = implementation_handler.prepare_code_from_url(impl_url, input_params, bearer_token)
@@ -103,7 +267,7 @@ def analyze_original_circuit():
     elif 'impl-data' in request.json:
         impl_data = base64.b64decode(request.json.get('impl-data').encode()).decode()
         if impl_language.lower() == 'quil':
-            circuit = implementation_handler.prepare_code_from_quil(impl_data)
+            circuit = implementation_handler.prepare_quil(impl_data)
         else:
             try:
                 circuit = implementation_handler.prepare_code_from_data(impl_data, input_params)
@@ -113,7 +277,11 @@ def analyze_original_circuit():
         abort(400)
 
     try:
-        metrics = get_non_transpiled_circuit_metrics(circuit)
+        if impl_language.lower() == 'quil':
+            metrics = get_quil_metrics(circuit)
+        else:
+            from app.analysis import get_non_transpiled_circuit_metrics
+            metrics = get_non_transpiled_circuit_metrics(circuit)
 
     except Exception:
         return jsonify({'error': 'analysis failed'}), 200
@@ -121,15 +289,22 @@ def analyze_original_circuit():
     return jsonify(metrics), 200
 
 
-@app.route('/forest-service/api/v1.0/transpile', methods=['POST'])
+@bp.route('/forest-service/api/v1.0/transpile', methods=['POST'])
 def transpile_circuit():
     """Get implementation from URL. Pass input into implementation. Generate and transpile circuit
     and return depth and width."""
+    from app import forest_handler, implementation_handler
+    from app.analysis import get_circuit_metrics
 
-    if not request.json or not 'qpu-name' in request.json:
+    if not request.json or not ('qpu-name' in request.json or 'qpu-names' in request.json):
         abort(400)
 
-    qpu_name = request.json['qpu-name']
+    qpu_name = request.json.get('qpu-name')
+    qpu_names = request.json.get('qpu-names')
+    if 'qpu-names' in request.json and not (isinstance(qpu_names, list) and qpu_names
+                                            and all(isinstance(name, str) and name for name in qpu_names)):
+        return jsonify({'error': 'qpu-names has to be a non-empty list of QPU names', 'statusCode': '400'}), 400
+    estimate = request.json.get('estimate', False)
     impl_language = request.json.get('impl-language', '')
     input_params = request.json.get('input-params', "")
     impl_url = request.json.get('impl-url', "")
@@ -169,9 +344,20 @@ def transpile_circuit():
     else:
         abort(400)
 
+    if estimate:
+        # estimate the transpiled metrics based on the topology of the QPUs in milliseconds without quilc
+        if qpu_names:
+            return jsonify({name: _estimate_for_qpu(circuit, name, token) for name in dict.fromkeys(qpu_names)}), 200
+        metrics = _estimate_for_qpu(circuit, qpu_name, token)
+        return jsonify(metrics), 404 if metrics.get('error') == 'qpu-name not found' else 200
+
+    if qpu_names:
+        # the circuit is prepared once and compiled for all QPUs concurrently
+        return jsonify(_transpile_for_qpus(circuit, qpu_names, token, short_impl_name)), 200
+
     backend = forest_handler.get_qpu(token, qpu_name)
     if not backend:
-        app.logger.warn(f"{qpu_name} not found.")
+        current_app.logger.warn(f"{qpu_name} not found.")
         abort(404)
     metrics = get_circuit_metrics(circuit, backend, short_impl_name, qpu_name)
 
@@ -179,7 +365,52 @@ def transpile_circuit():
     return jsonify(metrics), 200
 
 
-@app.route('/forest-service/api/v1.0/execute', methods=['POST'])
+def _estimate_for_qpu(circuit, qpu_name, token):
+    from app import estimator
+    from app.analysis import get_non_transpiled_circuit_metrics
+
+    try:
+        topology, shortest_paths = estimator.get_topology(token, qpu_name)
+    except Exception:
+        current_app.logger.warn(f"{qpu_name} not found.")
+        return {'error': 'qpu-name not found'}
+    try:
+        metrics = estimator.estimate_circuit_metrics(circuit, topology, shortest_paths)
+    except ValueError as e:
+        return {'error': str(e)}
+    metrics.update(get_non_transpiled_circuit_metrics(circuit))
+    return metrics
+
+
+def _transpile_for_qpus(circuit, qpu_names, token, short_impl_name):
+    """Transpile the circuit for every given QPU in a thread pool, each thread using its own quilc client.
+    Return the circuit metrics per QPU."""
+    from app import forest_handler
+    from app.analysis import get_circuit_metrics
+    app = current_app._get_current_object()
+
+    def transpile(qpu_name):
+        # the threads require their own application context
+        with app.app_context():
+            try:
+                backend = forest_handler.get_qpu(token, qpu_name)
+            except Exception:
+                backend = None
+            if not backend:
+                app.logger.warn(f"{qpu_name} not found.")
+                return {'error': 'qpu-name not found'}
+            try:
+                return get_circuit_metrics(circuit.copy(), backend, short_impl_name, qpu_name)
+            except Exception:
+                app.logger.exception(f"Transpiling {short_impl_name} for {qpu_name} failed.")
+                return {'error': 'transpilation failed'}
+
+    qpu_names = list(dict.fromkeys(qpu_names))
+    with ThreadPoolExecutor(max_workers=min(len(qpu_names), current_app.config['TRANSPILE_WORKERS'])) as executor:
+        return dict(zip(qpu_names, executor.map(transpile, qpu_names)))
+
+
+@bp.route('/forest-service/api/v1.0/execute', methods=['POST'])
 def execute_circuit():
     """Put execution job in queue. Return location of the later result."""
     if not request.json or not 'qpu-name' in request.json:
@@ -189,11 +420,25 @@ def execute_circuit():
     impl_url = request.json.get('impl-url')
     bearer_token = request.json.get("bearer-token", "")
     impl_data = request.json.get('impl-data')
+    impl_ref = request.json.get('impl-ref')
     transpiled_quil = request.json.get('transpiled-quil')
     input_params = request.json.get('input-params', "")
     input_params = parameters.ParameterDictionary(input_params)
     shots = request.json.get('shots', 1024)
     correlation_id = request.json.get('correlation-id', None)
+    noise_model = request.json.get('noise-model')
+    only_measurement_errors = request.json.get('only-measurement-errors', True)
+    mitigate_readout_errors = request.json.get('mitigate-readout-errors', False)
+    seed = request.json.get('seed')
+    target_precision = request.json.get('target-precision')
+    if target_precision:
+        from app import adaptive_shots
+
+        # shots is the maximum number of shots of executions with a target precision
+        try:
+            target_precision = adaptive_shots.parse_target_precision(target_precision)
+        except (AttributeError, ValueError) as e:
+            return jsonify({'error': str(e), 'statusCode': '400'}), 400
     if 'token' in input_params:
         token = input_params['token']
     elif 'token' in request.json:
@@ -201,13 +446,157 @@ def execute_circuit():
     else:
         abort(400)
 
-    job = app.execute_queue.enqueue('app.tasks.execute', correlation_id=correlation_id, impl_url=impl_url, impl_data=impl_data,
-                                    impl_language=impl_language, transpiled_quil=transpiled_quil, qpu_name=qpu_name,
-                                    token=token, input_params=input_params, shots=shots, bearer_token=bearer_token)
+    cached_counts = None
+    if seed is not None and transpiled_quil and not mitigate_readout_errors and not correlation_id \
+            and not target_precision:
+        # replayed seeded executions of transpiled Quil are answered from the cache without occupying a worker
+        cached_counts = result_cache.get(result_cache.cache_key(transpiled_quil, shots, seed, qpu_name, noise_model))
+    if cached_counts:
+        result = Result(id=str(uuid.uuid4()), backend=qpu_name, shots=shots, result=cached_counts, complete=True)
+        db.session.add(result)
+        db.session.commit()
+        return _result_location_response(result)
+
+    if impl_ref and not blob_store.contains(impl_ref):
+        return _unknown_impl_ref(impl_ref)
+    cost = _estimate_cost(transpiled_quil, impl_data, impl_language, correlation_id, shots)
+    retry_after = scheduling.get_retry_after(cost)
+    if retry_after:
+        return _too_many_requests(retry_after)
+
+    job_timeout = jobs.get_timeout(request.json.get('timeout'), current_app.config['EXECUTE_TIMEOUT'])
+    job = scheduling.enqueue('app.tasks.execute', cost, job_timeout=job_timeout, correlation_id=correlation_id,
+                             impl_url=impl_url,
+                             impl_data=impl_data, impl_language=impl_language, transpiled_quil=transpiled_quil,
+                             qpu_name=qpu_name, token=token, input_params=input_params, shots=shots,
+                             bearer_token=bearer_token, noise_model=noise_model,
+                             only_measurement_errors=only_measurement_errors,
+                             mitigate_readout_errors=mitigate_readout_errors, seed=seed,
+                             target_precision=target_precision, impl_ref=impl_ref)
     result = Result(id=job.get_id(), backend=qpu_name, shots=shots)
     db.session.add(result)
     db.session.commit()
 
+    return _result_location_response(result)
+
+
+@bp.route('/forest-service/api/v1.0/expectation-values', methods=['POST'])
+def simulate_circuit():
+    """Put wavefunction simulation job in queue. Return location of the exact probabilities and expectation values."""
+    from app import expectation
+
+    if not request.json or not ('impl-url' in request.json or 'impl-data' in request.json
+                                or 'impl-ref' in request.json or 'transpiled-quil' in request.json):
+        abort(400)
+    impl_language = request.json.get('impl-language', '')
+    impl_url = request.json.get('impl-url')
+    bearer_token = request.json.get("bearer-token", "")
+    impl_data = request.json.get('impl-data')
+    impl_ref = request.json.get('impl-ref')
+    if impl_ref and not blob_store.contains(impl_ref):
+        return _unknown_impl_ref(impl_ref)
+    transpiled_quil = request.json.get('transpiled-quil')
+    input_params = request.json.get('input-params', "")
+    input_params = parameters.ParameterDictionary(input_params)
+    observables = request.json.get('observables', [])
+    if isinstance(observables, str):
+        observables = [observables]
+    # without observables the probabilities are returned by default
+    probabilities = request.json.get('probabilities', not observables)
+    try:
+        for observable in observables:
+            expectation.parse_observable(observable)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # the wavefunction is simulated once
+    cost = _estimate_cost(transpiled_quil, impl_data, impl_language, None, 1)
+    retry_after = scheduling.get_retry_after(cost)
+    if retry_after:
+        return _too_many_requests(retry_after)
+
+    job_timeout = jobs.get_timeout(request.json.get('timeout'), current_app.config['EXECUTE_TIMEOUT'])
+    job = scheduling.enqueue('app.tasks.simulate', cost, job_timeout=job_timeout, impl_url=impl_url,
+                             impl_data=impl_data, impl_language=impl_language, transpiled_quil=transpiled_quil,
+                             input_params=input_params, observables=observables, probabilities=probabilities,
+                             bearer_token=bearer_token, impl_ref=impl_ref)
+    result = Result(id=job.get_id(), backend='wavefunction-simulator', shots=0)
+    db.session.add(result)
+    db.session.commit()
+
+    return _result_location_response(result)
+
+
+@bp.route('/forest-service/api/v1.0/results/<result_id>/extend', methods=['POST'])
+def extend_result(result_id):
+    """Put a job executing additional shots of the stored compiled program in queue. The counts are merged into the
+    result, which is incomplete until then."""
+    if not request.json or not isinstance(request.json.get('shots'), int) or request.json['shots'] < 1:
+        abort(400)
+    result = hot_store.get(Result, result_id)
+    if result is None:
+        abort(404)
+    if not _can_be_extended(result):
+        return jsonify({'error': 'only completed executions without post processing can be extended',
+                        'statusCode': '409'}), 409
+    shots = request.json['shots']
+
+    cost = _estimate_cost(None, None, '', result.generated_circuit_id, shots)
+    retry_after = scheduling.get_retry_after(cost)
+    if retry_after:
+        return _too_many_requests(retry_after)
+
+    result.complete = False
+    result.extension_error = None
+    hot_store.save(result)
+    job_timeout = jobs.get_timeout(request.json.get('timeout'), current_app.config['EXECUTE_TIMEOUT'])
+    scheduling.enqueue('app.tasks.extend', cost, job_id=jobs.get_extension_job_id(result.id),
+                       job_timeout=job_timeout, result_id=result.id, token=request.json.get('token', ''),
+                       shots=shots, seed=request.json.get('seed'))
+    return _result_location_response(result)
+
+
+def _can_be_extended(result):
+    return bool(result.complete and not result.cancelled and result.executable_key
+                and not result.post_processing_result)
+
+
+def _estimate_cost(transpiled_quil, impl_data, impl_language, correlation_id, shots):
+    """Estimate the cost of an execution from the width and number of operations of the circuit if they are known
+    before it is prepared by the worker, i.e., for Quil and generated circuits."""
+    from app import quil_analysis
+
+    width = current_app.config['SCHEDULING_DEFAULT_WIDTH']
+    number_of_operations = current_app.config['SCHEDULING_DEFAULT_OPERATIONS']
+    quil = None
+    if transpiled_quil:
+        quil = transpiled_quil
+    elif impl_data and impl_language.lower() == 'quil':
+        quil = base64.b64decode(impl_data.encode()).decode()
+    if quil:
+        try:
+            metrics = quil_analysis.get_quil_metrics(quil_analysis.parse_quil(quil))
+            width = metrics['original-width']
+            number_of_operations = metrics['original-total-number-of-operations']
+        except Exception:
+            # invalid Quil is reported by the worker
+            pass
+    elif correlation_id:
+        generated_circuit = hot_store.get(Generated_Circuit, correlation_id)
+        if generated_circuit and generated_circuit.complete and generated_circuit.original_width is not None:
+            width = generated_circuit.original_width
+            number_of_operations = generated_circuit.original_total_number_of_operations
+    return scheduling.estimate_cost(width, number_of_operations, shots)
+
+
+def _too_many_requests(retry_after):
+    response = jsonify({'error': 'Too Many Requests', 'statusCode': '429'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def _result_location_response(result):
     logging.info('Returning HTTP response to client...')
     content_location = '/forest-service/api/v1.0/results/' + result.id
     response = jsonify({'Location': content_location})
@@ -217,26 +606,176 @@ def execute_circuit():
     return response
 
 
-@app.route('/forest-service/api/v1.0/results/<result_id>', methods=['GET'])
+@bp.route('/forest-service/api/v1.0/results/<result_id>', methods=['GET'])
 def get_result(result_id):
-    """Return result when it is available."""
-    result = Result.query.get(result_id)
+    """Return result when it is available. Unchanged results are answered with 304 Not Modified."""
+    result = hot_store.get(Result, result_id)
+    if result is None:
+        abort(404)
+    if not result.complete and result.executable_key:
+        if jobs.has_failed(jobs.get_extension_job_id(result.id)):
+            # the additional shots have failed, the result keeps its previous counts
+            result.extension_error = 'execution of additional shots failed or timed out'
+            result.complete = True
+            hot_store.save(result)
+    elif not result.complete and jobs.has_failed(result.id):
+        # the job has been stopped, e.g., because it exceeded its timeout, without storing its result
+        result.result = json_provider.dumps({'error': 'execution failed or timed out'})
+        result.complete = True
+        hot_store.save(result)
+    # completed results are immutable unless additional shots can be executed
+    immutable = result.complete and not _can_be_extended(result)
+    return http_cache.conditional_response(http_cache.row_etag(result), immutable,
+                                           lambda: jsonify(_result_response(result)))
+
+
+def _result_response(result):
     if result.complete:
-        result_dict = json.loads(result.result)
+        # the stored JSON is embedded into the response without parsing and serializing it again
+        result_dict = json_provider.raw(result.result)
         if result.post_processing_result:
-            post_processing_result_dict = json.loads(result.post_processing_result)
-            return jsonify(
-                {'id': result.id, 'complete': result.complete, 'result': result_dict, 'backend': result.backend,
-                 'shots': result.shots, 'generated-circuit-id': result.generated_circuit_id,
-                 'post-processing-result': post_processing_result_dict}), 200
+            post_processing_result_dict = json_provider.raw(result.post_processing_result)
+            response = {'id': result.id, 'complete': result.complete, 'result': result_dict,
+                        'backend': result.backend, 'shots': result.shots,
+                        'generated-circuit-id': result.generated_circuit_id,
+                        'post-processing-result': post_processing_result_dict}
         else:
-            return jsonify(
-                {'id': result.id, 'complete': result.complete, 'result': result_dict, 'backend': result.backend,
-                 'shots': result.shots}), 200
+            response = {'id': result.id, 'complete': result.complete, 'result': result_dict,
+                        'backend': result.backend, 'shots': result.shots}
+        if result.mitigated_result:
+            response['mitigated-result'] = json_provider.raw(result.mitigated_result)
+        if result.cancelled:
+            response['cancelled'] = True
+        if result.extension_error:
+            response['extension-error'] = result.extension_error
+        return response
     else:
-        return jsonify({'id': result.id, 'complete': result.complete}), 200
+        return {'id': result.id, 'complete': result.complete}
+
+
+@bp.route('/forest-service/api/v1.0/results/bulk', methods=['POST'])
+def get_results():
+    """Return the completion state and optionally the results of many executions at once. Given a cursor, only the
+    results completed after it are returned."""
+    if not request.json or not isinstance(request.json.get('ids'), list):
+        abort(400)
+    result_ids = list(dict.fromkeys(request.json['ids']))
+    if len(result_ids) > current_app.config['BULK_RESULTS_MAX_IDS']:
+        return jsonify({'error': f"at most {current_app.config['BULK_RESULTS_MAX_IDS']} ids can be requested",
+                        'statusCode': '400'}), 400
+    include_results = request.json.get('include-results', False)
+    cursor = request.json.get('cursor')
+
+    # recently written results are read from the hot store, all others using a single IN query
+    results = hot_store.get_many(Result, result_ids)
+    found_ids = {result.id for result in results}
+    if cursor:
+        try:
+            cursor_time = _parse_time(cursor)
+        except (TypeError, ValueError):
+            abort(400)
+        results = [result for result in results if result.completed_at and result.completed_at > cursor_time]
+
+    completed_at = [result.completed_at for result in results if result.completed_at is not None]
+    response = {
+        'results': [_result_response(result) if include_results else {'id': result.id, 'complete': result.complete}
+                    for result in results],
+        # the cursor of the next request, i.e., the latest completion of the returned results
+        'cursor': max(completed_at).isoformat() if completed_at else cursor,
+    }
+    if not cursor:
+        response['unknown-ids'] = [result_id for result_id in result_ids if result_id not in found_ids]
+    return jsonify(response), 200
+
+
+@bp.route('/forest-service/api/v1.0/results', methods=['GET'])
+def list_results():
+    """List past executions, newest first, optionally filtered by backend, correlation id, and creation time.
+
+    Pages are selected by the (created_at, id) of the last listed execution instead of an offset, thus, every page
+    is read from the corresponding index without scanning the skipped rows. The listing is read from the database,
+    i.e., the completion state of the latest executions may lag behind GET /results/<id> until they are flushed.
+    """
+    try:
+        limit = int(request.args.get('limit', current_app.config['RESULTS_PAGE_SIZE']))
+        created_after = _parse_time(request.args.get('created-after'))
+        created_before = _parse_time(request.args.get('created-before'))
+        cursor = request.args.get('cursor')
+        if cursor:
+            cursor_time, cursor_id = cursor.split('|', 1)
+            cursor_time = _parse_time(cursor_time)
+    except ValueError:
+        abort(400)
+    if not 1 <= limit <= current_app.config['RESULTS_MAX_PAGE_SIZE']:
+        return jsonify({'error': f"limit has to be between 1 and {current_app.config['RESULTS_MAX_PAGE_SIZE']}",
+                        'statusCode': '400'}), 400
+
+    # the large result columns are not loaded
+    query = db.select(Result.id, Result.complete, Result.cancelled, Result.backend, Result.shots,
+                      Result.generated_circuit_id, Result.created_at, Result.completed_at)
+    if request.args.get('backend'):
+        query = query.where(Result.backend == request.args['backend'])
+    if request.args.get('correlation-id'):
+        query = query.where(Result.generated_circuit_id == request.args['correlation-id'])
+    if created_after:
+        query = query.where(Result.created_at >= created_after)
+    if created_before:
+        query = query.where(Result.created_at < created_before)
+    if cursor:
+        query = query.where(db.or_(Result.created_at < cursor_time,
+                                   db.and_(Result.created_at == cursor_time, Result.id < cursor_id)))
+    rows = db.session.execute(query.order_by(Result.created_at.desc(), Result.id.desc()).limit(limit)).all()
+
+    results = [{'id': row.id, 'complete': row.complete, 'cancelled': bool(row.cancelled), 'backend': row.backend,
+                'shots': row.shots, 'generated-circuit-id': row.generated_circuit_id,
+                'created-at': row.created_at.isoformat() if row.created_at else None,
+                'completed-at': row.completed_at.isoformat() if row.completed_at else None,
+                'location': f"/forest-service/api/v1.0/results/{row.id}"}
+               for row in rows]
+    # the cursor of the next page, None if this is the last page
+    next_cursor = f"{rows[-1].created_at.isoformat()}|{rows[-1].id}" if len(rows) == limit else None
+    return jsonify({'results': results, 'cursor': next_cursor}), 200
+
+
+def _parse_time(value):
+    """Parse an ISO 8601 time, times with an offset are converted to the naive UTC times stored in the database."""
+    if not value:
+        return None
+    time = datetime.fromisoformat(value)
+    if time.tzinfo is not None:
+        time = time.astimezone(timezone.utc).replace(tzinfo=None)
+    return time
+
+
+@bp.route('/forest-service/api/v1.0/results/<result_id>', methods=['DELETE'])
+def cancel_result(result_id):
+    """Cancel the execution, i.e., remove its job from the queue or stop it to free the worker and the QVM."""
+    result = hot_store.get(Result, result_id)
+    if result is None:
+        abort(404)
+    if result.complete:
+        return jsonify({'error': 'execution already completed', 'statusCode': '409'}), 409
+    if result.executable_key and jobs.cancel(jobs.get_extension_job_id(result.id)):
+        # only the additional shots are cancelled, the result keeps its previous counts
+        result.complete = True
+        hot_store.save(result)
+        return jsonify({'id': result.id, 'complete': result.complete, 'cancelled': True}), 200
+
+    result.result = json_provider.dumps({'error': 'execution cancelled'})
+    result.cancelled = True
+    result.complete = True
+    hot_store.save(result)
+    jobs.cancel(result.id)
+    return jsonify({'id': result.id, 'complete': result.complete, 'cancelled': True}), 200
+
+
+@bp.route('/forest-service/api/v1.0/endpoints', methods=['GET'])
+def get_endpoints():
+    """Return availability, outstanding requests, and latency of the quilc and QVM endpoints."""
+    from app import forest_handler
+    return jsonify({'quilc': forest_handler.quilc_pool.metrics(), 'qvm': forest_handler.qvm_pool.metrics()}), 200
 
 
-@app.route('/forest-service/api/v1.0/version', methods=['GET'])
+@bp.route('/forest-service/api/v1.0/version', methods=['GET'])
 def version():
     return jsonify({'version': '1.0'})
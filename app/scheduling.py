@@ -0,0 +1,112 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import math
+from typing import Optional
+
+from flask import current_app
+
+from app import blob_store, tracing
+
+# lanes of the execute queue in order of priority, the workers listen to them in this order
+LANES = ('high', 'default', 'low')
+
+_reconciled_key = 'forest-service:scheduling:reconciled'
+
+
+def _costs_key(lane: str) -> str:
+    return f"forest-service:scheduling:costs:{lane}"
+
+
+def _backlog_key(lane: str) -> str:
+    return f"forest-service:scheduling:backlog:{lane}"
+
+
+def estimate_cost(width: int, number_of_operations: int, shots: int) -> float:
+    """Estimate the cost of executing a circuit on the QVM, i.e., every shot applies every operation to a wavefunction
+    of 2^width amplitudes."""
+    return float(max(shots, 1) * max(number_of_operations, 1) * 2 ** width)
+
+
+def get_lane(cost: float) -> str:
+    if cost <= current_app.config['SCHEDULING_HIGH_PRIORITY_COST']:
+        return 'high'
+    if cost >= current_app.config['SCHEDULING_LOW_PRIORITY_COST']:
+        return 'low'
+    return 'default'
+
+
+def get_backlog(lane: str) -> float:
+    """Return the summed up estimated cost of the waiting jobs which are executed before the jobs of the given lane,
+    i.e., of the jobs in the lane and in all lanes of higher priority. The cost of every lane is summed up when jobs
+    are enqueued and dequeued, and reconciled with the queues every SCHEDULING_RECONCILE_INTERVAL seconds."""
+    if current_app.redis.set(_reconciled_key, 1, nx=True, ex=current_app.config['SCHEDULING_RECONCILE_INTERVAL']):
+        reconcile()
+    backlogs = current_app.redis.mget([_backlog_key(ahead_lane) for ahead_lane in LANES[:LANES.index(lane) + 1]])
+    return max(0.0, sum(float(backlog or 0) for backlog in backlogs))
+
+
+def reconcile():
+    """Remove the cost of jobs which are not waiting anymore, e.g., because their worker has been killed, and reset the
+    cost of every lane to the sum of its waiting jobs."""
+    for lane in LANES:
+        queued_job_ids = set(current_app.execute_queues[lane].get_job_ids())
+        costs = {job_id.decode(): float(cost) for job_id, cost in current_app.redis.hgetall(_costs_key(lane)).items()}
+        stale_job_ids = [job_id for job_id in costs if job_id not in queued_job_ids]
+        pipeline = current_app.redis.pipeline()
+        if stale_job_ids:
+            pipeline.hdel(_costs_key(lane), *stale_job_ids)
+        pipeline.set(_backlog_key(lane), sum(cost for job_id, cost in costs.items() if job_id in queued_job_ids))
+        pipeline.execute()
+
+
+def get_retry_after(cost: float) -> Optional[int]:
+    """Return the seconds to wait before the job may be enqueued if the backlog ahead of it and its own cost exceed
+    SCHEDULING_BACKLOG_LIMIT, otherwise None. A job is always admitted to an empty backlog."""
+    limit = current_app.config['SCHEDULING_BACKLOG_LIMIT']
+    if not limit:
+        return None
+    backlog = get_backlog(get_lane(cost))
+    if not backlog or backlog + cost <= limit:
+        return None
+    excess = backlog + cost - limit
+    return min(max(1, math.ceil(excess / current_app.config['SCHEDULING_COST_RATE'])),
+               current_app.config['SCHEDULING_MAX_RETRY_AFTER'])
+
+
+def enqueue(function: str, cost: float, **kwargs):
+    """Enqueue the job into the lane matching its estimated cost and add its cost to the backlog of the lane. Large
+    arguments are passed by reference and the trace context of the request is passed in the meta of the job."""
+    lane = get_lane(cost)
+    job = current_app.execute_queues[lane].enqueue(function, meta=tracing.inject(), **blob_store.by_reference(kwargs))
+    pipeline = current_app.redis.pipeline()
+    pipeline.hset(_costs_key(lane), job.get_id(), cost)
+    pipeline.incrbyfloat(_backlog_key(lane), cost)
+    pipeline.execute()
+    return job
+
+
+def dequeue(job):
+    """Remove the cost of the job from the backlog of its lane once it is started, packed, or cancelled. The cost is
+    only removed once, even if the job is dequeued concurrently, e.g., cancelled while it is started."""
+    lane = next((lane for lane, queue in current_app.execute_queues.items() if queue.name == job.origin), None)
+    if lane is None:
+        return
+    cost = current_app.redis.hget(_costs_key(lane), job.id)
+    if cost is not None and current_app.redis.hdel(_costs_key(lane), job.id):
+        current_app.redis.incrbyfloat(_backlog_key(lane), -float(cost))
@@ -17,72 +17,166 @@
 #  limitations under the License.
 # ******************************************************************************
 
-from app import implementation_handler, forest_handler, db, app
-from rq import get_current_job
+from app import create_app
+from rq import Queue, get_current_job
+
+# jobs run outside of requests, thus, the tasks use their own application context
+app = create_app()
+app.app_context().push()
+
+from app import implementation_handler, forest_handler
 
 from pyquil import Program
 
 from app.analysis import get_non_transpiled_circuit_metrics
 from app.generated_circuit_model import Generated_Circuit
+from app.mitigation import get_calibration, mitigate_counts
+from app.noise_model import get_noise_model, get_readout_qubits
+from app.quil_analysis import get_quil_metrics
 from app.result_model import Result
 import logging
-import json
+from app import adaptive_shots, blob_store, executable_store, expectation, hot_store, json_provider, multiprogramming, \
+    result_cache, scheduling, tracing
 import base64
+import functools
+
+
+def _resolve_references(task):
+    """Load the arguments passed by reference from the blob store before the task is run."""
+    @functools.wraps(task)
+    def wrapper(*args, **kwargs):
+        return task(*args, **blob_store.resolve(kwargs))
+    return wrapper
+
 
+def _leave_backlog(task):
+    """Remove the cost of the started job from the backlog of its lane."""
+    @functools.wraps(task)
+    def wrapper(*args, **kwargs):
+        job = get_current_job()
+        if job is not None:
+            scheduling.dequeue(job)
+        return task(*args, **kwargs)
+    return wrapper
 
-def generate(impl_url, impl_data, impl_language, input_params, bearer_token):
+
+@tracing.traced_job
+@_resolve_references
+def generate(impl_url, impl_data, impl_language, input_params, bearer_token, impl_ref=None):
     app.logger.info("Starting generate task...")
     job = get_current_job()
 
     generated_circuit_code = None
+    quil_program = None
     if impl_url:
         if impl_language.lower() == 'quil':
-            generated_circuit_code = implementation_handler.prepare_code_from_quil_url(impl_url, bearer_token)
+            quil_program = implementation_handler.prepare_quil_from_url(impl_url, bearer_token)
         else:
             generated_circuit_code = implementation_handler.prepare_code_from_url(impl_url, input_params, bearer_token)
-    elif impl_data:
-        impl_data = base64.b64decode(impl_data.encode()).decode()
+    elif impl_data or impl_ref:
+        # impl-data has already been decoded by the API
+        if impl_ref:
+            impl_data = blob_store.get_text(impl_ref)
         if impl_language.lower() == 'quil':
-            generated_circuit_code = implementation_handler.prepare_code_from_quil(impl_data)
+            quil_program = implementation_handler.prepare_quil(impl_data)
         else:
             generated_circuit_code = implementation_handler.prepare_code_from_data(impl_data, input_params)
     else:
-        generated_circuit_object = Generated_Circuit.query.get(job.get_id())
-        generated_circuit_object.generated_circuit = json.dumps({'error': 'generating circuit failed'})
+        generated_circuit_object = hot_store.get(Generated_Circuit, job.get_id())
+        generated_circuit_object.generated_circuit = json_provider.dumps({'error': 'generating circuit failed'})
         generated_circuit_object.complete = True
-        db.session.commit()
+        hot_store.save(generated_circuit_object)
+
+    if quil_program:
+        # Quil programs are analyzed on the quil-rs representation without building a pyquil Program
+        generated_circuit_object = hot_store.get(Generated_Circuit, job.get_id())
+        _set_generated_circuit(generated_circuit_object, quil_program.to_quil(), get_quil_metrics(quil_program),
+                               input_params)
+        hot_store.save(generated_circuit_object)
 
     if generated_circuit_code:
 
         metrics = get_non_transpiled_circuit_metrics(generated_circuit_code)
 
-        generated_circuit_object = Generated_Circuit.query.get(job.get_id())
-        generated_circuit_object.generated_circuit = generated_circuit_code.out()
+        generated_circuit_object = hot_store.get(Generated_Circuit, job.get_id())
+        _set_generated_circuit(generated_circuit_object, generated_circuit_code.out(), metrics, input_params)
+        hot_store.save(generated_circuit_object)
 
-        generated_circuit_object.original_depth = metrics['original-depth']
-        generated_circuit_object.original_width = metrics['original-width']
-        generated_circuit_object.original_total_number_of_operations = metrics['original-total-number-of-operations']
-        generated_circuit_object.original_number_of_multi_qubit_gates = metrics['original-number-of-multi-qubit-gates']
-        generated_circuit_object.original_number_of_measurement_operations = metrics['original-number-of-measurement-operations']
-        generated_circuit_object.original_number_of_single_qubit_gates = metrics['original-number-of-single-qubit-gates']
-        generated_circuit_object.original_multi_qubit_gate_depth = metrics['original-multi-qubit-gate-depth']
 
-        generated_circuit_object.input_params = json.dumps(input_params)
-        app.logger.info(f"Received input params for circuit generation: {generated_circuit_object.input_params}")
-        generated_circuit_object.complete = True
-        db.session.commit()
+def _set_generated_circuit(generated_circuit_object, generated_circuit, metrics, input_params):
+    generated_circuit_object.generated_circuit = generated_circuit
+
+    generated_circuit_object.original_depth = metrics['original-depth']
+    generated_circuit_object.original_width = metrics['original-width']
+    generated_circuit_object.original_total_number_of_operations = metrics['original-total-number-of-operations']
+    generated_circuit_object.original_number_of_multi_qubit_gates = metrics['original-number-of-multi-qubit-gates']
+    generated_circuit_object.original_number_of_measurement_operations = metrics['original-number-of-measurement-operations']
+    generated_circuit_object.original_number_of_single_qubit_gates = metrics['original-number-of-single-qubit-gates']
+    generated_circuit_object.original_multi_qubit_gate_depth = metrics['original-multi-qubit-gate-depth']
+
+    generated_circuit_object.input_params = json_provider.dumps(input_params)
+    app.logger.info(f"Received input params for circuit generation: {generated_circuit_object.input_params}")
+    generated_circuit_object.complete = True
+
+
+def _analyze_generated_circuit(circuit):
+    return circuit.out(), get_non_transpiled_circuit_metrics(circuit)
+
+
+@tracing.traced_job
+@_resolve_references
+def generate_batch(generated_circuit_ids, impl_url, impl_data, input_params_list, bearer_token, impl_ref=None):
+    """Import the implementation once and generate a circuit for every set of input parameters."""
+    app.logger.info(f"Starting batch generate task for {len(input_params_list)} sets of input params...")
+    processes = app.config['GENERATE_PROCESSES']
+
+    generated_circuits = None
+    if impl_ref:
+        impl_data = blob_store.get_text(impl_ref)
+    if impl_url:
+        generated_circuits = implementation_handler.prepare_circuits_from_url(
+            impl_url, input_params_list, _analyze_generated_circuit, bearer_token, processes)
+    elif impl_data:
+        generated_circuits = implementation_handler.prepare_circuits_from_data(
+            impl_data, input_params_list, _analyze_generated_circuit, processes)
+    if generated_circuits is None:
+        generated_circuits = [None] * len(input_params_list)
+
+    generated_circuit_objects = hot_store.get_many(Generated_Circuit, generated_circuit_ids)
+    for generated_circuit_object, input_params, generated_circuit in zip(generated_circuit_objects, input_params_list,
+                                                                         generated_circuits):
+        if generated_circuit_object.complete:
+            # the generation of the circuit has been cancelled
+            continue
+        if generated_circuit:
+            _set_generated_circuit(generated_circuit_object, *generated_circuit, input_params)
+        else:
+            generated_circuit_object.generated_circuit = json_provider.dumps({'error': 'generating circuit failed'})
+            generated_circuit_object.input_params = json_provider.dumps(input_params)
+            generated_circuit_object.complete = True
+        hot_store.save(generated_circuit_object)
 
 
-def execute(correlation_id, impl_url, impl_data, impl_language, transpiled_quil, input_params, token, qpu_name, shots, bearer_token: str):
+@tracing.traced_job
+@_leave_backlog
+@_resolve_references
+def execute(correlation_id, impl_url, impl_data, impl_language, transpiled_quil, input_params, token, qpu_name, shots,
+            bearer_token: str, noise_model=None, only_measurement_errors=True, mitigate_readout_errors=False,
+            seed=None, target_precision=None, impl_ref=None):
     """Create database entry for result. Get implementation code, prepare it, and execute it. Save result in db"""
     job = get_current_job()
+    result = hot_store.get(Result, job.get_id())
+    if result.cancelled:
+        return
+    if correlation_id and impl_url:
+        # the post processing implementation is downloaded while the circuit is compiled and executed
+        implementation_handler.prefetch_code([impl_url[0]], bearer_token)
 
     backend = forest_handler.get_qpu(token, qpu_name)
     if not backend:
-        result = Result.query.get(job.get_id())
-        result.result = json.dumps({'error': 'qpu-name or token wrong'})
+        result.result = json_provider.dumps({'error': 'qpu-name or token wrong'})
         result.complete = True
-        db.session.commit()
+        hot_store.save(result)
 
     logging.info('Preparing implementation...')
     circuit = None
@@ -94,46 +188,79 @@ def execute(correlation_id, impl_url, impl_data, impl_language, transpiled_quil,
                 circuit = implementation_handler.prepare_code_from_quil_url(impl_url, bearer_token)
             else:
                 circuit = implementation_handler.prepare_code_from_url(impl_url, input_params, bearer_token)
-        elif impl_data:
-            impl_data = base64.b64decode(impl_data.encode()).decode()
+        elif impl_data or impl_ref:
+            impl_data = _decode_impl_data(impl_data, impl_ref)
             if impl_language.lower() == 'quil':
                 circuit = implementation_handler.prepare_code_from_quil(impl_data)
             else:
                 circuit = implementation_handler.prepare_code_from_data(impl_data, input_params)
     if not circuit:
-        result = Result.query.get(job.get_id())
-        result.result = json.dumps({'error': 'URL not found'})
+        result.result = json_provider.dumps({'error': 'URL not found'})
         result.complete = True
-        db.session.commit()
+        hot_store.save(result)
+
+    readout_noise_model = None
+    if noise_model:
+        if not only_measurement_errors:
+            logging.warning('Gate errors are not simulated, applying the readout errors of the noise model only.')
+        readout_noise_model = get_noise_model(noise_model)
+
+    if circuit and app.config['MULTIPROGRAMMING_MAX_JOBS'] and multiprogramming.is_candidate(
+            transpiled_quil, correlation_id, mitigate_readout_errors, seed, target_precision):
+        if _execute_packed(job, circuit, backend, qpu_name, shots, noise_model, readout_noise_model):
+            return
 
     logging.info('Start transpiling...')
     try:
         circuit.wrap_in_numshots_loop(shots=shots)
 
+        # the native Quil is kept in the executable store, thus, the result can be extended without compiling again
+        executable_key = executable_store.program_key(circuit, backend.name)
         if not transpiled_quil:
-            nq_program = backend.compiler.quil_to_native_quil(circuit, protoquil=True)
+            nq_program = forest_handler.quil_to_native_quil(circuit, backend)
         else:
             nq_program = circuit
+            if not executable_store.contains(executable_key):
+                executable_store.save(executable_key, nq_program)
 
-        transpiled_circuit = backend.compiler.native_quil_to_executable(nq_program)
+        transpiled_circuit = forest_handler.native_quil_to_executable(nq_program, backend)
     except Exception:
-        result = Result.query.get(job.get_id())
-        result.result = json.dumps({'error': 'too many qubits required'})
+        result.result = json_provider.dumps({'error': 'too many qubits required'})
         result.complete = True
-        db.session.commit()
+        hot_store.save(result)
+        return
 
-    logging.info('Start executing...')
-    job_result = forest_handler.execute_job(transpiled_circuit, shots, backend)
+    # seeded executions are reproducible, thus, their counts are cached
+    key = None
+    if seed is not None and not target_precision:
+        key = result_cache.cache_key(transpiled_quil or nq_program.out(), shots, seed, qpu_name, noise_model)
+        cached_counts = result_cache.get(key)
+    if key and cached_counts:
+        logging.info('Using cached counts of seeded execution...')
+        job_result = json_provider.loads(cached_counts)
+    elif target_precision:
+        logging.info(f"Start executing until reaching the target precision {target_precision}...")
+        job_result, used_shots = forest_handler.execute_adaptive_job(transpiled_circuit, shots, backend,
+                                                                     target_precision, readout_noise_model, seed)
+        result.shots = used_shots
+    else:
+        logging.info('Start executing...')
+        job_result = forest_handler.execute_job(transpiled_circuit, shots, backend, readout_noise_model, seed)
+        if key and job_result:
+            result_cache.set(key, json_provider.dumps(job_result))
     if job_result:
-        result = Result.query.get(job.get_id())
-        result.result = json.dumps(job_result)
+        result.result = json_provider.dumps(job_result)
+        result.executable_key = executable_key
+        result.noise_model = noise_model
+        if mitigate_readout_errors:
+            _mitigate(result, job_result, transpiled_circuit, backend, readout_noise_model)
         # check if implementation contains post processing of execution results that has to be executed
         if correlation_id and (impl_url or impl_data):
             result.generated_circuit_id = correlation_id
             # prepare input data containing execution results and initial input params for generating the circuit
-            generated_circuit = Generated_Circuit.query.get(correlation_id)
-            input_params_for_post_processing = json.loads(generated_circuit.input_params)
-            input_params_for_post_processing['counts'] = json.loads(result.result)
+            generated_circuit = hot_store.get(Generated_Circuit, correlation_id)
+            input_params_for_post_processing = json_provider.loads(generated_circuit.input_params)
+            input_params_for_post_processing['counts'] = json_provider.loads(result.result)
 
             if impl_url:
                 post_p_result = implementation_handler.prepare_code_from_url(url=impl_url[0],
@@ -143,11 +270,224 @@ def execute(correlation_id, impl_url, impl_data, impl_language, transpiled_quil,
             elif impl_data:
                 post_p_result = implementation_handler.prepare_post_processing_code_from_data(data=impl_data[0],
                                                                                               input_params=input_params_for_post_processing)
-            result.post_processing_result = json.loads(post_p_result)
+            # validate the JSON returned by the post processing before storing it
+            result.post_processing_result = json_provider.dumps(json_provider.loads(post_p_result))
         result.complete = True
-        db.session.commit()
+        hot_store.save(result)
+    else:
+        result.result = json_provider.dumps({'error': 'execution failed'})
+        result.complete = True
+        hot_store.save(result)
+
+
+def _mitigate(result, counts, transpiled_circuit, backend, readout_noise_model):
+    try:
+        width = len(next(iter(counts)))
+        readout_qubits = get_readout_qubits(transpiled_circuit, width)
+        calibration = get_calibration(backend, result.backend, readout_qubits, readout_noise_model, result.noise_model)
+        result.mitigated_result = json_provider.dumps(mitigate_counts(counts, calibration, readout_qubits))
+    except Exception:
+        logging.exception('Readout error mitigation failed')
+        result.mitigated_result = json_provider.dumps({'error': 'readout error mitigation failed'})
+
+
+@tracing.traced_job
+@_leave_backlog
+def extend(result_id, token, shots, seed=None):
+    """Execute the stored native Quil of the result with additional shots and merge the counts into the result."""
+    result = hot_store.get(Result, result_id)
+    try:
+        nq_program = executable_store.load(result.executable_key)
+        if nq_program is None:
+            raise ValueError(f"compiled program {result.executable_key} has been evicted from the executable store")
+        backend = forest_handler.get_qpu(token, result.backend)
+        nq_program.wrap_in_numshots_loop(shots)
+        transpiled_circuit = forest_handler.native_quil_to_executable(nq_program, backend)
+        readout_noise_model = get_noise_model(result.noise_model) if result.noise_model else None
+
+        logging.info(f"Start executing {shots} additional shots...")
+        counts = forest_handler.execute_job(transpiled_circuit, shots, backend, readout_noise_model, seed)
+        counts = adaptive_shots.merge_counts(json_provider.loads(result.result), counts)
+        result.result = json_provider.dumps(counts)
+        result.shots += shots
+        if result.mitigated_result:
+            _mitigate(result, counts, transpiled_circuit, backend, readout_noise_model)
+    except Exception as e:
+        # the result keeps its previous counts and shots
+        logging.exception(f"Extending result {result_id} failed")
+        result.extension_error = str(e) or 'execution of additional shots failed'
+    result.complete = True
+    hot_store.save(result)
+
+
+def _decode_impl_data(impl_data, impl_ref=None):
+    """Return the uploaded implementation if impl_ref is given, otherwise the base64 decoded impl-data."""
+    if impl_ref:
+        return blob_store.get_text(impl_ref)
+    return base64.b64decode(impl_data.encode()).decode()
+
+
+def _prepare_circuit(impl_url, impl_data, impl_language, input_params, bearer_token, impl_ref=None):
+    circuit = None
+    if impl_url:
+        if impl_language.lower() == 'quil':
+            circuit = implementation_handler.prepare_code_from_quil_url(impl_url, bearer_token)
+        else:
+            circuit = implementation_handler.prepare_code_from_url(impl_url, input_params, bearer_token)
+    elif impl_data or impl_ref:
+        impl_data = _decode_impl_data(impl_data, impl_ref)
+        if impl_language.lower() == 'quil':
+            circuit = implementation_handler.prepare_code_from_quil(impl_data)
+        else:
+            circuit = implementation_handler.prepare_code_from_data(impl_data, input_params)
+    return circuit
+
+
+def _execute_packed(job, circuit, backend, qpu_name, shots, noise_model, readout_noise_model):
+    """Pack the circuits of waiting jobs with the same qpu-name and shots onto the qubits not used by the circuit,
+    compile and execute them at once, and save the counts of every job. Return False if no circuits were packed."""
+    if not multiprogramming.is_packable(circuit) or _get_free_qubits(circuit, backend) <= 0:
+        return False
+    # waiting jobs are claimed from the lane of the job, thus, jobs of higher priority lanes are not delayed
+    queue = Queue(job.origin, connection=app.redis)
+    claimed_jobs = multiprogramming.claim_jobs(queue, qpu_name, shots, noise_model, claiming_job=job)
+    if not claimed_jobs:
+        return False
+
+    # every claimed job whose result has not been saved is put back into the queue, even if the packing is aborted,
+    # e.g., because of the timeout of the job
+    unfinished_jobs = list(claimed_jobs)
+    try:
+        return _pack_and_execute(job, circuit, claimed_jobs, unfinished_jobs, queue, backend, shots, noise_model,
+                                 readout_noise_model)
+    finally:
+        multiprogramming.release_jobs(queue, unfinished_jobs)
+        if unfinished_jobs:
+            job.meta['packed-job-ids'] = []
+            job.save_meta()
+
+
+def _get_free_qubits(circuit, backend) -> int:
+    # the QVM simulates all packed qubits at once, i.e., the cost grows with 2^width of the packed circuit, thus, the
+    # packed width is capped by MULTIPROGRAMMING_MAX_WIDTH instead of the size of the topology
+    max_width = min(len(backend.qubits()), app.config['MULTIPROGRAMMING_MAX_WIDTH'])
+    return max_width - len(multiprogramming.get_qubits(circuit))
+
+
+def _pack_and_execute(job, circuit, claimed_jobs, unfinished_jobs, queue, backend, shots, noise_model,
+                      readout_noise_model):
+    """Prepare the circuits of the claimed jobs and execute the packable ones together with the circuit of the job.
+    Jobs are removed from the unfinished jobs as soon as they are put back into the queue or their result is saved."""
+    free_qubits = _get_free_qubits(circuit, backend)
+    # the implementations of the claimed jobs are downloaded concurrently instead of one after another
+    prefetched_jobs = []
+    for claimed_job in claimed_jobs:
+        try:
+            implementation_handler.prefetch_code([claimed_job.kwargs['impl_url']], claimed_job.kwargs['bearer_token'])
+            prefetched_jobs.append(claimed_job)
+        except Exception:
+            logging.exception(f"Downloading the implementation of job {claimed_job.id} for packing failed")
+
+    packed_jobs, circuits = [job], [circuit]
+    for claimed_job in prefetched_jobs:
+        try:
+            kwargs = blob_store.resolve(claimed_job.kwargs)
+            claimed_circuit = _prepare_circuit(kwargs['impl_url'], kwargs['impl_data'], kwargs['impl_language'],
+                                               kwargs['input_params'], kwargs['bearer_token'], kwargs.get('impl_ref'))
+        except Exception:
+            # e.g., the bearer token of the job is not accepted, which is reported when the job is executed alone
+            logging.exception(f"Preparing the circuit of job {claimed_job.id} for packing failed")
+            claimed_circuit = None
+        width = len(multiprogramming.get_qubits(claimed_circuit)) if claimed_circuit else 0
+        if claimed_circuit and multiprogramming.is_packable(claimed_circuit) and width <= free_qubits:
+            free_qubits -= width
+            packed_jobs.append(claimed_job)
+            circuits.append(claimed_circuit)
+    if len(packed_jobs) == 1:
+        return False
+
+    # only the packed jobs stay claimed, thus, only they are put back into the queue if this job is cancelled
+    released_jobs = [claimed_job for claimed_job in claimed_jobs if claimed_job not in packed_jobs]
+    multiprogramming.release_jobs(queue, released_jobs)
+    for released_job in released_jobs:
+        unfinished_jobs.remove(released_job)
+    job.meta['packed-job-ids'] = [packed_job.id for packed_job in packed_jobs[1:]]
+    job.save_meta()
+
+    logging.info(f"Executing the circuits of {len(packed_jobs)} jobs packed onto disjoint qubits...")
+    try:
+        packed_circuit, registers = multiprogramming.pack(circuits, shots)
+        nq_program = forest_handler.quil_to_native_quil(packed_circuit, backend)
+        transpiled_circuit = forest_handler.native_quil_to_executable(nq_program, backend)
+        job_results = forest_handler.execute_packed_job(transpiled_circuit, backend, registers, readout_noise_model)
+    except Exception:
+        # the circuits are executed one by one instead
+        logging.exception('Executing the packed circuits failed')
+        return False
+
+    for packed_job, packed_circuit, job_result in zip(packed_jobs, circuits, job_results):
+        result = hot_store.get(Result, packed_job.id)
+        if not result.cancelled:
+            result.result = json_provider.dumps(job_result)
+            result.executable_key = _store_executable(packed_circuit, shots, backend)
+            result.noise_model = noise_model
+            result.complete = True
+            hot_store.save(result)
+        if packed_job is not job:
+            unfinished_jobs.remove(packed_job)
+            scheduling.dequeue(packed_job)
+            packed_job.delete(remove_from_queue=False)
+    return True
+
+
+def _store_executable(circuit, shots, backend):
+    """Compile the circuit of a packed job on its own, thus, its result can be extended like the result of an unpacked
+    execution. Return the key of the native Quil in the executable store or None if the circuit can not be compiled."""
+    program = circuit.copy()
+    program.wrap_in_numshots_loop(shots)
+    try:
+        forest_handler.quil_to_native_quil(program, backend)
+    except Exception:
+        logging.exception('Compiling a packed circuit on its own failed, its result can not be extended')
+        return None
+    return executable_store.program_key(program, backend.name)
+
+
+@tracing.traced_job
+@_leave_backlog
+@_resolve_references
+def simulate(impl_url, impl_data, impl_language, transpiled_quil, input_params, observables, probabilities,
+             bearer_token: str, impl_ref=None):
+    """Simulate the wavefunction of the circuit and save its exact probabilities and expectation values in db"""
+    job = get_current_job()
+    result = hot_store.get(Result, job.get_id())
+
+    logging.info('Preparing implementation...')
+    if transpiled_quil:
+        circuit = Program(transpiled_quil)
     else:
-        result = Result.query.get(job.get_id())
-        result.result = json.dumps({'error': 'execution failed'})
+        circuit = _prepare_circuit(impl_url, impl_data, impl_language, input_params, bearer_token, impl_ref)
+    if not circuit:
+        result.result = json_provider.dumps({'error': 'URL not found'})
         result.complete = True
-        db.session.commit()
+        hot_store.save(result)
+        return
+
+    logging.info('Start simulating...')
+    try:
+        parsed_observables = [expectation.parse_observable(observable) for observable in observables]
+        amplitudes = forest_handler.get_wavefunction(circuit)
+        simulation_result = {}
+        if probabilities:
+            simulation_result['probabilities'] = expectation.get_probabilities(amplitudes)
+        if parsed_observables:
+            simulation_result['expectation-values'] = dict(
+                zip(observables, expectation.expectation_values(amplitudes, parsed_observables)))
+        result.result = json_provider.dumps(simulation_result)
+    except ValueError as e:
+        result.result = json_provider.dumps({'error': str(e)})
+    except Exception:
+        logging.exception('Simulation failed')
+        result.result = json_provider.dumps({'error': 'simulation failed'})
+    result.complete = True
+    hot_store.save(result)
@@ -0,0 +1,116 @@
+def _encode(value) -> bytes:
+	return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakePipeline:
+	def __init__(self, redis):
+		self.redis = redis
+		self.commands = []
+
+	def __getattr__(self, name):
+		command = getattr(self.redis, name)
+		return lambda *args, **kwargs: self.commands.append(lambda: command(*args, **kwargs))
+
+	def execute(self):
+		return [command() for command in self.commands]
+
+
+class FakeRedis:
+	"""In-memory replacement of the Redis commands used by the service. Hash fields and set members are returned as
+	bytes like by Redis, strings are returned as they have been set. Expiry is ignored."""
+
+	def __init__(self):
+		self.values = {}
+		self.hashes = {}
+		self.sets = {}
+
+	def pipeline(self):
+		return FakePipeline(self)
+
+	def get(self, key):
+		return self.values.get(key)
+
+	def mget(self, keys):
+		return [self.values.get(key) for key in keys]
+
+	def set(self, key, value, ex=None, nx=False):
+		if nx and key in self.values:
+			return None
+		self.values[key] = value
+		return True
+
+	def append(self, key, value):
+		self.values[key] = self.values.get(key, b'') + value
+		return len(self.values[key])
+
+	def incrby(self, key, amount):
+		self.values[key] = int(self.values.get(key, 0)) + amount
+		return self.values[key]
+
+	def incrbyfloat(self, key, amount):
+		self.values[key] = float(self.values.get(key, 0)) + amount
+		return self.values[key]
+
+	def renamenx(self, source, destination):
+		if destination in self.values:
+			return False
+		self.values[destination] = self.values.pop(source)
+		return True
+
+	def exists(self, *keys):
+		return sum(key in self.values or key in self.hashes or key in self.sets for key in keys)
+
+	def expire(self, key, ttl):
+		return self.exists(key) == 1
+
+	def delete(self, *keys):
+		return sum(any(store.pop(key, None) is not None for store in (self.values, self.hashes, self.sets))
+				   for key in keys)
+
+	def hset(self, key, field=None, value=None, mapping=None):
+		fields = self.hashes.setdefault(key, {})
+		for name, field_value in (mapping or {field: value}).items():
+			fields[_encode(name)] = _encode(field_value)
+
+	def hsetnx(self, key, field, value):
+		fields = self.hashes.setdefault(key, {})
+		if _encode(field) in fields:
+			return 0
+		fields[_encode(field)] = _encode(value)
+		return 1
+
+	def hget(self, key, field):
+		return self.hashes.get(key, {}).get(_encode(field))
+
+	def hgetall(self, key):
+		return dict(self.hashes.get(key, {}))
+
+	def hdel(self, key, *fields):
+		return sum(self.hashes.get(key, {}).pop(_encode(field), None) is not None for field in fields)
+
+	def sadd(self, key, *values):
+		members = self.sets.setdefault(key, set())
+		added = {_encode(value) for value in values} - members
+		members.update(added)
+		return len(added)
+
+	def srem(self, key, *values):
+		members = self.sets.get(key, set())
+		removed = {_encode(value) for value in values} & members
+		members.difference_update(removed)
+		return len(removed)
+
+	def spop(self, key, count):
+		members = self.sets.get(key, set())
+		return [members.pop() for _ in range(min(count, len(members)))]
+
+	def scard(self, key):
+		return len(self.sets.get(key, set()))
+
+
+class FakeApp:
+	"""Replacement of the current_app of the modules using Redis, with the given config."""
+
+	def __init__(self, **config):
+		self.redis = FakeRedis()
+		self.config = config
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from app.adaptive_shots import get_batch_sizes, has_converged, merge_counts, parse_target_precision
+
+
+class TestAdaptiveShots(TestCase):
+	def test_batch_sizes_double_the_used_shots(self):
+		self.assertEqual(list(get_batch_sizes(256, 4096)), [256, 256, 512, 1024, 2048])
+		self.assertEqual(list(get_batch_sizes(256, 1000)), [256, 256, 488])
+		self.assertEqual(list(get_batch_sizes(256, 100)), [100])
+
+	def test_total_variation(self):
+		target_precision = parse_target_precision({'tolerance': 0.02})
+		self.assertTrue(has_converged({'00': 256}, target_precision))
+		self.assertFalse(has_converged({'00': 64, '01': 64, '10': 64, '11': 64}, target_precision))
+		self.assertTrue(has_converged({'00': 4096, '01': 4096, '10': 4096, '11': 4096}, target_precision))
+
+	def test_confidence_interval(self):
+		target_precision = parse_target_precision({'metric': 'confidence-interval', 'tolerance': 0.01, 'top-k': 2})
+		self.assertFalse(has_converged({'0': 512, '1': 512}, target_precision))
+		self.assertTrue(has_converged({'0': 8192, '1': 8192}, target_precision))
+
+	def test_invalid_target_precision(self):
+		with self.assertRaises(ValueError):
+			parse_target_precision({})
+		with self.assertRaises(ValueError):
+			parse_target_precision({'metric': 'kl-divergence', 'tolerance': 0.01})
+		with self.assertRaises(ValueError):
+			parse_target_precision({'tolerance': 2})
+
+	def test_merge_counts(self):
+		self.assertEqual(merge_counts({'00': 3, '11': 1}, {'11': 2, '01': 1}), {'00': 3, '11': 3, '01': 1})
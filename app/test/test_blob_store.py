@@ -0,0 +1,73 @@
+import hashlib
+import io
+from unittest import TestCase
+
+from app.blob_store import BlobTooLarge, CHUNK_SIZE, put_stream
+from app.test import FakeApp
+
+
+class TestPutStream(TestCase):
+	def setUp(self):
+		import app.blob_store
+		self.app = FakeApp(BLOB_STORE_TTL=60)
+		self._current_app = app.blob_store.current_app
+		app.blob_store.current_app = self.app
+
+	def tearDown(self):
+		import app.blob_store
+		app.blob_store.current_app = self._current_app
+
+	def test_content_is_stored_under_its_hash(self):
+		content = b'H 0\nMEASURE 0 ro[0]\n' * (CHUNK_SIZE // 10)
+		key, size = put_stream(io.BytesIO(content), 10 * len(content))
+		self.assertEqual(key, hashlib.sha256(content).hexdigest())
+		self.assertEqual(size, len(content))
+		self.assertEqual(self.app.redis.values, {f"forest-service:blobs:{key}": content})
+
+	def test_identical_content_is_stored_once(self):
+		first, _ = put_stream(io.BytesIO(b'X 0'), 100)
+		second, _ = put_stream(io.BytesIO(b'X 0'), 100)
+		self.assertEqual(first, second)
+		self.assertEqual(len(self.app.redis.values), 1)
+
+	def test_too_large_content_is_discarded(self):
+		with self.assertRaises(BlobTooLarge):
+			put_stream(io.BytesIO(b'0' * (CHUNK_SIZE + 1)), CHUNK_SIZE)
+		self.assertEqual(self.app.redis.values, {})
+
+
+class TestByReference(TestCase):
+	def setUp(self):
+		import app.blob_store
+		self.app = FakeApp(BLOB_STORE_TTL=60)
+		self.app.config['BLOB_STORE_INLINE_MAX'] = 100
+		self._current_app = app.blob_store.current_app
+		app.blob_store.current_app = self.app
+
+	def tearDown(self):
+		import app.blob_store
+		app.blob_store.current_app = self._current_app
+
+	def test_large_arguments_are_passed_by_reference(self):
+		from app.blob_store import BlobRef, by_reference, resolve
+
+		transpiled_quil = 'H 0\n' * 1000
+		kwargs = by_reference({'transpiled_quil': transpiled_quil, 'input_params': {'a': 1}, 'token': 'x' * 1000})
+		self.assertIsInstance(kwargs['transpiled_quil'], BlobRef)
+		self.assertEqual(kwargs['input_params'], {'a': 1})
+		self.assertEqual(kwargs['token'], 'x' * 1000)
+		self.assertEqual(resolve(kwargs)['transpiled_quil'], transpiled_quil)
+
+	def test_identical_arguments_are_stored_once(self):
+		from app.blob_store import by_reference
+
+		first = by_reference({'impl_data': 'X 0\n' * 1000})
+		second = by_reference({'impl_data': 'X 0\n' * 1000})
+		self.assertEqual(first, second)
+		self.assertEqual(len(self.app.redis.values), 1)
+
+	def test_expired_reference_raises(self):
+		from app.blob_store import BlobRef, resolve
+
+		with self.assertRaises(ValueError):
+			resolve({'impl_data': BlobRef('0' * 64)})
@@ -0,0 +1,31 @@
+import socket
+from unittest import TestCase
+
+from pyquil.api._abstract_compiler import QuilcNotRunning
+from rq.timeouts import JobTimeoutException
+
+from app.endpoint_pool import is_endpoint_error
+
+
+class TestEndpointErrors(TestCase):
+	def test_connection_errors(self):
+		self.assertTrue(is_endpoint_error(ConnectionRefusedError()))
+		self.assertTrue(is_endpoint_error(socket.timeout()))
+		self.assertTrue(is_endpoint_error(QuilcNotRunning('Request to quilc timed out.')))
+
+	def test_wrapped_connection_error(self):
+		try:
+			try:
+				raise ConnectionResetError()
+			except ConnectionResetError as e:
+				raise RuntimeError('compilation failed') from e
+		except RuntimeError as e:
+			self.assertTrue(is_endpoint_error(e))
+
+	def test_program_errors(self):
+		self.assertFalse(is_endpoint_error(RuntimeError('Unknown gate FOO')))
+		self.assertFalse(is_endpoint_error(RuntimeError('qubit 3 is not connected to qubit 5')))
+		self.assertFalse(is_endpoint_error(ValueError('too many qubits')))
+
+	def test_job_timeout(self):
+		self.assertFalse(is_endpoint_error(JobTimeoutException('Task exceeded maximum timeout value (180 seconds)')))
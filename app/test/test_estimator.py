@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+import networkx as nx
+from pyquil import Program
+from pyquil.gates import MEASURE, H, CNOT
+
+from app.estimator import estimate_circuit_metrics
+
+
+def estimate(circuit: Program, topology: nx.Graph):
+	return estimate_circuit_metrics(circuit, topology, dict(nx.all_pairs_shortest_path(topology)))
+
+
+def chain() -> Program:
+	p = Program()
+	ro = p.declare('ro', 'BIT', 3)
+	p += H(0)
+	p += CNOT(0, 1)
+	p += CNOT(1, 2)
+
+	for i in range(ro.declared_size):
+		p += MEASURE(i, ro[i])
+
+	return p
+
+
+def triangle() -> Program:
+	p = Program()
+	p += CNOT(0, 1)
+	p += CNOT(1, 2)
+	p += CNOT(2, 0)
+	return p
+
+
+class TestEstimatedMetrics(TestCase):
+	def test_chain_on_line_requires_no_swaps(self):
+		metrics = estimate(chain(), nx.path_graph(5))
+		self.assertEqual(metrics['number-of-swaps'], 0)
+		self.assertEqual(metrics['width'], 3)
+		self.assertEqual(metrics['number-of-multi-qubit-gates'], 2)
+		self.assertEqual(metrics['number-of-single-qubit-gates'], 3 + 2 * 4)
+		self.assertEqual(metrics['number-of-measurement-operations'], 3)
+
+	def test_triangle_on_line_requires_swap(self):
+		metrics = estimate(triangle(), nx.path_graph(5))
+		self.assertEqual(metrics['number-of-swaps'], 1)
+		self.assertEqual(metrics['number-of-multi-qubit-gates'], 3 + 3)
+
+	def test_triangle_on_ring_requires_no_swaps(self):
+		metrics = estimate(triangle(), nx.cycle_graph(3))
+		self.assertEqual(metrics['number-of-swaps'], 0)
+
+	def test_too_many_qubits(self):
+		with self.assertRaises(ValueError):
+			estimate(chain(), nx.path_graph(2))
@@ -0,0 +1,67 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from pyquil import Program
+
+from app import executable_store
+from app.test import FakeApp
+
+
+def _program(qubit):
+	return Program(f"DECLARE ro BIT[1]\nRX(pi/2) {qubit}\nMEASURE {qubit} ro[0]\n")
+
+
+class TestExecutableStore(TestCase):
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+		self.app = FakeApp(EXECUTABLE_STORE_PATH=self.directory.name, EXECUTABLE_STORE_MAX_SIZE=10 ** 6)
+		self._current_app = executable_store.current_app
+		executable_store.current_app = self.app
+
+	def tearDown(self):
+		executable_store.current_app = self._current_app
+		self.directory.cleanup()
+
+	def _store(self, qubit, mtime=None):
+		key = executable_store.program_key(_program(qubit), 'Aspen-M-3')
+		executable_store.save(key, _program(qubit))
+		if mtime is not None:
+			os.utime(executable_store._path(key), (mtime, mtime))
+		return key
+
+	def test_saved_program_is_loaded(self):
+		key = self._store(0)
+		self.assertTrue(executable_store.contains(key))
+		self.assertEqual(executable_store.load(key).out(), _program(0).out())
+
+	def test_missing_program_is_not_loaded(self):
+		self.assertIsNone(executable_store.load('0' * 64))
+
+	def test_size_of_the_store_is_tracked(self):
+		first = self._store(0)
+		second = self._store(1)
+		self.assertEqual(self.app.redis.values[executable_store._size_key],
+						 sum(os.path.getsize(executable_store._path(key)) for key in (first, second)))
+
+	def test_least_recently_used_program_is_evicted(self):
+		first = self._store(0, mtime=1)
+		second = self._store(1, mtime=2)
+		self.app.config['EXECUTABLE_STORE_MAX_SIZE'] = int(os.path.getsize(executable_store._path(first)) * 2.5)
+		third = self._store(2)
+		self.assertFalse(executable_store.contains(first))
+		self.assertTrue(executable_store.contains(second))
+		self.assertTrue(executable_store.contains(third))
+
+	def test_temporary_files_of_other_workers_are_kept(self):
+		key = self._store(0)
+		directory = os.path.dirname(executable_store._path(key))
+		_, written = tempfile.mkstemp(dir=directory, suffix='.tmp')
+		_, abandoned = tempfile.mkstemp(dir=directory, suffix='.tmp')
+		os.utime(abandoned, (1, 1))
+
+		self.app.config['EXECUTABLE_STORE_MAX_SIZE'] = 1
+		executable_store._evict()
+		self.assertTrue(os.path.exists(written))
+		self.assertFalse(os.path.exists(abandoned))
+		self.assertFalse(executable_store.contains(key))
@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+import numpy as np
+
+from app.expectation import expectation_values, get_probabilities, parse_observable
+
+
+class TestParseObservable(TestCase):
+	def test_terms(self):
+		terms = parse_observable('0.5*Z0*Z1 - X2 + 1.5')
+		self.assertEqual(terms, [(0.5, {0: 'Z', 1: 'Z'}), (-1.0, {2: 'X'}), (1.5, {})])
+
+	def test_exponents_and_concatenated_operators(self):
+		terms = parse_observable('1e-3*Y0Z1-2.5e+2*X1*I3')
+		self.assertEqual(terms, [(1e-3, {0: 'Y', 1: 'Z'}), (-250.0, {1: 'X'})])
+
+	def test_invalid_observable(self):
+		with self.assertRaises(ValueError):
+			parse_observable('Z0*W1')
+		with self.assertRaises(ValueError):
+			parse_observable('Z0*Z0')
+
+
+class TestExpectationValues(TestCase):
+	def test_bell_state(self):
+		bell = np.array([1, 0, 0, 1]) / np.sqrt(2)
+		observables = [parse_observable(observable) for observable in ('Z0*Z1', 'X0*X1', 'Y0*Y1', 'Z0', '2 - Z0*Z1')]
+		np.testing.assert_allclose(expectation_values(bell, observables), [1, 1, -1, 0, 1], atol=1e-12)
+
+	def test_y_eigenstate(self):
+		plus_i = np.array([1, 1j]) / np.sqrt(2)
+		np.testing.assert_allclose(expectation_values(plus_i, [parse_observable('Y0')]), [1], atol=1e-12)
+
+	def test_qubit_order(self):
+		# qubit 0 in |1>, qubit 1 in |0>
+		amplitudes = np.array([0, 1, 0, 0])
+		observables = [parse_observable('Z0'), parse_observable('Z1')]
+		np.testing.assert_allclose(expectation_values(amplitudes, observables), [-1, 1])
+		self.assertEqual(get_probabilities(amplitudes), {'01': 1.0})
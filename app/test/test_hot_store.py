@@ -0,0 +1,69 @@
+from datetime import datetime
+from unittest import TestCase
+
+from app import json_provider
+from app.hot_store import _from_hash, _to_dict, _to_object
+from app.result_model import Result
+from app.test import FakeApp
+
+
+def _to_hash(row):
+	return {name.encode(): json_provider.dumps(value).encode() for name, value in row.items()}
+
+
+class TestHotStoreSerialization(TestCase):
+	def test_round_trip_keeps_completed_at(self):
+		completed_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+		result = Result(id='a', result='{"00": 10}', backend='qvm', shots=10, cancelled=False)
+		result.complete = True
+		result.completed_at = completed_at
+
+		restored = _to_object(Result, _from_hash(Result, _to_hash(_to_dict(result))))
+		self.assertEqual(restored.id, 'a')
+		self.assertEqual(restored.result, '{"00": 10}')
+		self.assertTrue(restored.complete)
+		self.assertEqual(restored.completed_at, completed_at)
+
+	def test_incomplete_row_has_no_completed_at(self):
+		result = Result(id='b', complete=False)
+		row = _from_hash(Result, _to_hash(_to_dict(result)))
+		self.assertIsNone(row['completed_at'])
+		self.assertFalse(_to_object(Result, row).complete)
+
+
+class TestHotStoreSave(TestCase):
+	def setUp(self):
+		import app.hot_store
+		self.app = FakeApp(HOT_STORE_TTL=60)
+		self._current_app = app.hot_store.current_app
+		app.hot_store.current_app = self.app
+
+	def tearDown(self):
+		import app.hot_store
+		app.hot_store.current_app = self._current_app
+
+	def test_new_row_is_saved_completely(self):
+		from app.hot_store import get, save
+
+		save(Result(id='a', backend='qvm', shots=10, complete=False, cancelled=False))
+		result = get(Result, 'a')
+		self.assertEqual(result.backend, 'qvm')
+		self.assertEqual(result.shots, 10)
+		self.assertFalse(result.complete)
+		self.assertEqual(self.app.redis.sets['forest-service:hot:result:dirty'], {b'a'})
+
+	def test_concurrent_saves_keep_the_cancellation(self):
+		from app.hot_store import get, save
+
+		save(Result(id='a', backend='qvm', shots=10, complete=False, cancelled=False))
+		cancelled_by_api = get(Result, 'a')
+		executed_by_worker = get(Result, 'a')
+
+		cancelled_by_api.cancelled = True
+		save(cancelled_by_api)
+		executed_by_worker.result = '{"00": 10}'
+		save(executed_by_worker)
+
+		result = get(Result, 'a')
+		self.assertTrue(result.cancelled)
+		self.assertEqual(result.result, '{"00": 10}')
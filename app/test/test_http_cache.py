@@ -0,0 +1,19 @@
+from unittest import TestCase
+
+from app.http_cache import row_etag
+from app.result_model import Result
+
+
+class TestRowEtag(TestCase):
+	def test_etag_is_stable_for_unchanged_rows(self):
+		first = Result(id='a', result='{"00": 10}', complete=True, shots=10)
+		second = Result(id='a', result='{"00": 10}', complete=True, shots=10)
+		second.completed_at = first.completed_at
+		self.assertEqual(row_etag(first), row_etag(second))
+
+	def test_etag_changes_with_the_stored_content(self):
+		result = Result(id='a', result='{"00": 10}', complete=True, shots=10)
+		etag = row_etag(result)
+		result.result = '{"00": 20}'
+		result.shots = 20
+		self.assertNotEqual(row_etag(result), etag)
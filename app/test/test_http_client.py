@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+import urllib3
+
+from app.http_client import DownloadError, _get
+
+
+class _Response:
+	def __init__(self, status, data=b''):
+		self.status = status
+		self.data = data
+
+
+class _Pool:
+	def __init__(self, response=None, exception=None):
+		self.response = response
+		self.exception = exception
+		self.requests = []
+
+	def request(self, method, url, headers=None, **options):
+		self.requests.append((method, url, headers))
+		if self.exception:
+			raise self.exception
+		return self.response
+
+
+class TestGet(TestCase):
+	def test_returns_decoded_text(self):
+		pool = _Pool(_Response(200, 'DECLARE ro BIT[1]'.encode()))
+		self.assertEqual(_get(pool, 'https://example.org/p.quil', {'Authorization': 'Bearer x'}, {}),
+						 'DECLARE ro BIT[1]')
+		self.assertEqual(pool.requests, [('GET', 'https://example.org/p.quil', {'Authorization': 'Bearer x'})])
+
+	def test_error_status_raises_with_status(self):
+		with self.assertRaises(DownloadError) as context:
+			_get(_Pool(_Response(401)), 'https://example.org/p.quil', {}, {})
+		self.assertEqual(context.exception.status, 401)
+
+	def test_connection_error_raises_without_status(self):
+		pool = _Pool(exception=urllib3.exceptions.MaxRetryError(None, 'https://example.org/p.quil'))
+		with self.assertRaises(DownloadError) as context:
+			_get(pool, 'https://example.org/p.quil', {}, {})
+		self.assertIsNone(context.exception.status)
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from rq.exceptions import InvalidJobOperation
+from rq.job import JobStatus
+
+from app import jobs
+from app.jobs import get_timeout
+
+
+class TestTimeout(TestCase):
+	def test_timeout_hint_is_capped(self):
+		self.assertEqual(get_timeout(60, 3600), 60)
+		self.assertEqual(get_timeout('120', 3600), 120)
+		self.assertEqual(get_timeout(100000, 3600), 3600)
+
+	def test_missing_or_invalid_hint(self):
+		self.assertEqual(get_timeout(None, 3600), 3600)
+		self.assertEqual(get_timeout('soon', 3600), 3600)
+		self.assertEqual(get_timeout(-1, 3600), 3600)
+
+
+class _Job:
+	def __init__(self, id, status, meta=None):
+		self.id = id
+		self.origin = 'forest-service_execute'
+		self.status = status
+		self.meta = meta or {}
+		self.cancelled = False
+
+	def get_status(self):
+		return self.status
+
+	def cancel(self):
+		self.cancelled = True
+
+
+class _Queue:
+	enqueued = []
+
+	def __init__(self, name, connection=None):
+		self.name = name
+
+	def enqueue_job(self, job, at_front=False):
+		_Queue.enqueued.append((self.name, job.id, at_front))
+
+
+class TestCancel(TestCase):
+	def setUp(self):
+		self.jobs = {}
+		_Queue.enqueued = []
+		self.patches = [patch.object(jobs, 'current_app', SimpleNamespace(redis=None)),
+						patch.object(jobs, '_fetch', side_effect=self.jobs.get),
+						patch.object(jobs, 'Queue', _Queue),
+						patch.object(jobs.scheduling, 'dequeue'),
+						patch.object(jobs, 'send_stop_job_command')]
+		for started_patch in self.patches:
+			started_patch.start()
+
+	def tearDown(self):
+		for started_patch in self.patches:
+			started_patch.stop()
+
+	def test_unknown_job(self):
+		self.assertFalse(jobs.cancel('unknown'))
+
+	def test_queued_job_is_removed_from_the_queue(self):
+		self.jobs['a'] = _Job('a', JobStatus.QUEUED)
+		self.assertTrue(jobs.cancel('a'))
+		self.assertTrue(self.jobs['a'].cancelled)
+		jobs.scheduling.dequeue.assert_called_once_with(self.jobs['a'])
+		jobs.send_stop_job_command.assert_not_called()
+
+	def test_started_job_is_stopped(self):
+		self.jobs['a'] = _Job('a', JobStatus.STARTED)
+		self.assertTrue(jobs.cancel('a'))
+		self.assertFalse(self.jobs['a'].cancelled)
+		jobs.send_stop_job_command.assert_called_once_with(None, 'a')
+
+	def test_finished_job_is_not_stopped(self):
+		jobs.send_stop_job_command.side_effect = InvalidJobOperation()
+		self.jobs['a'] = _Job('a', JobStatus.STARTED)
+		self.assertTrue(jobs.cancel('a'))
+
+	def test_incomplete_packed_jobs_are_released(self):
+		self.jobs['a'] = _Job('a', JobStatus.STARTED, meta={'packed-job-ids': ['b', 'c', 'd']})
+		self.jobs['b'] = _Job('b', JobStatus.QUEUED)
+		self.jobs['c'] = _Job('c', JobStatus.QUEUED)
+		results = {'b': SimpleNamespace(complete=False), 'c': SimpleNamespace(complete=True)}
+		with patch('app.hot_store.get', side_effect=lambda model, id: results.get(id)):
+			self.assertTrue(jobs.cancel('a'))
+		self.assertEqual(_Queue.enqueued, [('forest-service_execute', 'b', True)])
@@ -4,6 +4,7 @@ from pyquil import Program
 from pyquil.gates import MEASURE, H, CNOT
 
 from app.analysis import get_non_transpiled_circuit_metrics
+from app.quil_analysis import get_quil_metrics, parse_quil
 
 
 def circuit1() -> Program:
@@ -92,3 +93,12 @@ class TestNonTranspiledMetrics(TestCase):
 				'original-number-of-single-qubit-gates': 3,
 			}
 		)
+
+
+class TestQuilMetrics(TestCase):
+	def test_quil_metrics_match_non_transpiled_metrics(self):
+		for circuit in [circuit1(), circuit2(), circuit3()]:
+			self.assertDictEqual(
+				get_quil_metrics(parse_quil(circuit.out())),
+				get_non_transpiled_circuit_metrics(circuit)
+			)
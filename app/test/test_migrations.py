@@ -0,0 +1,60 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import sqlalchemy as sa
+from flask_migrate import downgrade, upgrade
+
+from app import create_app, db
+from app.config import Config
+
+_migrations = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'migrations')
+
+
+class TestMigrations(TestCase):
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+
+		class _TestConfig(Config):
+			SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(self.directory.name, 'app.db')
+
+		self.app = create_app(_TestConfig)
+		self.context = self.app.app_context()
+		self.context.push()
+		upgrade(directory=_migrations)
+
+	def tearDown(self):
+		db.engine.dispose()
+		self.context.pop()
+		self.directory.cleanup()
+
+	def test_schema_matches_the_models(self):
+		inspector = sa.inspect(db.engine)
+		for table in db.metadata.sorted_tables:
+			columns = {column['name'] for column in inspector.get_columns(table.name)}
+			self.assertEqual(columns, {column.name for column in table.columns}, table.name)
+			indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+			self.assertTrue({index.name for index in table.indexes} <= indexes, table.name)
+
+	def test_generated_circuits_are_completed_at_their_creation(self):
+		downgrade(directory=_migrations, revision='d2e8f4a61b39')
+		with db.engine.begin() as connection:
+			connection.exec_driver_sql("INSERT INTO generated__circuit (id, complete, created_at) "
+									   "VALUES ('a', 1, '2024-01-01 00:00:00.000000'), ('b', 0, '2024-01-01 00:00:00.000000')")
+		upgrade(directory=_migrations)
+
+		with db.engine.connect() as connection:
+			rows = connection.exec_driver_sql("SELECT id, completed_at FROM generated__circuit ORDER BY id").all()
+		self.assertEqual([tuple(row) for row in rows], [('a', '2024-01-01 00:00:00.000000'), ('b', None)])
+
+	def test_completed_results_are_completed_at_their_creation(self):
+		downgrade(directory=_migrations, revision='c7b0e93f1a58')
+		with db.engine.begin() as connection:
+			connection.exec_driver_sql("INSERT INTO result (id, complete) VALUES ('a', 1), ('b', 0)")
+		upgrade(directory=_migrations)
+
+		with db.engine.connect() as connection:
+			rows = connection.exec_driver_sql("SELECT id, completed_at, created_at FROM result ORDER BY id").all()
+		self.assertIsNotNone(rows[0].completed_at)
+		self.assertEqual(rows[0].completed_at, rows[0].created_at)
+		self.assertIsNone(rows[1].completed_at)
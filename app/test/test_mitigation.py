@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+import numpy as np
+
+from app.mitigation import mitigate_counts
+from app.noise_model import ReadoutNoiseModel
+
+
+class TestReadoutErrorMitigation(TestCase):
+	def test_perfect_calibration(self):
+		counts = {'00': 600, '11': 424}
+		mitigated = mitigate_counts(counts, ReadoutNoiseModel(p00=1.0, p11=1.0), [0, 1])
+		self.assertEqual(mitigated.keys(), counts.keys())
+		for bitstring, count in counts.items():
+			self.assertAlmostEqual(mitigated[bitstring], count)
+
+	def test_inverts_tensor_product_noise(self):
+		calibration = ReadoutNoiseModel(p00=1.0, p11=1.0, qubits={0: [0.9, 0.8], 1: [0.95, 0.85]})
+		ideal = np.zeros(4)
+		ideal[0b01] = 1000
+
+		# apply the assignment matrices of both qubits, the first readout column is the last bit
+		noisy = np.kron(calibration.assignment_matrix(1), calibration.assignment_matrix(0)) @ ideal
+		counts = {np.binary_repr(i, width=2): count for i, count in enumerate(noisy)}
+
+		mitigated = mitigate_counts(counts, calibration, [0, 1])
+		self.assertAlmostEqual(mitigated['01'], 1000)
+		for bitstring in ['00', '10', '11']:
+			self.assertAlmostEqual(mitigated.get(bitstring, 0), 0)
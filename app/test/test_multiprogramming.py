@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from pyquil import Program
+from pyquil.gates import CNOT, H, MEASURE, X
+from pyquil.quilbase import Gate, Measurement
+
+from app.multiprogramming import get_qubits, is_candidate, is_packable, pack
+
+
+def bell_circuit(first_qubit, second_qubit):
+	circuit = Program()
+	ro = circuit.declare('ro', 'BIT', 2)
+	circuit += H(first_qubit)
+	circuit += CNOT(first_qubit, second_qubit)
+	circuit += MEASURE(first_qubit, ro[0])
+	circuit += MEASURE(second_qubit, ro[1])
+	return circuit
+
+
+class TestMultiprogramming(TestCase):
+	def test_pack_on_disjoint_qubits(self):
+		packed, registers = pack([bell_circuit(0, 1), bell_circuit(5, 3)], 100)
+		self.assertEqual(registers, ['ro0', 'ro1'])
+		self.assertEqual(get_qubits(packed), [0, 1, 2, 3])
+		self.assertEqual(packed.num_shots, 100)
+
+		gates = [(instruction.name, [qubit.index for qubit in instruction.qubits])
+				 for instruction in packed.instructions if isinstance(instruction, Gate)]
+		self.assertEqual(gates, [('H', [0]), ('CNOT', [0, 1]), ('H', [3]), ('CNOT', [3, 2])])
+
+		measurements = [(instruction.qubit.index, instruction.classical_reg.name, instruction.classical_reg.offset)
+						for instruction in packed.instructions if isinstance(instruction, Measurement)]
+		self.assertEqual(measurements, [(0, 'ro0', 0), (1, 'ro0', 1), (3, 'ro1', 0), (2, 'ro1', 1)])
+
+	def test_is_packable(self):
+		self.assertTrue(is_packable(bell_circuit(0, 1)))
+
+		circuit = bell_circuit(0, 1)
+		circuit += X(0).dagger()
+		self.assertFalse(is_packable(circuit))
+
+		circuit = bell_circuit(0, 1)
+		circuit.declare('theta', 'REAL')
+		self.assertFalse(is_packable(circuit))
+
+	def test_is_candidate(self):
+		self.assertTrue(is_candidate(qpu_name='Aspen-M-3', shots=1024))
+		self.assertFalse(is_candidate(transpiled_quil='H 0'))
+		self.assertFalse(is_candidate(correlation_id='id'))
+		self.assertFalse(is_candidate(seed=42))
@@ -0,0 +1,41 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from app import noise_model
+from app.noise_model import ReadoutNoiseModel
+from app.test import FakeApp
+
+
+class TestReadoutNoiseModel(TestCase):
+	def test_perfect_readout(self):
+		bitstrings = np.array([[0, 1], [1, 0], [1, 1]], dtype=np.uint8)
+		noisy = ReadoutNoiseModel(p00=1.0, p11=1.0).apply(bitstrings, [0, 1])
+		np.testing.assert_array_equal(noisy, bitstrings)
+
+	def test_always_flipping_readout(self):
+		bitstrings = np.array([[0, 1], [1, 0]], dtype=np.uint8)
+		noisy = ReadoutNoiseModel(p00=0.0, p11=0.0).apply(bitstrings, [0, 1])
+		np.testing.assert_array_equal(noisy, 1 - bitstrings)
+
+	def test_per_qubit_fidelities(self):
+		bitstrings = np.zeros((1000, 2), dtype=np.uint8)
+		noise_model = ReadoutNoiseModel(p00=1.0, p11=1.0, qubits={'5': [0.0, 1.0]})
+		noisy = noise_model.apply(bitstrings, [5, 0], rng=np.random.default_rng(42))
+		np.testing.assert_array_equal(noisy[:, 0], 1)
+		np.testing.assert_array_equal(noisy[:, 1], 0)
+
+	def test_assignment_matrix(self):
+		noise_model = ReadoutNoiseModel(p00=0.9, p11=0.8)
+		np.testing.assert_allclose(noise_model.assignment_matrix(0), [[0.9, 0.2], [0.1, 0.8]])
+
+
+class TestPreload(TestCase):
+	def test_configured_noise_models_are_cached(self):
+		app = FakeApp(READOUT_NOISE_MODELS='{"Aspen-M-3": {"p00": 0.9, "p11": 0.8}}', READOUT_FIDELITY=0.97)
+		with patch.object(noise_model, 'current_app', app), patch.dict(noise_model._noise_models, clear=True):
+			noise_model.preload_noise_models()
+			self.assertEqual(list(noise_model._noise_models), ['Aspen-M-3'])
+			self.assertEqual(noise_model._noise_models['Aspen-M-3'].fidelities(0), (0.9, 0.8))
+
@@ -0,0 +1,79 @@
+from datetime import datetime
+from unittest import TestCase
+
+from app import create_app, db, hot_store, retention
+from app.config import Config
+from app.generated_circuit_model import Generated_Circuit
+from app.result_model import Result
+from app.test import FakeRedis
+
+
+class _TestConfig(Config):
+	SQLALCHEMY_DATABASE_URI = 'sqlite://'
+	TESTING = True
+
+
+class TestPurge(TestCase):
+	def setUp(self):
+		self.app = create_app(_TestConfig)
+		self.app.redis = FakeRedis()
+		self.context = self.app.app_context()
+		self.context.push()
+		db.create_all()
+
+	def tearDown(self):
+		db.session.remove()
+		db.drop_all()
+		self.context.pop()
+
+	def add(self, model, id, completed_at=None, **kwargs):
+		row = model(id=id, created_at=datetime(2024, 1, 1), **kwargs)
+		if completed_at:
+			row.complete = True
+			row.completed_at = completed_at
+		db.session.add(row)
+		db.session.commit()
+
+	def ids(self, model):
+		return sorted(db.session.scalars(db.select(model.id)).all())
+
+	def test_results_completed_before_the_cutoff_are_purged(self):
+		self.add(Result, 'expired', completed_at=datetime(2024, 1, 2))
+		self.add(Result, 'recent', completed_at=datetime(2024, 3, 1))
+		self.add(Result, 'running')
+		for id in ('expired', 'recent'):
+			self.app.redis.hset(hot_store._key(Result, id), 'id', f'"{id}"')
+
+		self.assertEqual(retention.purge_results(datetime(2024, 2, 1), 100), 1)
+		self.assertEqual(self.ids(Result), ['recent', 'running'])
+		self.assertFalse(self.app.redis.exists(hot_store._key(Result, 'expired')))
+		self.assertTrue(self.app.redis.exists(hot_store._key(Result, 'recent')))
+
+	def test_generated_circuits_are_purged_by_their_completion(self):
+		self.add(Generated_Circuit, 'expired', completed_at=datetime(2024, 1, 2))
+		self.add(Generated_Circuit, 'recent', completed_at=datetime(2024, 3, 1))
+		self.add(Generated_Circuit, 'running')
+		self.add(Generated_Circuit, 'referenced', completed_at=datetime(2024, 1, 2))
+		self.add(Result, 'result', completed_at=datetime(2024, 3, 1), generated_circuit_id='referenced')
+
+		self.assertEqual(retention.purge_generated_circuits(datetime(2024, 2, 1), 100), 1)
+		self.assertEqual(self.ids(Generated_Circuit), ['recent', 'referenced', 'running'])
+
+	def test_rows_are_purged_in_batches(self):
+		for index in range(5):
+			self.add(Result, f"expired-{index}", completed_at=datetime(2024, 1, 2))
+
+		self.assertEqual(retention.purge_results(datetime(2024, 2, 1), 2), 2)
+		self.assertEqual(len(self.ids(Result)), 3)
+		while retention.purge_results(datetime(2024, 2, 1), 2):
+			pass
+		self.assertEqual(self.ids(Result), [])
+
+	def test_purge_uses_the_retention_days(self):
+		self.add(Result, 'expired', completed_at=datetime(2024, 1, 2))
+		self.add(Generated_Circuit, 'expired', completed_at=datetime(2024, 1, 2))
+		self.add(Result, 'recent', completed_at=datetime.utcnow())
+
+		self.assertEqual(retention.purge(30, 100), 2)
+		self.assertEqual(self.ids(Result), ['recent'])
+		self.assertEqual(self.ids(Generated_Circuit), [])
@@ -0,0 +1,249 @@
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+from app import create_app, db, hot_store, jobs, scheduling
+from app.config import Config
+from app.generated_circuit_model import Generated_Circuit
+from app.result_model import Result
+from app.test import FakeRedis
+
+
+class _TestConfig(Config):
+	SQLALCHEMY_DATABASE_URI = 'sqlite://'
+	TESTING = True
+
+
+class RouteTestCase(TestCase):
+	def setUp(self):
+		self.app = create_app(_TestConfig)
+		self.app.redis = FakeRedis()
+		self.context = self.app.app_context()
+		self.context.push()
+		db.create_all()
+		self.client = self.app.test_client()
+
+	def tearDown(self):
+		db.session.remove()
+		db.drop_all()
+		self.context.pop()
+
+	def add_result(self, id, created_at, completed_at=None, **kwargs):
+		result = Result(id=id, backend='Aspen-M-3', shots=10, result='{"00": 10}', **kwargs)
+		result.created_at = created_at
+		if completed_at:
+			result.complete = True
+			result.completed_at = completed_at
+		db.session.add(result)
+		db.session.commit()
+		return result
+
+
+class TestExecute(RouteTestCase):
+	def test_execution_exceeding_the_backlog_is_rejected(self):
+		request = {'qpu-name': 'Aspen-M-3', 'token': '', 'impl-url': 'http://impl', 'impl-language': 'pyquil',
+				   'input-params': {}}
+		with patch.object(scheduling, 'get_backlog', return_value=1e14), patch.object(scheduling, 'enqueue') as enqueue:
+			response = self.client.post('/forest-service/api/v1.0/execute', json=request)
+		self.assertEqual(response.status_code, 429)
+		self.assertEqual(response.json['statusCode'], '429')
+		self.assertGreater(int(response.headers['Retry-After']), 0)
+		enqueue.assert_not_called()
+
+
+class TestBulkResults(RouteTestCase):
+	def setUp(self):
+		super().setUp()
+		self.add_result('a', datetime(2024, 5, 1, 9), completed_at=datetime(2024, 5, 1, 10))
+		self.add_result('b', datetime(2024, 5, 1, 9), completed_at=datetime(2024, 5, 1, 11))
+		self.add_result('c', datetime(2024, 5, 1, 9))
+
+	def get_results(self, **request):
+		return self.client.post('/forest-service/api/v1.0/results/bulk', json=request)
+
+	def test_unknown_ids(self):
+		response = self.get_results(ids=['a', 'x', 'c', 'a'])
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual([result['id'] for result in response.json['results']], ['a', 'c'])
+		self.assertEqual(response.json['unknown-ids'], ['x'])
+		self.assertEqual(response.json['cursor'], '2024-05-01T10:00:00')
+
+	def test_results_completed_after_the_cursor(self):
+		response = self.get_results(ids=['a', 'b', 'c'], cursor='2024-05-01T10:30:00', **{'include-results': True})
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual([result['id'] for result in response.json['results']], ['b'])
+		self.assertEqual(response.json['results'][0]['result'], {'00': 10})
+		self.assertEqual(response.json['cursor'], '2024-05-01T11:00:00')
+		self.assertNotIn('unknown-ids', response.json)
+
+	def test_cursor_with_offset_is_converted_to_utc(self):
+		response = self.get_results(ids=['a', 'b', 'c'], cursor='2024-05-01T12:30:00+02:00')
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual([result['id'] for result in response.json['results']], ['b'])
+
+	def test_invalid_cursor(self):
+		self.assertEqual(self.get_results(ids=['a'], cursor='yesterday').status_code, 400)
+		self.assertEqual(self.get_results(ids=['a'], cursor=42).status_code, 400)
+
+
+class TestListResults(RouteTestCase):
+	def setUp(self):
+		super().setUp()
+		for id, hour in (('a', 9), ('b', 10), ('c', 10), ('d', 11), ('e', 12)):
+			self.add_result(id, datetime(2024, 5, 1, hour))
+
+	def list_results(self, **query_string):
+		return self.client.get('/forest-service/api/v1.0/results', query_string=query_string)
+
+	def test_pages_are_selected_by_the_cursor(self):
+		ids, cursors = [], []
+		response = self.list_results(limit=2)
+		while True:
+			self.assertEqual(response.status_code, 200)
+			ids += [result['id'] for result in response.json['results']]
+			cursors.append(response.json['cursor'])
+			if not response.json['cursor']:
+				break
+			response = self.list_results(limit=2, cursor=response.json['cursor'])
+		self.assertEqual(ids, ['e', 'd', 'c', 'b', 'a'])
+		self.assertEqual(cursors, ['2024-05-01T11:00:00|d', '2024-05-01T10:00:00|b', None])
+
+	def test_created_after_and_before_with_offset(self):
+		response = self.list_results(**{'created-after': '2024-05-01T12:00:00+02:00',
+										'created-before': '2024-05-01T13:00:00+02:00'})
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual([result['id'] for result in response.json['results']], ['c', 'b'])
+
+	def test_invalid_cursor(self):
+		self.assertEqual(self.list_results(cursor='2024-05-01').status_code, 400)
+		self.assertEqual(self.list_results(cursor='yesterday|a').status_code, 400)
+		self.assertEqual(self.list_results(limit=0).status_code, 400)
+
+
+class TestTranspile(RouteTestCase):
+	def test_invalid_qpu_names(self):
+		for qpu_names in ([], 'Aspen-M-3', [''], [1], None):
+			response = self.client.post('/forest-service/api/v1.0/transpile',
+										json={'qpu-names': qpu_names, 'impl-url': 'http://impl'})
+			self.assertEqual(response.status_code, 400)
+			self.assertEqual(response.json['statusCode'], '400')
+
+
+class TestCancelResult(RouteTestCase):
+	def cancel(self, result_id):
+		return self.client.delete(f"/forest-service/api/v1.0/results/{result_id}")
+
+	def test_unknown_result(self):
+		with patch.object(jobs, 'cancel') as cancel:
+			self.assertEqual(self.cancel('x').status_code, 404)
+		cancel.assert_not_called()
+
+	def test_completed_result_is_not_cancelled(self):
+		self.add_result('a', datetime(2024, 5, 1, 9), completed_at=datetime(2024, 5, 1, 10))
+		with patch.object(jobs, 'cancel') as cancel:
+			response = self.cancel('a')
+		self.assertEqual(response.status_code, 409)
+		self.assertEqual(response.json['statusCode'], '409')
+		cancel.assert_not_called()
+
+	def test_execution_is_cancelled(self):
+		self.add_result('a', datetime(2024, 5, 1, 9))
+		with patch.object(jobs, 'cancel', return_value=True) as cancel:
+			response = self.cancel('a')
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.json, {'id': 'a', 'complete': True, 'cancelled': True})
+		cancel.assert_called_once_with('a')
+
+		result = hot_store.get(Result, 'a')
+		self.assertTrue(result.cancelled)
+		self.assertEqual(result.result, '{"error":"execution cancelled"}')
+
+	def test_only_additional_shots_are_cancelled(self):
+		self.add_result('a', datetime(2024, 5, 1, 9), executable_key='0' * 64)
+		with patch.object(jobs, 'cancel', side_effect=lambda job_id: job_id == 'a-extension') as cancel:
+			response = self.cancel('a')
+		self.assertEqual(response.status_code, 200)
+		cancel.assert_called_once_with('a-extension')
+
+		result = hot_store.get(Result, 'a')
+		self.assertTrue(result.complete)
+		self.assertFalse(result.cancelled)
+		self.assertEqual(result.result, '{"00": 10}')
+
+
+class TestCancelGeneratedCircuit(RouteTestCase):
+	def add_generated_circuit(self, id, complete=False, batch_id=None):
+		db.session.add(Generated_Circuit(id=id, complete=complete, batch_id=batch_id))
+		db.session.commit()
+
+	def cancel(self, generated_circuit_id):
+		return self.client.delete(f"/forest-service/api/v1.0/generated-circuits/{generated_circuit_id}")
+
+	def test_completed_generation_is_not_cancelled(self):
+		self.add_generated_circuit('a', complete=True)
+		with patch.object(jobs, 'cancel') as cancel:
+			self.assertEqual(self.cancel('a').status_code, 409)
+		cancel.assert_not_called()
+
+	def test_generation_is_cancelled(self):
+		self.add_generated_circuit('a')
+		with patch.object(jobs, 'cancel') as cancel:
+			response = self.cancel('a')
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.json, {'id': 'a', 'complete': True, 'cancelled': True})
+		cancel.assert_called_once_with('a')
+		self.assertEqual(hot_store.get(Generated_Circuit, 'a').generated_circuit, '{"error":"generation cancelled"}')
+
+	def test_batch_is_cancelled_with_its_last_circuit(self):
+		self.add_generated_circuit('a', batch_id='batch')
+		self.add_generated_circuit('b', batch_id='batch')
+		with patch.object(jobs, 'cancel') as cancel:
+			self.assertEqual(self.cancel('a').status_code, 200)
+			cancel.assert_not_called()
+			self.assertEqual(self.cancel('b').status_code, 200)
+		cancel.assert_called_once_with('batch')
+
+
+class TestFailedGeneration(RouteTestCase):
+	def add_generated_circuit(self, id, complete=False, batch_id=None):
+		db.session.add(Generated_Circuit(id=id, complete=complete, batch_id=batch_id))
+		db.session.commit()
+
+	def test_failed_generation_is_completed_with_an_error(self):
+		self.add_generated_circuit('a')
+		with patch.object(jobs, 'has_failed', return_value=True) as has_failed:
+			response = self.client.get('/forest-service/api/v1.0/generated-circuits/a')
+		self.assertEqual(response.status_code, 200)
+		self.assertTrue(response.json['complete'])
+		self.assertEqual(response.json['generated-circuit'], '{"error":"generation failed or timed out"}')
+		has_failed.assert_called_once_with('a')
+
+	def test_running_generation_is_incomplete(self):
+		self.add_generated_circuit('a')
+		with patch.object(jobs, 'has_failed', return_value=False):
+			response = self.client.get('/forest-service/api/v1.0/generated-circuits/a')
+		self.assertEqual(response.json, {'id': 'a', 'complete': False})
+
+	def test_failed_batch_is_completed_with_an_error(self):
+		self.add_generated_circuit('a', complete=True, batch_id='batch')
+		self.add_generated_circuit('b', batch_id='batch')
+		with patch.object(jobs, 'has_failed', return_value=True) as has_failed:
+			response = self.client.get('/forest-service/api/v1.0/generated-circuit-batches/batch')
+			self.assertTrue(response.json['complete'])
+			has_failed.assert_called_once_with('batch')
+
+			response = self.client.get('/forest-service/api/v1.0/generated-circuits/b')
+		self.assertEqual(response.json['generated-circuit'], '{"error":"generation failed or timed out"}')
+		self.assertEqual(hot_store.get(Generated_Circuit, 'a').generated_circuit, '')
+
+
+class TestFailedExtension(RouteTestCase):
+	def test_failed_extension_keeps_the_counts_and_reports_the_error(self):
+		self.add_result('a', datetime(2024, 5, 1, 9), executable_key='0' * 64)
+		with patch.object(jobs, 'has_failed', return_value=True) as has_failed:
+			response = self.client.get('/forest-service/api/v1.0/results/a')
+		self.assertEqual(response.status_code, 200)
+		self.assertTrue(response.json['complete'])
+		self.assertEqual(response.json['result'], {'00': 10})
+		self.assertEqual(response.json['extension-error'], 'execution of additional shots failed or timed out')
+		has_failed.assert_called_once_with('a-extension')
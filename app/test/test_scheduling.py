@@ -0,0 +1,111 @@
+from unittest import TestCase
+
+from app.scheduling import estimate_cost
+from app.test import FakeApp
+
+
+class TestCostEstimation(TestCase):
+	def test_cost_grows_exponentially_with_width(self):
+		self.assertEqual(estimate_cost(3, 10, 1024), 1024 * 10 * 2 ** 3)
+		self.assertEqual(estimate_cost(4, 10, 1024), 2 * estimate_cost(3, 10, 1024))
+
+	def test_large_job_outweighs_many_small_jobs(self):
+		small = estimate_cost(4, 50, 1024)
+		large = estimate_cost(30, 500, 10 ** 6)
+		self.assertGreater(large, 1000 * small)
+
+	def test_empty_circuit_has_cost(self):
+		self.assertGreater(estimate_cost(0, 0, 0), 0)
+
+
+class _Job:
+	def __init__(self, id, origin):
+		self.id = id
+		self.origin = origin
+
+	def get_id(self):
+		return self.id
+
+
+class _Queue:
+	def __init__(self, name):
+		self.name = name
+		self.jobs = []
+
+	def enqueue(self, function, meta=None, **kwargs):
+		job = _Job(f"{self.name}-{len(self.jobs)}", self.name)
+		self.jobs.append(job)
+		return job
+
+	def get_job_ids(self):
+		return [job.id for job in self.jobs]
+
+
+class _App(FakeApp):
+	def __init__(self):
+		super().__init__(SCHEDULING_HIGH_PRIORITY_COST=10, SCHEDULING_LOW_PRIORITY_COST=1000,
+						 SCHEDULING_BACKLOG_LIMIT=5000, SCHEDULING_COST_RATE=100, SCHEDULING_MAX_RETRY_AFTER=3600,
+						 SCHEDULING_RECONCILE_INTERVAL=60, BLOB_STORE_INLINE_MAX=1024)
+		self.execute_queues = {lane: _Queue(f"forest-service_execute_{lane}") for lane in ('high', 'default', 'low')}
+
+
+class TestLanes(TestCase):
+	def setUp(self):
+		import app.blob_store
+		import app.scheduling
+		self.app = _App()
+		self._current_apps = app.scheduling.current_app, app.blob_store.current_app
+		app.scheduling.current_app = app.blob_store.current_app = self.app
+
+	def tearDown(self):
+		import app.blob_store
+		import app.scheduling
+		app.scheduling.current_app, app.blob_store.current_app = self._current_apps
+
+	def test_jobs_are_enqueued_into_the_lane_of_their_cost(self):
+		from app.scheduling import enqueue
+
+		enqueue('app.tasks.execute', 5)
+		enqueue('app.tasks.execute', 500)
+		enqueue('app.tasks.execute', 2000)
+		self.assertEqual([len(self.app.execute_queues[lane].jobs) for lane in ('high', 'default', 'low')], [1, 1, 1])
+
+	def test_backlog_contains_the_lanes_of_higher_priority(self):
+		from app.scheduling import enqueue, get_backlog
+
+		enqueue('app.tasks.execute', 5)
+		enqueue('app.tasks.execute', 500)
+		enqueue('app.tasks.execute', 2000)
+		self.assertEqual(get_backlog('high'), 5)
+		self.assertEqual(get_backlog('default'), 505)
+		self.assertEqual(get_backlog('low'), 2505)
+
+	def test_dequeued_job_is_removed_from_the_backlog_once(self):
+		from app.scheduling import dequeue, enqueue, get_backlog
+
+		job = enqueue('app.tasks.execute', 500)
+		enqueue('app.tasks.execute', 200)
+		dequeue(job)
+		dequeue(job)
+		self.assertEqual(get_backlog('default'), 200)
+
+	def test_reconcile_removes_jobs_which_are_not_waiting(self):
+		from app.scheduling import enqueue, get_backlog, reconcile
+
+		enqueue('app.tasks.execute', 500)
+		self.app.execute_queues['default'].jobs.clear()
+		reconcile()
+		self.assertEqual(get_backlog('default'), 0)
+
+	def test_job_exceeding_the_backlog_limit_is_rejected(self):
+		from app.scheduling import enqueue, get_retry_after
+
+		self.assertIsNone(get_retry_after(4000))
+		enqueue('app.tasks.execute', 4000)
+		self.assertIsNone(get_retry_after(5))
+		self.assertEqual(get_retry_after(3000), 20)
+
+	def test_job_is_admitted_to_an_empty_backlog(self):
+		from app.scheduling import get_retry_after
+
+		self.assertIsNone(get_retry_after(10 ** 6))
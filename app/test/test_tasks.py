@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from werkzeug.exceptions import Unauthorized
+
+from app import tasks
+from app.test.test_multiprogramming import bell_circuit
+
+
+class _Job:
+	def __init__(self, id, **kwargs):
+		self.id = id
+		self.origin = 'execute-normal'
+		self.func_name = 'app.tasks.execute'
+		self.kwargs = dict(qpu_name='Aspen-M-3', shots=100, impl_url='http://impl/' + id, impl_data=None,
+						   impl_language='quil', input_params={}, bearer_token='', **kwargs)
+		self.meta = {}
+		self.saved_meta = []
+
+	def save_meta(self):
+		self.saved_meta.append(dict(self.meta))
+
+	def delete(self, remove_from_queue=True):
+		self.deleted = True
+
+	def __eq__(self, other):
+		return isinstance(other, _Job) and self.id == other.id
+
+
+class _Queue:
+	def __init__(self, jobs):
+		self.jobs = list(jobs)
+
+	def get_jobs(self, offset, length):
+		return list(self.jobs[offset:offset + length])
+
+	def remove(self, job):
+		if job in self.jobs:
+			self.jobs.remove(job)
+			return True
+		return False
+
+	def enqueue_job(self, job, at_front=False):
+		if at_front:
+			self.jobs.insert(0, job)
+		else:
+			self.jobs.append(job)
+
+
+class TestExecutePacked(TestCase):
+	def setUp(self):
+		self.job = _Job('job')
+		self.queue = _Queue([_Job('first'), _Job('second')])
+		self.backend = MagicMock()
+		self.backend.qubits.return_value = list(range(8))
+
+	def execute_packed(self):
+		with patch.object(tasks, 'Queue', return_value=self.queue):
+			return tasks._execute_packed(self.job, bell_circuit(0, 1), self.backend, 'Aspen-M-3', 100, None, None)
+
+	def test_claimed_job_ids_are_saved_immediately(self):
+		with patch.object(tasks.implementation_handler, 'prefetch_code', side_effect=RuntimeError):
+			self.assertFalse(self.execute_packed())
+		self.assertEqual(self.job.saved_meta[0], {'packed-job-ids': ['first']})
+		self.assertEqual(self.job.saved_meta[1], {'packed-job-ids': ['first', 'second']})
+
+	def test_failing_prefetch_releases_claimed_jobs(self):
+		def prefetch_code(urls, bearer_token):
+			if urls == ['http://impl/first']:
+				raise Unauthorized()
+
+		with patch.object(tasks.implementation_handler, 'prefetch_code', side_effect=prefetch_code), \
+				patch.object(tasks, '_prepare_circuit', return_value=bell_circuit(0, 1)), \
+				patch.object(tasks.forest_handler, 'quil_to_native_quil', side_effect=RuntimeError):
+			self.assertFalse(self.execute_packed())
+		self.assertCountEqual([job.id for job in self.queue.jobs], ['first', 'second'])
+		self.assertEqual(self.job.meta['packed-job-ids'], [])
+
+	def test_failing_compilation_releases_packed_jobs(self):
+		with patch.object(tasks.implementation_handler, 'prefetch_code'), \
+				patch.object(tasks, '_prepare_circuit', return_value=bell_circuit(0, 1)), \
+				patch.object(tasks.forest_handler, 'quil_to_native_quil', side_effect=RuntimeError):
+			self.assertFalse(self.execute_packed())
+		self.assertEqual([job.id for job in self.queue.jobs], ['first', 'second'])
+		self.assertEqual(self.job.meta['packed-job-ids'], [])
+
+	def test_aborted_packing_releases_claimed_jobs(self):
+		with patch.object(tasks.implementation_handler, 'prefetch_code'), \
+				patch.object(tasks, '_prepare_circuit', side_effect=KeyboardInterrupt):
+			with self.assertRaises(KeyboardInterrupt):
+				self.execute_packed()
+		self.assertEqual([job.id for job in self.queue.jobs], ['first', 'second'])
+
+	def test_circuit_as_wide_as_the_maximum_width_is_not_packed(self):
+		with patch.dict(tasks.app.config, {'MULTIPROGRAMMING_MAX_WIDTH': 2}):
+			self.assertFalse(self.execute_packed())
+		self.assertEqual([job.id for job in self.queue.jobs], ['first', 'second'])
+		self.assertEqual(self.job.saved_meta, [])
+
+	def test_packed_width_is_capped_and_results_can_be_extended(self):
+		self.queue = _Queue([_Job('first', noise_model='noisy'), _Job('second', noise_model='noisy')])
+		results = {id: SimpleNamespace(cancelled=False) for id in ('job', 'first', 'second')}
+		with patch.dict(tasks.app.config, {'MULTIPROGRAMMING_MAX_WIDTH': 4}), \
+				patch.object(tasks, 'Queue', return_value=self.queue), \
+				patch.object(tasks.implementation_handler, 'prefetch_code'), \
+				patch.object(tasks, '_prepare_circuit', return_value=bell_circuit(0, 1)), \
+				patch.object(tasks.forest_handler, 'quil_to_native_quil'), \
+				patch.object(tasks.forest_handler, 'native_quil_to_executable'), \
+				patch.object(tasks.forest_handler, 'execute_packed_job', return_value=[{'00': 50}, {'11': 50}]), \
+				patch.object(tasks.hot_store, 'get', side_effect=lambda model, id: results[id]), \
+				patch.object(tasks.hot_store, 'save'), \
+				patch.object(tasks.scheduling, 'dequeue'):
+			self.assertTrue(tasks._execute_packed(self.job, bell_circuit(0, 1), self.backend, 'Aspen-M-3', 100, 'noisy',
+												  None))
+
+		self.assertEqual([job.id for job in self.queue.jobs], ['second'])
+		self.assertEqual(self.job.meta['packed-job-ids'], ['first'])
+		self.assertEqual(results['first'].result, '{"11":50}')
+		self.assertTrue(results['first'].complete)
+		self.assertEqual(results['first'].noise_model, 'noisy')
+		self.assertEqual(results['first'].executable_key,
+						 tasks.executable_store.program_key(bell_circuit(0, 1), self.backend.name))
+		self.assertFalse(hasattr(results['second'], 'result'))
+
+
+class TestExtend(TestCase):
+	def test_failure_is_recorded_on_the_result(self):
+		result = SimpleNamespace(executable_key='0' * 64, result='{"00": 10}', shots=10)
+		with patch.object(tasks.hot_store, 'get', return_value=result), \
+				patch.object(tasks.hot_store, 'save') as save, \
+				patch.object(tasks.executable_store, 'load', return_value=None), \
+				patch.object(tasks.scheduling, 'dequeue'):
+			tasks.extend('a', '', 100)
+		save.assert_called_once_with(result)
+		self.assertTrue(result.complete)
+		self.assertEqual((result.result, result.shots), ('{"00": 10}', 10))
+		self.assertIn('evicted', result.extension_error)
+
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from flask import Flask
+from sqlalchemy.orm import Session
+
+from app import tracing
+
+
+class TestTracing(TestCase):
+	def setUp(self):
+		fd, self.path = tempfile.mkstemp()
+		os.close(fd)
+		tracing._file = self.path
+
+	def tearDown(self):
+		tracing._file = None
+		os.remove(self.path)
+
+	def spans(self):
+		with open(self.path) as f:
+			return {span['name']: span for line in map(json.loads, f) for resource_spans in line['resourceSpans']
+					for scope_spans in resource_spans['scopeSpans'] for span in scope_spans['spans']}
+
+	def test_nested_spans_share_the_trace(self):
+		with tracing.span('job execute'):
+			with tracing.span('backend.run', shots=1024):
+				pass
+		spans = self.spans()
+		self.assertEqual(spans['backend.run']['traceId'], spans['job execute']['traceId'])
+		self.assertEqual(spans['backend.run']['parentSpanId'], spans['job execute']['spanId'])
+		self.assertNotIn('parentSpanId', spans['job execute'])
+		self.assertEqual(spans['backend.run']['attributes'], [{'key': 'shots', 'value': {'intValue': '1024'}}])
+		self.assertEqual(spans['backend.run']['status'], {'code': 1})
+
+	def test_context_is_passed_by_traceparent(self):
+		with tracing.span('POST /execute'):
+			meta = tracing.inject()
+		self.assertEqual(tracing.inject(), {})
+
+		job_span = tracing.start_span('job execute', traceparent=meta['traceparent'])
+		job_span.end()
+		spans = self.spans()
+		self.assertEqual(spans['job execute']['traceId'], spans['POST /execute']['traceId'])
+		self.assertEqual(spans['job execute']['parentSpanId'], spans['POST /execute']['spanId'])
+
+	def test_failed_span_has_error_status(self):
+		with self.assertRaises(ValueError):
+			with tracing.span('quil_to_native_quil'):
+				raise ValueError('invalid Quil')
+		self.assertEqual(self.spans()['quil_to_native_quil']['status']['code'], 2)
+
+	def test_resource_identifies_the_service(self):
+		tracing.start_span('download_code').end()
+		with open(self.path) as f:
+			resource = json.load(f)['resourceSpans'][0]['resource']
+		self.assertIn({'key': 'service.name', 'value': {'stringValue': 'forest-service'}}, resource['attributes'])
+
+	def test_commit_is_traced_once_by_several_apps(self):
+		for _ in range(2):
+			app = Flask(__name__)
+			app.config['TRACING_FILE'] = self.path
+			tracing.init_app(app)
+		Session().commit()
+		with open(self.path) as f:
+			self.assertEqual(len(f.readlines()), 1)
+		self.assertIn('db.commit', self.spans())
+
+	def test_nothing_is_exported_if_disabled(self):
+		tracing._file = None
+		with tracing.span('download_code') as span:
+			span.set_attribute('prefetched', False)
+		self.assertEqual(tracing.inject(), {})
+		with open(self.path) as f:
+			self.assertEqual(f.read(), '')
@@ -0,0 +1,252 @@
+# ******************************************************************************
+#  Copyright (c) 2024 University of Stuttgart
+#
+#  See the NOTICE file(s) distributed with this work for additional
+#  information regarding copyright ownership.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+import functools
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from app import json_provider
+
+# spans are appended as JSON lines to TRACING_FILE, tracing is disabled if it is not set
+_file: Optional[str] = None
+_service_name = 'forest-service'
+
+_traceparent_pattern = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+# enum values of the OTLP protocol, SpanKind and StatusCode
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+_STATUS_CODE_OK = 1
+_STATUS_CODE_ERROR = 2
+
+
+def _to_key_values(attributes: Dict) -> List[Dict]:
+    key_values = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            any_value = {'boolValue': value}
+        elif isinstance(value, int):
+            # 64 bit integers are encoded as strings by the JSON mapping of protobuf
+            any_value = {'intValue': str(value)}
+        elif isinstance(value, float):
+            any_value = {'doubleValue': value}
+        else:
+            any_value = {'stringValue': str(value)}
+        key_values.append({'key': key, 'value': any_value})
+    return key_values
+
+
+class Span:
+    """A timed operation of a trace, exported in the OpenTelemetry (OTLP JSON) format when it ends."""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_span_id', 'name', 'kind', 'attributes', 'start_time', '_token')
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], kind: int, attributes: Dict):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes)
+        self.start_time = time.time_ns()
+        self._token = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def end(self, error: BaseException = None):
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # the span has been started in another context, e.g., another thread
+                pass
+            self._token = None
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_time),
+            'endTimeUnixNano': str(time.time_ns()),
+            'attributes': _to_key_values(self.attributes),
+            'status': {'code': _STATUS_CODE_ERROR, 'message': repr(error)} if error else {'code': _STATUS_CODE_OK},
+        }
+        if self.parent_span_id is not None:
+            span['parentSpanId'] = self.parent_span_id
+        _export({'resourceSpans': [{
+            'resource': {'attributes': _to_key_values({'service.name': _service_name, 'process.pid': os.getpid()})},
+            'scopeSpans': [{'scope': {'name': __name__}, 'spans': [span]}],
+        }]})
+
+
+class _NoSpan:
+    """Returned instead of a span if tracing is disabled, thus, callers never check if tracing is enabled."""
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def end(self, error: BaseException = None):
+        pass
+
+
+_no_span = _NoSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar('forest_service_current_span', default=None)
+
+
+def _export(record: Dict):
+    # a single write to a file opened with O_APPEND, thus, the lines of concurrent processes are not interleaved
+    try:
+        fd = os.open(_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json_provider.dumps(record) + '\n').encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def is_enabled() -> bool:
+    return _file is not None
+
+
+def start_span(name: str, traceparent: str = None, kind: int = SPAN_KIND_INTERNAL, **attributes):
+    """Start a span as child of the given traceparent, of the current span, or as root of a new trace. The span is
+    the current span until it ends."""
+    if _file is None:
+        return _no_span
+    match = _traceparent_pattern.match(traceparent or '')
+    if match:
+        trace_id, parent_span_id = match.groups()
+    elif _current_span.get() is not None:
+        trace_id, parent_span_id = _current_span.get().trace_id, _current_span.get().span_id
+    else:
+        trace_id, parent_span_id = os.urandom(16).hex(), None
+    span = Span(name, trace_id, parent_span_id, kind, attributes)
+    span._token = _current_span.set(span)
+    return span
+
+
+@contextmanager
+def span(name: str, **attributes):
+    current = start_span(name, **attributes)
+    try:
+        yield current
+    except BaseException as e:
+        current.end(e)
+        raise
+    current.end()
+
+
+def traced(name: str):
+    """Decorator running the function in a span of the given name."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def inject() -> Dict[str, str]:
+    """Return the context of the current span, which is stored in the meta of enqueued jobs."""
+    current = _current_span.get()
+    return {'traceparent': current.traceparent()} if current is not None else {}
+
+
+def traced_job(task):
+    """Decorator running the RQ task in a span which continues the trace of the request that enqueued the job."""
+    @functools.wraps(task)
+    def wrapper(*args, **kwargs):
+        if _file is None:
+            return task(*args, **kwargs)
+        from rq import get_current_job
+
+        job = get_current_job()
+        attributes = {}
+        if job is not None:
+            attributes = {'rq.job.id': job.id, 'rq.queue': job.origin}
+            if job.enqueued_at and job.started_at:
+                # time the job waited in the queue, often the largest part of the latency of a request
+                attributes['rq.queue_time_ms'] = (job.started_at - job.enqueued_at).total_seconds() * 1e3
+        traceparent = job.meta.get('traceparent') if job is not None else None
+        with span(f"job {task.__name__}", traceparent=traceparent, **attributes):
+            return task(*args, **kwargs)
+    return wrapper
+
+
+def _start_commit_span(session):
+    session.info['trace_span'] = start_span('db.commit')
+
+
+def _end_commit_span(session):
+    commit_span = session.info.pop('trace_span', None)
+    if commit_span is not None:
+        commit_span.end()
+
+
+def _end_rolled_back_commit_span(session):
+    commit_span = session.info.pop('trace_span', None)
+    if commit_span is not None:
+        commit_span.end(RuntimeError('rolled back'))
+
+
+def init_app(app):
+    """Trace every request and every database commit if TRACING_FILE is set."""
+    global _file, _service_name
+    _file = app.config.get('TRACING_FILE')
+    _service_name = app.config.get('TRACING_SERVICE_NAME') or _service_name
+    if _file is None:
+        return
+
+    from flask import g, request
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    @app.before_request
+    def start_request_span():
+        name = f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+        g.trace_span = start_span(name, traceparent=request.headers.get('traceparent'), kind=SPAN_KIND_SERVER,
+                                  **{'http.method': request.method, 'http.target': request.path})
+
+    @app.after_request
+    def set_response_attributes(response):
+        if 'trace_span' in g:
+            g.trace_span.set_attribute('http.status_code', response.status_code)
+            response.headers['traceparent'] = g.trace_span.traceparent()
+        return response
+
+    @app.teardown_request
+    def end_request_span(error):
+        request_span = g.pop('trace_span', None)
+        if request_span is not None:
+            request_span.end(error)
+
+    # the listeners are registered for all sessions, thus, only once for all apps created by the process
+    for identifier, listener in (('before_commit', _start_commit_span), ('after_commit', _end_commit_span),
+                                 ('after_rollback', _end_rolled_back_commit_span)):
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
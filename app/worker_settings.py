@@ -1,5 +1,5 @@
 # ******************************************************************************
-#  Copyright (c) 2021 University of Stuttgart
+#  Copyright (c) 2024 University of Stuttgart
 #
 #  See the NOTICE file(s) distributed with this work for additional
 #  information regarding copyright ownership.
@@ -16,12 +16,16 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 # ******************************************************************************
-import json
-import numpy as np
 
+# settings of the RQ workers, e.g., "rq worker -c app.worker_settings forest-service_execute_high
+# forest-service_execute forest-service_execute_low", listening to the lanes of the execute queue by priority
+from app.config import Config
 
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return json.JSONEncoder.default(self, obj)
+# the tasks, pyquil, and numpy are imported once by the worker instead of by every forked work horse
+import app.tasks  # noqa: F401
+from app.noise_model import preload_noise_models
+
+# the configured noise models are inherited by the work horses, app.tasks has pushed the application context
+preload_noise_models()
+
+REDIS_URL = Config.REDIS_URL
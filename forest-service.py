@@ -17,6 +17,8 @@
 #  limitations under the License.
 # ******************************************************************************
 
-from app import app, db
+from app import create_app, db
 from app.result_model import Result
-from app.generated_circuit_model import Generated_Circuit
\ No newline at end of file
+from app.generated_circuit_model import Generated_Circuit
+
+app = create_app()
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""add mitigated_result column to result table
+
+Revision ID: 3b8e2d41c7a9
+Revises: c3d1f654f810
+Create Date: 2024-07-08 10:12:31.504127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8e2d41c7a9'
+down_revision = 'c3d1f654f810'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('result', sa.Column('mitigated_result', sa.String(length=1200), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('result') as batch_op:
+        batch_op.drop_column('mitigated_result')
@@ -0,0 +1,26 @@
+"""add cancelled column to result table
+
+Revision ID: 5e1a7c3b9d24
+Revises: 7d5c0f9e2a13
+Create Date: 2024-07-18 10:12:44.503127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e1a7c3b9d24'
+down_revision = '7d5c0f9e2a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cancelled', sa.Boolean(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.drop_column('cancelled')
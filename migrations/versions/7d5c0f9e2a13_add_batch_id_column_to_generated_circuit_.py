@@ -0,0 +1,28 @@
+"""add batch_id column to generated circuit table
+
+Revision ID: 7d5c0f9e2a13
+Revises: 3b8e2d41c7a9
+Create Date: 2024-07-10 15:41:07.218336
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d5c0f9e2a13'
+down_revision = '3b8e2d41c7a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('generated__circuit', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('batch_id', sa.String(length=36), nullable=True))
+        batch_op.create_index(batch_op.f('ix_generated__circuit_batch_id'), ['batch_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('generated__circuit', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_generated__circuit_batch_id'))
+        batch_op.drop_column('batch_id')
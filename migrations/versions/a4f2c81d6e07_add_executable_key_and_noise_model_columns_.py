@@ -0,0 +1,28 @@
+"""add executable_key and noise_model columns to result table
+
+Revision ID: a4f2c81d6e07
+Revises: 5e1a7c3b9d24
+Create Date: 2024-07-22 14:03:51.918264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f2c81d6e07'
+down_revision = '5e1a7c3b9d24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('executable_key', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('noise_model', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.drop_column('noise_model')
+        batch_op.drop_column('executable_key')
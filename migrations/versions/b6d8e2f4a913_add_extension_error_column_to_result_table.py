@@ -0,0 +1,26 @@
+"""add extension_error column to result table
+
+Revision ID: b6d8e2f4a913
+Revises: f3b7d05e9c12
+Create Date: 2024-08-07 11:05:38.642190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d8e2f4a913'
+down_revision = 'f3b7d05e9c12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extension_error', sa.String(length=1200), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.drop_column('extension_error')
@@ -0,0 +1,26 @@
+"""add completed_at column to result table
+
+Revision ID: c7b0e93f1a58
+Revises: a4f2c81d6e07
+Create Date: 2024-07-25 09:47:12.330581
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7b0e93f1a58'
+down_revision = 'a4f2c81d6e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('completed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.drop_column('completed_at')
@@ -0,0 +1,48 @@
+"""add created_at columns and indexes for listing and purging
+
+Revision ID: d2e8f4a61b39
+Revises: c7b0e93f1a58
+Create Date: 2024-07-29 14:05:41.518227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e8f4a61b39'
+down_revision = 'c7b0e93f1a58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('generated__circuit', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+
+    # existing rows are treated as created at their completion resp. at the time of the migration
+    op.execute("UPDATE result SET created_at = COALESCE(completed_at, CURRENT_TIMESTAMP)")
+    op.execute("UPDATE generated__circuit SET created_at = CURRENT_TIMESTAMP")
+
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.create_index('ix_result_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_result_backend_created_at_id', ['backend', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_result_generated_circuit_id_created_at_id',
+                              ['generated_circuit_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_result_complete_completed_at', ['complete', 'completed_at'], unique=False)
+    with op.batch_alter_table('generated__circuit', schema=None) as batch_op:
+        batch_op.create_index('ix_generated__circuit_complete_created_at', ['complete', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('generated__circuit', schema=None) as batch_op:
+        batch_op.drop_index('ix_generated__circuit_complete_created_at')
+        batch_op.drop_column('created_at')
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.drop_index('ix_result_complete_completed_at')
+        batch_op.drop_index('ix_result_generated_circuit_id_created_at_id')
+        batch_op.drop_index('ix_result_backend_created_at_id')
+        batch_op.drop_index('ix_result_created_at_id')
+        batch_op.drop_column('created_at')
@@ -34,13 +34,15 @@ def upgrade():
     )
     op.add_column('result', sa.Column('generated_circuit_id', sa.String(length=36), nullable=True))
     op.add_column('result', sa.Column('post_processing_result', sa.String(length=1200), nullable=True))
-    op.create_foreign_key(None, 'result', 'generated__circuit', ['generated_circuit_id'], ['id'])
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.create_foreign_key(None, 'generated__circuit', ['generated_circuit_id'], ['id'])
     # ### end Alembic commands ###
 
 
 def downgrade():
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_constraint(None, 'result', type_='foreignkey')
+    with op.batch_alter_table('result', schema=None) as batch_op:
+        batch_op.drop_constraint(None, type_='foreignkey')
     op.drop_column('result', 'post_processing_result')
     op.drop_column('result', 'generated_circuit_id')
     op.drop_table('generated__circuit')
@@ -0,0 +1,35 @@
+"""add completed_at column to generated__circuit table to purge generated circuits by their completion
+
+Revision ID: e5a9c4d27f16
+Revises: d2e8f4a61b39
+Create Date: 2024-08-02 10:21:37.904415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c4d27f16'
+down_revision = 'd2e8f4a61b39'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('generated__circuit', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('completed_at', sa.DateTime(), nullable=True))
+
+    # existing generated circuits are treated as completed at their creation
+    op.execute("UPDATE generated__circuit SET completed_at = created_at WHERE complete")
+
+    with op.batch_alter_table('generated__circuit', schema=None) as batch_op:
+        batch_op.drop_index('ix_generated__circuit_complete_created_at')
+        batch_op.create_index('ix_generated__circuit_complete_completed_at', ['complete', 'completed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('generated__circuit', schema=None) as batch_op:
+        batch_op.drop_index('ix_generated__circuit_complete_completed_at')
+        batch_op.create_index('ix_generated__circuit_complete_created_at', ['complete', 'created_at'], unique=False)
+        batch_op.drop_column('completed_at')
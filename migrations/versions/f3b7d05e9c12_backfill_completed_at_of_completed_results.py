@@ -0,0 +1,26 @@
+"""backfill completed_at of results completed before the column was added
+
+Revision ID: f3b7d05e9c12
+Revises: e5a9c4d27f16
+Create Date: 2024-08-05 16:42:09.117302
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b7d05e9c12'
+down_revision = 'e5a9c4d27f16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # results completed before c7b0e93f1a58 are treated as completed at their creation, otherwise they are never
+    # purged, created_at has been populated by d2e8f4a61b39
+    op.execute("UPDATE result SET completed_at = created_at WHERE complete AND completed_at IS NULL")
+
+
+def downgrade():
+    # the backfilled times can not be told apart from the recorded ones
+    pass